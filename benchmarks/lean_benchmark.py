@@ -0,0 +1,137 @@
+"""
+Measure the CPU and memory used by the browser of each session, with and without the lean mode, against the
+local mock of the web app with its chart and news widgets (Linux only, the processes are read from /proc).
+
+usage:
+    python benchmarks/lean_benchmark.py [--sessions 2] [--seconds 10] [--json results.json]
+"""
+from __future__ import annotations
+
+import os
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+from tradezero_api import TradeZero
+
+from mock_benchmark import mock_url
+
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+
+MODES = {
+    'default': {},
+    'lean': {'lean': True},
+    'lean + pruned panels': {'lean': True, 'prune': True},
+}
+
+
+def _children() -> dict[int, list[int]]:
+    """pid -> pids of its children, for all the processes"""
+    children: dict[int, list[int]] = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            stat = Path(f'/proc/{entry}/stat').read_text()
+        except OSError:
+            continue
+        ppid = int(stat.rsplit(')', 1)[1].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+    return children
+
+
+def process_tree(pid: int) -> list[int]:
+    """the pid and all its descendants (chromedriver -> chrome -> renderer, gpu, network... processes)"""
+    children = _children()
+    pids, stack = [], [pid]
+    while stack:
+        pid = stack.pop()
+        pids.append(pid)
+        stack.extend(children.get(pid, []))
+    return pids
+
+
+def cpu_seconds(pids: list[int]) -> float:
+    """user + system CPU time of the processes"""
+    total = 0
+    for pid in pids:
+        try:
+            fields = Path(f'/proc/{pid}/stat').read_text().rsplit(')', 1)[1].split()
+        except OSError:
+            continue  # the process exited
+        total += int(fields[11]) + int(fields[12])  # utime, stime
+    return total / CLOCK_TICKS
+
+
+def memory_mb(pids: list[int]) -> tuple[float, float]:
+    """
+    :return: tuple: (RSS, PSS) in MB, the RSS counts the memory shared between the processes once per process,
+     the PSS splits it between them (it's 0 if /proc/<pid>/smaps_rollup is not available)
+    """
+    rss = pss = 0
+    for pid in pids:
+        try:
+            rss += int(Path(f'/proc/{pid}/statm').read_text().split()[1]) * PAGE_SIZE
+            for line in Path(f'/proc/{pid}/smaps_rollup').read_text().splitlines():
+                if line.startswith('Pss:'):
+                    pss += int(line.split()[1]) * 1024
+        except OSError:
+            continue
+    return rss / 1024 ** 2, pss / 1024 ** 2
+
+
+def measure_mode(sessions: int, seconds: float, lean: bool = False, prune: bool = False) -> dict:
+    """start the sessions, let them run for the given amount of seconds, and return the usage per session"""
+    clients = []
+    try:
+        for _ in range(sessions):
+            tz = TradeZero('mock', 'mock', headless=True, home_url=mock_url(widgets=1), lean=lean)
+            tz.login()
+            for symbol in ('AAPL', 'AMD', 'NVDA', 'GM', 'TSLA'):
+                tz.Watchlist.add(symbol)
+            if prune:
+                tz.prune_panels()
+            clients.append(tz)
+
+        trees = [process_tree(tz.driver.service.process.pid) for tz in clients]
+        time.sleep(1)  # let the pages settle after the login
+        start_cpu = [cpu_seconds(pids) for pids in trees]
+        start = time.perf_counter()
+        time.sleep(seconds)
+        elapsed = time.perf_counter() - start
+        cpu = [(cpu_seconds(pids) - before) / elapsed * 100 for pids, before in zip(trees, start_cpu)]
+        memory = [memory_mb(pids) for pids in trees]
+    finally:
+        for tz in clients:
+            tz.exit()
+
+    return {
+        'cpu_percent': sum(cpu) / len(cpu),
+        'rss_mb': sum(rss for rss, _ in memory) / len(memory),
+        'pss_mb': sum(pss for _, pss in memory) / len(memory),
+    }
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sessions', type=int, default=2, help='amount of sessions running at the same time')
+    parser.add_argument('--seconds', type=float, default=10, help='duration of the measure')
+    parser.add_argument('--json', help='save the results to this file')
+    args = parser.parse_args(argv)
+
+    results = {name: measure_mode(args.sessions, args.seconds, **kwargs) for name, kwargs in MODES.items()}
+
+    print(f'{"per session":<24} {"CPU %":>8} {"RSS MB":>8} {"PSS MB":>8}')
+    for name, result in results.items():
+        print(f'{name:<24} {result["cpu_percent"]:8.1f} {result["rss_mb"]:8.0f} {result["pss_mb"]:8.0f}')
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({'sessions': args.sessions, 'seconds': args.seconds,
+                                               'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
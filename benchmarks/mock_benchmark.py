@@ -0,0 +1,159 @@
+"""
+Benchmark the API against the local mock of the web app (benchmarks/mock_site), with headless Chrome,
+no TradeZero account needed: for each API it reports the latency percentiles and the WebDriver round trips,
+and the results can be saved as JSON to compare them over time.
+
+usage:
+    python benchmarks/mock_benchmark.py [--iterations 50] [--tick 100] [--json results.json] [--compare old.json]
+"""
+from __future__ import annotations
+
+import sys
+import json
+import time
+import argparse
+import datetime as dt
+from pathlib import Path
+from urllib.parse import urlencode
+
+from tradezero_api import TradeZero, DriverProfiler, Order, OrderType, OrderSpec
+from tradezero_api.metrics import LatencyHistogram
+
+MOCK_SITE = Path(__file__).resolve().parent / 'mock_site' / 'index.html'
+SYMBOLS = ['AAPL', 'AMD', 'NVDA', 'GM', 'UBER', 'TSLA', 'MSFT', 'AMZN', 'META', 'INTC']
+UNIVERSE = [f'T{n:03d}' for n in range(200)]  # synthetic symbols of the mock site
+
+# what a reload does to the watchlist
+CLEAR_WATCHLIST_JS = "document.getElementById('trading-l1-tbody').innerHTML = '';"
+
+
+def mock_url(**params) -> str:
+    """
+    :param params: query parameters of the mock site: tick, ack, fill, load (all in ms) and seed
+    :return: the file:// url of the mock site
+    """
+    url = MOCK_SITE.as_uri()
+    return f'{url}?{urlencode(params)}' if params else url
+
+
+def measure(profiler: DriverProfiler, func, iterations: int) -> dict:
+    """call func(i) for each iteration, and return the latency percentiles (in ms) and round trips per call"""
+    histogram = LatencyHistogram()
+    profiler.reset()
+    for i in range(iterations):
+        start = time.perf_counter()
+        func(i)
+        histogram.record(time.perf_counter() - start)
+
+    report = profiler.report().values()
+    return {
+        'p50': histogram.percentile(50) * 1000,
+        'p90': histogram.percentile(90) * 1000,
+        'p99': histogram.percentile(99) * 1000,
+        'max': histogram.max * 1000,
+        'commands': sum(profile['commands'] for profile in report) / iterations,
+        'kb': sum(profile['bytes'] for profile in report) / iterations / 1024,
+    }
+
+
+def setup(tz: TradeZero):
+    """fill the watchlist, open a few positions and leave a few orders resting in the active orders"""
+    for symbol in SYMBOLS:
+        tz.Watchlist.add(symbol)
+
+    handles = []
+    for symbol in SYMBOLS[:5]:
+        tz.load_symbol(symbol)
+        handles.append(tz.limit_order(Order.BUY, symbol, 100, round(tz.ask + 1, 2)))
+    for handle in handles:
+        handle.wait_filled(timeout=10)
+
+    for symbol in SYMBOLS[5:]:
+        tz.load_symbol(symbol)
+        tz.limit_order(Order.BUY, symbol, 100, round(tz.bid * 0.5, 2))
+
+
+def scenarios(tz: TradeZero) -> dict:
+    def resting_limit_order(i: int):
+        symbol = SYMBOLS[i % len(SYMBOLS)]
+        tz.limit_order(Order.BUY, symbol, 1, 1.00)
+
+    def basket(i: int):
+        tz.submit_orders([OrderSpec(Order.BUY, SYMBOLS[i % len(SYMBOLS)], 1, OrderType.limit, price=1.00)])
+
+    def restore_watchlist(i: int):
+        tz.Watchlist.symbols.update(UNIVERSE)
+        tz.driver.execute_script(CLEAR_WATCHLIST_JS)
+        tz.Watchlist.restore()
+
+    return {
+        'quote_snapshot': lambda i: tz.quote_snapshot(),
+        'bid + ask + last': lambda i: (tz.bid, tz.ask, tz.last),
+        'load_symbol': lambda i: tz.load_symbol(SYMBOLS[i % len(SYMBOLS)]),
+        'data': lambda i: tz.data(SYMBOLS[i % len(SYMBOLS)]),
+        'Watchlist.data': lambda i: tz.Watchlist.data(),
+        'Watchlist.drain': lambda i: tz.Watchlist.drain(),
+        'Portfolio.portfolio': lambda i: tz.Portfolio.portfolio(),
+        'Portfolio.invested': lambda i: tz.Portfolio.invested('AMD'),
+        'Portfolio.get_active_orders': lambda i: tz.Portfolio.get_active_orders(),
+        'Account.attributes': lambda i: tz.Account.attributes,
+        'Notification.poll_new': lambda i: tz.Notification.poll_new(),
+        'limit_order': resting_limit_order,
+        'submit_orders (1 order)': basket,
+        'Watchlist.restore (210)': restore_watchlist,  # last, it leaves 200 more rows in the watchlist
+    }
+
+
+def print_results(results: dict, previous: dict | None = None):
+    print(f'{"api":<30} {"p50 ms":>8} {"p90 ms":>8} {"p99 ms":>8} {"max ms":>8} {"cmds":>6} {"KB":>7}'
+          + (f' {"p50 vs old":>11}' if previous else ''))
+    for name, stats in results.items():
+        line = (f'{name:<30} {stats["p50"]:>8.2f} {stats["p90"]:>8.2f} {stats["p99"]:>8.2f} {stats["max"]:>8.2f} '
+                f'{stats["commands"]:>6.1f} {stats["kb"]:>7.2f}')
+        if previous and name in previous:
+            old = previous[name]['p50']
+            line += f' {(stats["p50"] / old - 1) * 100 if old else 0:>+10.1f}%'
+        print(line)
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--tick', type=int, default=100, help='ms between the quote ticks of the mock site')
+    parser.add_argument('--json', help='save the results to this file')
+    parser.add_argument('--compare', help='compare the results with a file saved with --json')
+    parser.add_argument('--only', nargs='*', help='run only the given apis')
+    args = parser.parse_args(argv)
+
+    tz = TradeZero(user_name='mock', password='mock', headless=True, home_url=mock_url(tick=args.tick))
+    try:
+        tz.login()
+        setup(tz)
+
+        profiler = DriverProfiler(tz.driver)
+        profiler.start()
+        results = {}
+        for name, func in scenarios(tz).items():
+            if args.only and name not in args.only:
+                continue
+            results[name] = measure(profiler, func, args.iterations)
+        profiler.stop()
+    finally:
+        tz.exit()
+
+    previous = None
+    if args.compare:
+        previous = json.loads(Path(args.compare).read_text())['results']
+    print_results(results, previous)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({
+            'date': dt.datetime.now().isoformat(timespec='seconds'),
+            'iterations': args.iterations,
+            'tick': args.tick,
+            'results': results,
+        }, indent=2))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,541 @@
+/*
+ * The behaviour of the mock TradeZero web app: login, order panel, watchlist, portfolio, active orders,
+ * locates, account values and notifications, with scripted quote ticks, order acks and fills.
+ */
+(function () {
+    'use strict';
+
+    var params = new URLSearchParams(window.location.search);
+    var config = {
+        tick: parseInt(params.get('tick') || '100', 10),  // ms between quote ticks
+        ack: parseInt(params.get('ack') || '20', 10),  // ms before an order is accepted
+        fill: parseInt(params.get('fill') || '50', 10),  // ms before a marketable order is filled
+        load: parseInt(params.get('load') || '30', 10),  // ms to load a symbol
+        seed: parseInt(params.get('seed') || '1', 10)
+    };
+
+    // mulberry32, so that the ticks are the same on every run
+    var seed = config.seed;
+    function random() {
+        seed |= 0;
+        seed = seed + 0x6D2B79F5 | 0;
+        var t = Math.imul(seed ^ seed >>> 15, 1 | seed);
+        t = t + Math.imul(t ^ t >>> 7, 61 | t) ^ t;
+        return ((t ^ t >>> 14) >>> 0) / 4294967296;
+    }
+
+    var quotes = {};
+    function addSymbol(symbol, price) {
+        quotes[symbol] = {
+            open: price, high: price, low: price, close: price, last: price,
+            bid: price - 0.01, ask: price + 0.01, volume: Math.floor(random() * 1e6)
+        };
+    }
+    [['AAPL', 175.2], ['AMD', 104.8], ['NVDA', 452.1], ['GM', 35.4], ['UBER', 45.9], ['TSLA', 251.3],
+     ['MSFT', 331.7], ['AMZN', 132.5], ['META', 301.2], ['INTC', 34.6], ['F', 12.8], ['BAC', 29.1]]
+        .forEach(function (item) { addSymbol(item[0], item[1]); });
+    for (var n = 0; n < 1000; n++) {
+        addSymbol('T' + ('000' + n).slice(-3), 5 + random() * 200);  // a universe for the scanners: T000...T999
+    }
+    var hardToBorrow = {UBER: 0.02, TSLA: 0.05, GM: 0.01};
+
+    var state = {
+        symbol: null,
+        orderSeq: 1000,
+        orders: {},
+        positions: {},
+        realized: 0,
+        inventory: {}
+    };
+
+    function $(id) {
+        return document.getElementById(id);
+    }
+    function money(value) {
+        return '$' + value.toLocaleString('en-US', {minimumFractionDigits: 2, maximumFractionDigits: 2});
+    }
+    function price(value) {
+        return value.toFixed(2);
+    }
+    function volume(value) {
+        return value.toLocaleString('en-US');
+    }
+    function setText(element, text) {
+        if (element !== null && element.textContent !== text) {
+            element.textContent = text;
+        }
+    }
+    function onEnter(element, callback) {
+        element.addEventListener('keydown', function (event) {
+            if (event.key === 'Enter') {
+                callback(element.value.trim().toUpperCase());
+            }
+        });
+    }
+
+    /* notifications */
+
+    function notify(title, message) {
+        var list = $('notifications-list-1');
+        var li = document.createElement('li');
+        [['time', new Date().toTimeString().slice(0, 8)], ['title', title], ['message', message]]
+            .forEach(function (item) {
+                var span = document.createElement('span');
+                span.className = item[0];
+                span.textContent = item[1];
+                li.appendChild(span);
+            });
+        list.insertBefore(li, list.firstChild);
+        while (list.children.length > 50) {
+            list.removeChild(list.lastChild);
+        }
+    }
+
+    /* order panel */
+
+    function renderOrderPanel() {
+        if (state.symbol === null) {
+            return;
+        }
+        var quote = quotes[state.symbol];
+        setText($('trading-order-symbol'), state.symbol + ' (USD)');
+        setText($('trading-order-open'), price(quote.open));
+        setText($('trading-order-high'), price(quote.high));
+        setText($('trading-order-low'), price(quote.low));
+        setText($('trading-order-close'), price(quote.close));
+        setText($('trading-order-vol'), volume(quote.volume));
+        setText($('trading-order-p'), price(quote.last));
+        setText($('trading-order-bid'), price(quote.bid));
+        setText($('trading-order-ask'), price(quote.ask));
+    }
+
+    function loadSymbol(symbol) {
+        $('trading-order-input-symbol').value = '';
+        setTimeout(function () {
+            if (!quotes[symbol]) {
+                notify('Error', 'Symbol not found: ' + symbol);
+                return;
+            }
+            state.symbol = symbol;
+            renderOrderPanel();
+        }, config.load);
+    }
+
+    var TYPE_NAMES = {'MKT': 'Market', 'LMT': 'Limit', 'Stop-MKT': 'Stop'};
+
+    function submitOrder(side) {
+        var typeSelect = $('trading-order-select-type');
+        var tifSelect = $('trading-order-select-time');
+        var type = typeSelect.options[typeSelect.selectedIndex].text;
+        var order = {
+            id: String(++state.orderSeq),
+            symbol: state.symbol,
+            side: side.charAt(0).toUpperCase() + side.slice(1),
+            quantity: parseInt($('trading-order-input-quantity').value, 10),
+            type: type,
+            tif: tifSelect.options[tifSelect.selectedIndex].text,
+            limit: type === 'LMT' ? parseFloat($('trading-order-input-price').value) : null,
+            stop: type === 'Stop-MKT' ? parseFloat($('trading-order-input-sprice').value) : null,
+            placed: new Date().toTimeString().slice(0, 8),
+            status: 'Pending'
+        };
+        if (order.symbol === null || !(order.quantity > 0) || !TYPE_NAMES[type]
+                || (type === 'LMT' && !(order.limit > 0)) || (type === 'Stop-MKT' && !(order.stop > 0))) {
+            notify('Order rejected', 'Your ' + (TYPE_NAMES[type] || type) + ' ' + order.side + ' order of '
+                + (order.quantity || 0) + ' ' + order.symbol + ' was rejected.');
+            return;
+        }
+        state.orders[order.id] = order;
+        setTimeout(function () { acceptOrder(order); }, config.ack);
+    }
+
+    function describe(order) {
+        return 'Your ' + TYPE_NAMES[order.type] + ' ' + order.side + ' order of ' + order.quantity + ' ' + order.symbol;
+    }
+
+    function acceptOrder(order) {
+        if (!state.orders[order.id]) {
+            return;
+        }
+        order.status = 'Accepted';
+        var tbody = $('aoTable-1').tBodies[0];
+        var tr = document.createElement('tr');
+        tr.setAttribute('order-id', order.id);
+        ['CANCEL', 'S.' + order.id, order.symbol, order.side, String(order.quantity), order.type, order.status,
+         order.tif, order.limit === null ? '' : price(order.limit), order.stop === null ? '' : price(order.stop),
+         order.placed].forEach(function (text, i) {
+            var td = document.createElement('td');
+            td.textContent = text;
+            if (i === 0) {
+                td.className = 'red';
+                td.addEventListener('click', function () { cancelOrder(order); });
+            }
+            tr.appendChild(td);
+        });
+        tbody.appendChild(tr);
+        notify('Order accepted', describe(order) + ' was accepted.');
+        setTimeout(function () { checkFill(order); }, config.fill);
+    }
+
+    function cancelOrder(order) {
+        if (!state.orders[order.id]) {
+            return;
+        }
+        removeOrder(order);
+        notify('Order canceled', describe(order) + ' was canceled.');
+    }
+
+    function removeOrder(order) {
+        delete state.orders[order.id];
+        var tr = document.querySelector('#aoTable-1 tr[order-id="' + order.id + '"]');
+        if (tr !== null) {
+            tr.parentNode.removeChild(tr);
+        }
+    }
+
+    function checkFill(order) {
+        if (order.status !== 'Accepted') {
+            return;
+        }
+        var quote = quotes[order.symbol];
+        var buying = order.side === 'Buy' || order.side === 'Cover';
+        var fillPrice = buying ? quote.ask : quote.bid;
+        var marketable = order.type === 'MKT'
+            || (order.type === 'LMT' && (buying ? quote.ask <= order.limit : quote.bid >= order.limit))
+            || (order.type === 'Stop-MKT' && (buying ? quote.last >= order.stop : quote.last <= order.stop));
+        if (!marketable) {
+            return;
+        }
+        if (order.type === 'LMT') {
+            fillPrice = order.limit;
+        }
+        removeOrder(order);
+        order.status = 'Filled';
+        updatePosition(order.symbol, buying ? order.quantity : -order.quantity, fillPrice);
+        notify('Order filled', describe(order) + ' was filled at ' + price(fillPrice));
+    }
+
+    /* portfolio and account */
+
+    function updatePosition(symbol, quantity, fillPrice) {
+        var position = state.positions[symbol] || {quantity: 0, entry: 0};
+        var newQuantity = position.quantity + quantity;
+        if (position.quantity !== 0 && Math.sign(quantity) !== Math.sign(position.quantity)) {
+            var closed = Math.min(Math.abs(quantity), Math.abs(position.quantity));
+            state.realized += closed * (fillPrice - position.entry) * Math.sign(position.quantity);
+        }
+        if (newQuantity === 0) {
+            delete state.positions[symbol];
+        } else {
+            if (Math.sign(newQuantity) !== Math.sign(position.quantity)) {
+                position.entry = fillPrice;
+            } else if (Math.abs(newQuantity) > Math.abs(position.quantity)) {
+                position.entry = (position.entry * position.quantity + fillPrice * quantity) / newQuantity;
+            }
+            position.quantity = newQuantity;
+            state.positions[symbol] = position;
+        }
+        renderPortfolio();
+    }
+
+    function renderPortfolio() {
+        var tbody = $('opTable-1').tBodies[0];
+        var symbols = Object.keys(state.positions);
+        var rows = {};
+        Array.prototype.forEach.call(tbody.rows, function (tr) { rows[tr.cells[0].textContent] = tr; });
+
+        Object.keys(rows).forEach(function (key) {
+            if (rows[key].cells.length > 1 && !state.positions[key]) {
+                tbody.removeChild(rows[key]);
+            }
+        });
+        if (symbols.length === 0) {
+            if (tbody.rows.length === 0) {
+                var tr = tbody.insertRow();
+                tr.insertCell().textContent = 'You have no open positions.';
+            }
+        }
+
+        var unrealized = 0, exposure = 0;
+        symbols.forEach(function (symbol) {
+            var position = state.positions[symbol];
+            var quote = quotes[symbol];
+            var pnl = (quote.last - position.entry) * position.quantity;
+            unrealized += pnl;
+            exposure += Math.abs(position.quantity) * quote.last;
+            var cells = [symbol, position.quantity > 0 ? 'Long' : 'Short', String(Math.abs(position.quantity)),
+                         price(quote.close), price(position.entry), price(quote.last), price(quote.last - quote.close),
+                         price((quote.last / quote.close - 1) * 100) + '%', price(pnl), price(pnl), 'No'];
+            var tr = rows[symbol];
+            if (!tr) {
+                tr = tbody.insertRow();
+                cells.forEach(function () { tr.insertCell(); });
+            }
+            cells.forEach(function (text, i) { setText(tr.cells[i], text); });
+        });
+        Array.prototype.slice.call(tbody.rows).forEach(function (tr) {
+            if (symbols.length && tr.cells.length === 1) {
+                tbody.removeChild(tr);
+            }
+        });
+
+        setText($('h-realized-value'), money(state.realized));
+        setText($('h-unrealizd-pl-value'), money(unrealized));
+        setText($('h-total-pl-value'), money(state.realized + unrealized));
+        setText($('h-exposure-value'), money(exposure));
+        setText($('h-equity-value'), money(25000 + state.realized + unrealized));
+        setText($('h-used-lvg-value'), (exposure / (25000 + state.realized + unrealized)).toFixed(2) + 'x');
+    }
+
+    /* watchlist */
+
+    function addToWatchlist(symbol) {
+        $('trading-l1-input-symbol').value = '';
+        setTimeout(function () {
+            if (!quotes[symbol]) {
+                notify('Error', 'Symbol not found: ' + symbol);
+                return;
+            }
+            if ($('wl-' + symbol) !== null) {
+                return;
+            }
+            var tr = $('trading-l1-tbody').insertRow();
+            tr.id = 'wl-' + symbol;
+            for (var i = 0; i < 8; i++) {
+                tr.insertCell();
+            }
+            tr.cells[0].textContent = 'x';
+            tr.cells[0].addEventListener('click', function () { tr.parentNode.removeChild(tr); });
+            tr.cells[1].textContent = symbol;
+            renderWatchlistRow(tr, symbol);
+        }, config.load);
+    }
+
+    function renderWatchlistRow(tr, symbol) {
+        var quote = quotes[symbol];
+        setText(tr.cells[2], price(quote.last));
+        setText(tr.cells[3], price(quote.bid));
+        setText(tr.cells[4], price(quote.ask));
+        setText(tr.cells[5], price((quote.last / quote.close - 1) * 100));
+        setText(tr.cells[6], price(quote.last - quote.close));
+        setText(tr.cells[7], volume(quote.volume));
+    }
+
+    /* locates */
+
+    function locateStatus() {
+        var symbol = $('short-list-input-symbol').value.trim().toUpperCase();
+        setText($('short-list-locate-status'), '');
+        setTimeout(function () {
+            if (quotes[symbol]) {
+                setText($('short-list-locate-status'), hardToBorrow[symbol] ? 'Hard to borrow' : 'Easy to borrow');
+            }
+        }, config.load);
+    }
+
+    function locate() {
+        var symbol = $('short-list-input-symbol').value.trim().toUpperCase();
+        var shares = parseInt($('short-list-input-shares').value, 10);
+        var pps = hardToBorrow[symbol];
+        if (!pps) {
+            return;
+        }
+        if (shares * quotes[symbol].last > 100000) {
+            notify('Error', 'Insufficient BP to short a position with requested quantity.');
+            return;
+        }
+        setTimeout(function () {
+            var old = $('oitem-l-' + symbol);
+            if (old !== null) {
+                old.parentNode.removeChild(old);
+            }
+            var tr = $('short-list-table').tBodies[0].insertRow();
+            tr.id = 'oitem-l-' + symbol;
+            var texts = [symbol, String(shares), price(pps), '', '', '', price(pps * shares), '', ''];
+            texts.forEach(function (text, i) {
+                var td = tr.insertCell();
+                td.id = 'oitem-l-' + symbol + '-cell-' + i;
+                td.textContent = text;
+            });
+            var cell = $('oitem-l-' + symbol + '-cell-8');
+            ['Accept', 'Decline'].forEach(function (text, i) {
+                var span = document.createElement('span');
+                span.textContent = text;
+                span.addEventListener('click', function () {
+                    tr.parentNode.removeChild(tr);
+                    if (i === 0) {
+                        addInventory(symbol, shares);
+                    }
+                });
+                cell.appendChild(span);
+            });
+        }, config.load * 2);
+    }
+
+    function addInventory(symbol, shares) {
+        state.inventory[symbol] = (state.inventory[symbol] || 0) + shares;
+        var tr = $('inv-' + symbol);
+        if (tr === null) {
+            tr = $('locate-inventory-table').tBodies[0].insertRow();
+            tr.id = 'inv-' + symbol;
+            tr.insertCell().textContent = symbol;
+            tr.insertCell().id = 'inv-' + symbol + '-cell-1';
+            var input = document.createElement('input');
+            input.id = 'inv-' + symbol + '-sell-qty';
+            tr.insertCell().appendChild(input);
+            var sell = tr.insertCell();
+            sell.id = 'inv-' + symbol + '-sell';
+            var button = document.createElement('button');
+            button.textContent = 'Credit';
+            button.addEventListener('click', function () {
+                var quantity = parseInt(input.value, 10) || state.inventory[symbol];
+                state.inventory[symbol] -= Math.min(quantity, state.inventory[symbol]);
+                input.value = '';
+                if (state.inventory[symbol] === 0) {
+                    delete state.inventory[symbol];
+                    tr.parentNode.removeChild(tr);
+                } else {
+                    setText($('inv-' + symbol + '-cell-1'), String(state.inventory[symbol]));
+                }
+            });
+            sell.appendChild(button);
+        }
+        setText($('inv-' + symbol + '-cell-1'), String(state.inventory[symbol]));
+    }
+
+    /* quote ticks */
+
+    function tick() {
+        var active = {};
+        if (state.symbol !== null) {
+            active[state.symbol] = true;
+        }
+        Array.prototype.forEach.call($('trading-l1-tbody').rows, function (tr) { active[tr.id.slice(3)] = true; });
+        Object.keys(state.positions).forEach(function (symbol) { active[symbol] = true; });
+        Object.keys(state.orders).forEach(function (id) { active[state.orders[id].symbol] = true; });
+
+        Object.keys(active).forEach(function (symbol) {
+            var quote = quotes[symbol];
+            if (!quote || random() < 0.3) {
+                return;  // not every symbol trades on every tick
+            }
+            quote.last = Math.max(0.01, Math.round(quote.last * (1 + (random() - 0.5) * 0.002) * 100) / 100);
+            quote.bid = Math.round((quote.last - 0.01) * 100) / 100;
+            quote.ask = Math.round((quote.last + 0.01) * 100) / 100;
+            quote.high = Math.max(quote.high, quote.last);
+            quote.low = Math.min(quote.low, quote.last);
+            quote.volume += Math.floor(random() * 1000);
+        });
+
+        renderOrderPanel();
+        Array.prototype.forEach.call($('trading-l1-tbody').rows, function (tr) {
+            renderWatchlistRow(tr, tr.id.slice(3));
+        });
+        Object.keys(state.orders).forEach(function (id) { checkFill(state.orders[id]); });
+        renderPortfolio();
+    }
+
+    /* login */
+
+    function login() {
+        var user = $('login').value;
+        if (!user || !$('password').value) {
+            return;
+        }
+        if (params.get('session') !== '0') {
+            window.localStorage.setItem('tzMockSession', user);  // like the auth token of the real app
+        }
+        startApp(user);
+    }
+
+    function startApp(user) {
+        document.body.removeChild($('login-form'));
+        document.body.appendChild(document.importNode($('app-template').content, true));
+        setText($('h-loginId'), user);
+
+        onEnter($('trading-order-input-symbol'), loadSymbol);
+        onEnter($('trading-l1-input-symbol'), addToWatchlist);
+        ['buy', 'sell', 'short', 'cover'].forEach(function (side) {
+            $('trading-order-button-' + side).addEventListener('click', function () { submitOrder(side); });
+        });
+        onEnter($('short-list-input-symbol'), locateStatus);
+        $('short-list-input-shares').addEventListener('input', locateStatus);
+        $('short-list-button-locate').addEventListener('click', locate);
+
+        renderPortfolio();
+        setInterval(tick, config.tick);
+        if (params.get('ws')) {
+            connectFeed(params.get('ws'));
+        }
+        if (params.get('widgets') === '1') {
+            startWidgets();
+        } else {
+            document.querySelectorAll('.widget').forEach(function (widget) { widget.parentNode.removeChild(widget); });
+        }
+    }
+
+    /* widgets that tradezero_api never reads: a chart redrawn on every frame and a news feed */
+
+    function startWidgets() {
+        // Math.random() instead of random(), so that the ticks are the same with or without the widgets
+        var canvas = $('chart-canvas');
+        var context = canvas.getContext('2d');
+        var points = [];
+        for (var i = 0; i < canvas.width; i++) {
+            points.push(canvas.height / 2);
+        }
+        function draw() {
+            window.requestAnimationFrame(draw);
+            points.shift();
+            points.push(Math.max(0, Math.min(canvas.height, points[points.length - 1] + (Math.random() - 0.5) * 20)));
+            if (!canvas.isConnected || canvas.offsetParent === null) {
+                return;  // like the chart libraries, nothing is drawn while the chart is not displayed
+            }
+            context.clearRect(0, 0, canvas.width, canvas.height);
+            context.beginPath();
+            points.forEach(function (y, x) { context.lineTo(x, y); });
+            context.stroke();
+        }
+        window.requestAnimationFrame(draw);
+
+        var news = $('news-list');
+        setInterval(function () {
+            var li = document.createElement('li');
+            li.textContent = new Date().toISOString() + ' headline #' + Math.floor(Math.random() * 1e6);
+            news.insertBefore(li, news.firstChild);
+            while (news.children.length > 50) {
+                news.removeChild(news.lastChild);
+            }
+        }, 200);
+    }
+
+    // the quotes pushed by benchmarks/ws_feed.py, like the real app receives them over a WebSocket
+    function connectFeed(url) {
+        var socket = new WebSocket(url);
+        socket.onmessage = function (event) {
+            var message = JSON.parse(event.data);
+            var quote = quotes[message.symbol];
+            if (message.type !== 'quote' || !quote) {
+                return;
+            }
+            ['last', 'bid', 'ask'].forEach(function (key) { quote[key] = message[key]; });
+            quote.high = Math.max(quote.high, quote.last);
+            quote.low = Math.min(quote.low, quote.last);
+            if (message.symbol === state.symbol) {
+                renderOrderPanel();
+            }
+        };
+    }
+
+    $('password').addEventListener('keydown', function (event) {
+        if (event.key === 'Enter') {
+            setTimeout(login, 50);
+        }
+    });
+
+    // a saved session (persistent profile, or restored by SessionStore) skips the login form
+    var savedUser = params.get('session') !== '0' && window.localStorage.getItem('tzMockSession');
+    if (savedUser) {
+        startApp(savedUser);
+    }
+}());
@@ -0,0 +1,54 @@
+"""
+Compare the number of WebDriver round trips (and the time) needed to read a full quote
+with the old one-element-at-a-time approach and with TradeZero.quote_snapshot().
+
+usage:
+    TZ_USER=... TZ_PASSWORD=... python benchmarks/quote_snapshot.py AAPL
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+from selenium.webdriver.common.by import By
+
+from tradezero_api import TradeZero, DriverProfiler
+from tradezero_api.main import QUOTE_ELEMENT_IDS
+
+
+def legacy_quote(tz: TradeZero) -> list[float]:
+    """how TradeZero.data() used to read the order panel"""
+    element_ids = [id_ for key, id_ in QUOTE_ELEMENT_IDS.items() if key != 'symbol']
+    return [float(tz.driver.find_element(By.ID, id_).text.replace(',', '')) for id_ in element_ids]
+
+
+def measure(profiler: DriverProfiler, func, iterations: int = 50) -> tuple[float, float]:
+    profiler.reset()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    elapsed = time.perf_counter() - start
+    commands = sum(profile['commands'] for profile in profiler.report().values())
+    return commands / iterations, elapsed / iterations * 1000
+
+
+def main(symbol: str):
+    tz = TradeZero(user_name=os.environ['TZ_USER'], password=os.environ['TZ_PASSWORD'], headless=True)
+    try:
+        tz.login()
+        tz.load_symbol(symbol)
+        profiler = DriverProfiler(tz.driver)
+        profiler.start()
+
+        for name, func in [('legacy find_element', lambda: legacy_quote(tz)),
+                           ('quote_snapshot()', tz.quote_snapshot),
+                           ('bid + ask + last', lambda: (tz.bid, tz.ask, tz.last))]:
+            round_trips, ms = measure(profiler, func)
+            print(f'{name:<22} {round_trips:5.1f} round trips/call  {ms:7.2f} ms/call')
+    finally:
+        tz.exit()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else 'AAPL')
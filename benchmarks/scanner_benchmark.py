@@ -0,0 +1,59 @@
+"""
+Measure the time of a full refresh of a Scanner against the local mock of the web app (its synthetic
+universe T000...T999), for several shard sizes and amounts of sessions, to tune them.
+
+usage:
+    python benchmarks/scanner_benchmark.py [--universe 1000] [--shard-sizes 50 100 200] [--sessions 1 2]
+"""
+from __future__ import annotations
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+from tradezero_api import TradeZero
+from tradezero_api.scanner import Scanner
+
+from mock_benchmark import mock_url
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--universe', type=int, default=1000, help='amount of symbols, at most 1000')
+    parser.add_argument('--shard-sizes', type=int, nargs='+', default=[50, 100, 200])
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 2])
+    parser.add_argument('--settle', type=float, default=0.1)
+    parser.add_argument('--passes', type=int, default=2, help='full refreshes per configuration')
+    parser.add_argument('--json', help='save the results to this file')
+    args = parser.parse_args(argv)
+
+    universe = [f'T{n:03d}' for n in range(min(args.universe, 1000))]
+    sessions = []
+    results = []
+    try:
+        for _ in range(max(args.sessions)):
+            tz = TradeZero('mock', 'mock', headless=True, home_url=mock_url(), lean=True)
+            tz.login()
+            sessions.append(tz)
+
+        print(f'{"sessions":>8} {"shard":>6} {"refresh s":>10} {"symbols/s":>10}')
+        for amount in args.sessions:
+            for shard_size in args.shard_sizes:
+                scanner = Scanner(sessions[:amount], universe, shard_size=shard_size, settle=args.settle)
+                times = [scanner.refresh() for _ in range(args.passes)]
+                scanner.close()
+                best = min(times)
+                results.append({'sessions': amount, 'shard_size': shard_size, 'seconds': times})
+                print(f'{amount:>8} {shard_size:>6} {best:>10.2f} {len(universe) / best:>10.0f}')
+    finally:
+        for tz in sessions:
+            tz.exit()
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({'universe': len(universe), 'settle': args.settle,
+                                               'results': results}, indent=2))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,115 @@
+"""
+Measure the cold start: the time to import the package (in a fresh interpreter each time),
+with --launch the time to construct TradeZero (chromedriver resolution, browser launch, loading the mock site),
+and with --ready the time-to-ready (constructor + login) of a cold start and of a warm start that resumes the
+session from a persistent profile (user_data_dir) or from a saved session (session_file).
+
+usage:
+    python benchmarks/startup.py [--runs 5] [--launch] [--ready]
+"""
+from __future__ import annotations
+
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+from pathlib import Path
+
+IMPORTS = {
+    'import tradezero_api': 'import tradezero_api',
+    'from tradezero_api import TradeZero': 'from tradezero_api import TradeZero',
+    'from tradezero_api import AsyncTradeZero': 'from tradezero_api import AsyncTradeZero',
+}
+
+WATCHLIST = ['AAPL', 'AMD', 'NVDA', 'GM', 'TSLA']
+
+TIMED_IMPORT = """
+import time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def import_time(statement: str) -> float:
+    """seconds to run the statement in a fresh interpreter"""
+    output = subprocess.run([sys.executable, '-c', TIMED_IMPORT.format(statement=statement)], check=True,
+                            capture_output=True, text=True, cwd=Path(__file__).resolve().parent.parent).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def launch_times() -> dict[str, float]:
+    """seconds spent in each step of TradeZero() against the mock site"""
+    from mock_benchmark import mock_url
+    from tradezero_api.chromedriver import resolve_chromedriver
+    from tradezero_api import TradeZero
+
+    start = time.perf_counter()
+    resolve_chromedriver()
+    resolved = time.perf_counter()
+    tz = TradeZero('mock', 'mock', headless=True, home_url=mock_url())
+    constructed = time.perf_counter()
+    tz.exit()
+    return {'resolve chromedriver': resolved - start, 'TradeZero()': constructed - resolved}
+
+
+def time_to_ready(**kwargs) -> float:
+    """
+    seconds from the constructor of TradeZero to the end of login() (including the restore of the UI state),
+    the symbols are added to the watchlist afterwards, so that a warm start has to restore them
+    """
+    from mock_benchmark import mock_url
+    from tradezero_api import TradeZero
+
+    tz = TradeZero('mock', 'mock', headless=True, home_url=mock_url(), **kwargs)
+    try:
+        tz.login()
+        for symbol in WATCHLIST:
+            if symbol not in tz.Watchlist.symbols:
+                tz.Watchlist.add(symbol)
+        return tz.time_to_ready
+    finally:
+        tz.exit()
+
+
+def ready_times() -> dict[str, float]:
+    """time-to-ready of a cold start, and of the warm starts that resume the session"""
+    with tempfile.TemporaryDirectory() as directory:
+        profile = Path(directory) / 'profile'
+        session_file = Path(directory) / 'session.json'
+        profile_session_file = Path(directory) / 'profile-session.json'
+        return {
+            'cold start (user_data_dir)': time_to_ready(user_data_dir=str(profile),
+                                                        session_file=str(profile_session_file)),
+            'warm start (user_data_dir)': time_to_ready(user_data_dir=str(profile),
+                                                        session_file=str(profile_session_file)),
+            'cold start (session_file only)': time_to_ready(session_file=str(session_file)),
+            'warm start (session_file only)': time_to_ready(session_file=str(session_file)),
+        }
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--launch', action='store_true', help='also measure the construction of TradeZero')
+    parser.add_argument('--ready', action='store_true', help='also measure the time-to-ready, cold and warm')
+    args = parser.parse_args(argv)
+    sys.path.insert(0, str(Path(__file__).resolve().parent))  # for mock_benchmark
+
+    for name, statement in IMPORTS.items():
+        times = [import_time(statement) * 1000 for _ in range(args.runs)]
+        print(f'{name:<42} median {statistics.median(times):7.1f} ms  max {max(times):7.1f} ms')
+
+    if args.launch:
+        for name, seconds in launch_times().items():
+            print(f'{name:<42} {seconds * 1000:7.1f} ms')
+
+    if args.ready:
+        for name, seconds in ready_times().items():
+            print(f'{name:<42} {seconds * 1000:7.1f} ms')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
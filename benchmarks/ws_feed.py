@@ -0,0 +1,143 @@
+"""
+A local stand-in for the quote feed of the web app: a minimal WebSocket server (standard library only)
+that pushes JSON quote messages, the mock site connects to it when it's opened with ?ws=ws://127.0.0.1:8765,
+so NetworkTap can be tested and benchmarked (latency from the server to the python event) without an account.
+
+usage:
+    python benchmarks/ws_feed.py [--port 8765] [--interval 0.05]
+    python benchmarks/ws_feed.py --benchmark [--seconds 10]
+"""
+from __future__ import annotations
+
+import sys
+import json
+import time
+import base64
+import random
+import asyncio
+import hashlib
+import argparse
+import threading
+from pathlib import Path
+
+WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+SYMBOLS = {'AAPL': 175.2, 'AMD': 104.8, 'NVDA': 452.1, 'GM': 35.4, 'UBER': 45.9, 'TSLA': 251.3}
+
+
+def encode_frame(text: str) -> bytes:
+    """encode a (not masked) WebSocket text frame"""
+    payload = text.encode()
+    header = bytearray([0x81])
+    if len(payload) < 126:
+        header.append(len(payload))
+    elif len(payload) < 1 << 16:
+        header += bytes([126]) + len(payload).to_bytes(2, 'big')
+    else:
+        header += bytes([127]) + len(payload).to_bytes(8, 'big')
+    return bytes(header) + payload
+
+
+class QuoteFeed:
+    """pushes a quote message for a random symbol to every client, every interval seconds"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8765, interval: float = 0.05, seed: int = 1):
+        self.host = host
+        self.port = port
+        self.interval = interval
+        self.prices = dict(SYMBOLS)
+        self.random = random.Random(seed)
+        self.clients: set[asyncio.StreamWriter] = set()
+        self.sent = 0
+
+    @property
+    def url(self) -> str:
+        return f'ws://{self.host}:{self.port}'
+
+    async def _handshake(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        request = (await reader.readuntil(b'\r\n\r\n')).decode()
+        headers = dict(line.split(': ', 1) for line in request.split('\r\n')[1:] if ': ' in line)
+        key = headers.get('Sec-WebSocket-Key', '')
+        accept = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        writer.write(('HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n'
+                      f'Sec-WebSocket-Accept: {accept}\r\n\r\n').encode())
+        await writer.drain()
+
+    async def _client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            await self._handshake(reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+        self.clients.add(writer)
+        try:
+            while await reader.read(1024):  # the messages of the client are ignored
+                pass
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(writer)
+            writer.close()
+
+    def next_message(self) -> dict:
+        symbol = self.random.choice(list(self.prices))
+        last = round(self.prices[symbol] * (1 + (self.random.random() - 0.5) * 0.002), 2)
+        self.prices[symbol] = last
+        return {'type': 'quote', 'symbol': symbol, 'last': last, 'bid': round(last - 0.01, 2),
+                'ask': round(last + 0.01, 2), 'sent_at': time.time()}
+
+    async def serve(self, stop: asyncio.Event | None = None):
+        server = await asyncio.start_server(self._client, self.host, self.port)
+        async with server:
+            while stop is None or not stop.is_set():
+                if self.clients:
+                    frame = encode_frame(json.dumps(self.next_message()))
+                    for writer in list(self.clients):
+                        writer.write(frame)
+                    self.sent += 1
+                await asyncio.sleep(self.interval)
+
+    def start_in_thread(self) -> threading.Thread:
+        """run the server on a daemon thread (ex: in a benchmark or a test)"""
+        thread = threading.Thread(target=asyncio.run, args=(self.serve(),), name='ws-feed', daemon=True)
+        thread.start()
+        return thread
+
+
+def benchmark(seconds: float, interval: float):
+    """measure the latency from the feed server to the events of TradeZero.Network"""
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from mock_benchmark import mock_url
+    from tradezero_api import TradeZero
+    from tradezero_api.metrics import LatencyHistogram
+
+    feed = QuoteFeed(interval=interval)
+    feed.start_in_thread()
+    tz = TradeZero('mock', 'mock', headless=True, home_url=mock_url(ws=feed.url), network_tap=True)
+    try:
+        tz.login()
+        histogram = LatencyHistogram()
+        for event in tz.Network.stream(interval=0.005, timeout=seconds):
+            if event.kind == 'quote' and 'sent_at' in event.data:
+                histogram.record(time.time() - event.data['sent_at'])
+        print(f'{histogram.count} quotes ({tz.Network.frames_received} frames), latency from the server: '
+              f'p50 {histogram.percentile(50) * 1000:.1f}ms, p99 {histogram.percentile(99) * 1000:.1f}ms')
+    finally:
+        tz.exit()
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--interval', type=float, default=0.05, help='seconds between the quote messages')
+    parser.add_argument('--benchmark', action='store_true', help='measure the latency of TradeZero.Network')
+    parser.add_argument('--seconds', type=float, default=10)
+    args = parser.parse_args(argv)
+
+    if args.benchmark:
+        benchmark(args.seconds, args.interval)
+    else:
+        asyncio.run(QuoteFeed(port=args.port, interval=args.interval).serve())
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
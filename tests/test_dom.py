@@ -0,0 +1,16 @@
+import pytest
+
+from tradezero_api.dom import parse_number
+
+
+def test_parse_number():
+    assert parse_number('101.50') == 101.5
+    assert parse_number('1,234.50') == 1234.5
+    assert parse_number('12,345,678') == 12345678.0
+    assert parse_number('0.00') == 0.0
+
+
+def test_parse_number_rejects_text_that_is_not_loaded():
+    for text in ('', '-', 'N/A'):
+        with pytest.raises(ValueError):
+            parse_number(text)
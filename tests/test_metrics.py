@@ -0,0 +1,43 @@
+import random
+
+from tradezero_api.metrics import LatencyHistogram
+
+
+def test_percentiles_are_within_the_bucket_precision():
+    generator = random.Random(1)
+    values = [generator.uniform(0.0001, 5.0) for _ in range(10_000)]
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+
+    values.sort()
+    for percent in (50, 90, 99, 99.9):
+        exact = values[round(percent / 100 * len(values)) - 1]
+        assert abs(histogram.percentile(percent) - exact) <= exact * 2 ** (1 - histogram.sub_bucket_bits)
+    assert histogram.percentile(100) == histogram.max == values[-1]
+    assert histogram.percentile(0) == histogram.min == values[0]
+
+
+def test_small_values_are_exact():
+    histogram = LatencyHistogram()
+    for microseconds in (3, 7, 42, 100):
+        histogram.record(microseconds / 1_000_000)
+    assert histogram.percentile(50) == 7 / 1_000_000
+    assert histogram.percentile(75) == 42 / 1_000_000
+
+
+def test_empty_and_negative_values():
+    histogram = LatencyHistogram()
+    assert histogram.percentile(99) == 0.0
+    histogram.record(-0.5)  # ex: the clocks of python and the browser differ
+    assert (histogram.min, histogram.max, histogram.total, histogram.percentile(50)) == (0.0, 0.0, 0.0, 0.0)
+
+
+def test_merge():
+    first, second = LatencyHistogram(), LatencyHistogram()
+    for value in (0.001, 0.002):
+        first.record(value)
+    second.record(1.0)
+    first.merge(second)
+    assert (first.count, first.min, first.max) == (3, 0.001, 1.0)
+    assert first.percentile(100) == 1.0 and abs(first.percentile(50) - 0.002) < 0.002 * 0.016
@@ -0,0 +1,80 @@
+import time
+
+from tradezero_api.enums import NotificationKind
+from tradezero_api.notification import Notification, DRAIN_JS, SUBSCRIBE_JS
+
+
+class FakeDriver:
+    """returns the queued drains ([seq, text, ts_ms] buffers, or None when the observer is not installed)"""
+
+    def __init__(self, drains=()):
+        self.drains = list(drains)
+        self.subscribed = 0
+
+    def execute_script(self, script, *args):
+        if script == DRAIN_JS:
+            return self.drains.pop(0) if self.drains else []
+        if script == SUBSCRIBE_JS:
+            self.subscribed += 1
+            return True
+        raise AssertionError('unexpected script')
+
+
+def test_parse_order_message():
+    event = Notification(FakeDriver()).parse(
+        '10:00:00\nOrder filled\nYour Limit Buy order of 1,000 AMD was filled at 101.50', seq=3, ts=5.0)
+    assert event.kind == NotificationKind.order_filled
+    assert (event.seq, event.time, event.title, event.ts) == (3, '10:00:00', 'Order filled', 5.0)
+    assert (event.symbol, event.side, event.quantity, event.price) == ('AMD', 'buy', 1000, 101.5)
+
+
+def test_parse_canceled_order_without_price():
+    event = Notification(FakeDriver()).parse('11:34:49\nOrder canceled\nYour Limit Sell order of 1 gm was canceled.')
+    assert event.kind == NotificationKind.order_canceled
+    assert (event.symbol, event.side, event.quantity, event.price) == ('GM', 'sell', 1, None)
+
+
+def test_parse_message_without_time_or_title():
+    notification = Notification(FakeDriver())
+    two_lines = notification.parse('Error\nSymbol not found: XYZQ')
+    assert two_lines.title == 'Error' and two_lines.time != ''
+    assert (two_lines.kind, two_lines.symbol) == (NotificationKind.symbol_not_found, 'XYZQ')
+
+    one_line = notification.parse('Insufficient BP to short a position')
+    assert one_line.title == '' and one_line.kind == NotificationKind.insufficient_bp
+
+
+def test_parse_message_on_several_lines_and_other_kinds():
+    event = Notification(FakeDriver()).parse('-\nLevel 2\nYou are not authorized\nfor symbol: AMD')
+    assert event.message == 'You are not authorized for symbol: AMD'
+    assert event.kind == NotificationKind.other and event.symbol is None and event.time != '-'
+
+
+def test_events_since_follows_the_events_without_consuming_them():
+    driver = FakeDriver([[[1, 'a\nb\nfirst', 1000]], [[2, 'a\nb\nsecond', 2000], [3, 'a\nb\nthird', 3000]]])
+    notification = Notification(driver)
+    notification.refresh()
+    events, cursor = notification.events_since(0)
+    assert [event.message for event in events] == ['first']
+
+    notification.refresh()
+    events, cursor = notification.events_since(cursor)
+    assert [event.message for event in events] == ['second', 'third']
+    assert notification.events_since(cursor) == ([], 3)
+    assert len(notification.poll_new()) == 3  # not consumed by events_since()
+
+
+def test_notifications_shown_before_the_subscription_are_kept():
+    now = time.time()
+    old = [[1, '09:59:00\nError\nSymbol not found: AMD', 0], [2, '09:59:30\nError\nSymbol not found: GM', 0]]
+    driver = FakeDriver([None, old, [[3, '10:00:00\nError\nSymbol not found: GM', now * 1000]]])
+    notification = Notification(driver)
+    assert notification.refresh() == [] and driver.subscribed == 1
+
+    assert [event.seq for event in notification.refresh()] == [1, 2]
+    assert notification.find(NotificationKind.symbol_not_found, 'AMD').seq == 1
+    assert notification.find(NotificationKind.symbol_not_found, 'AMD', since=now - 1) is None
+
+    notification.refresh()
+    assert notification.find(NotificationKind.symbol_not_found, 'GM', after_seq=0).seq == 3
+    assert notification.find(NotificationKind.symbol_not_found, 'AMD', after_seq=0) is None
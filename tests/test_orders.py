@@ -0,0 +1,104 @@
+import time
+
+from tradezero_api.dom import READ_TABLE_CHANGES_JS
+from tradezero_api.enums import Order, OrderState
+from tradezero_api.metrics import registry
+from tradezero_api.notification import Notification, DRAIN_JS
+from tradezero_api.orders import OrderTracker, OrderSpec
+
+
+class FakeDriver:
+    """returns the queued notifications and active orders table reads instead of running the scripts"""
+
+    def __init__(self):
+        self.notifications = []
+        self.tables = []
+
+    def execute_script(self, script, *args):
+        if script == DRAIN_JS:
+            buffer, self.notifications = self.notifications, []
+            return buffer
+        if script == READ_TABLE_CHANGES_JS:
+            return self.tables.pop(0) if self.tables else [False, [], [], time.time() * 1000]
+        return True
+
+
+def row(order_id, symbol, side, qty):
+    return [order_id, ['x', f'ref-{order_id}', symbol, side, str(qty), 'Limit', 'Accepted', 'DAY', '1', '', '']]
+
+
+def make_tracker():
+    driver = FakeDriver()
+    return driver, OrderTracker(driver, Notification(driver))
+
+
+def test_two_orders_of_the_same_symbol_get_their_own_rows():
+    driver, tracker = make_tracker()
+    tracker.prime()
+    now = time.time()
+    first = tracker.track(OrderSpec(Order.BUY, 'AMD', 100, price=10), now)
+    second = tracker.track(OrderSpec(Order.BUY, 'AMD', 100, price=10), now + 0.1)
+
+    driver.tables.append([False, [row('1', 'AMD', 'B', 100)], [], (now + 0.5) * 1000])
+    tracker.update()
+    driver.tables.append([False, [row('2', 'AMD', 'B', 100)], [], (now + 0.6) * 1000])
+    tracker.update()
+
+    assert (first.order_id, second.order_id) == ('1', '2')
+    assert first.state == second.state == OrderState.accepted
+
+
+def test_orders_already_in_the_table_are_not_matched():
+    driver, tracker = make_tracker()
+    now = time.time()
+    driver.tables.append([True, [row('old', 'AMD', 'B', 100)], [], now * 1000])
+    tracker.prime()
+
+    handle = tracker.track(OrderSpec(Order.BUY, 'AMD', 100, price=10), now + 0.1)
+    driver.tables.append([False, [row('old', 'AMD', 'B', 100)], [], (now + 0.5) * 1000])
+    tracker.update()
+    assert handle.order_id is None and handle.state == OrderState.pending
+
+    driver.tables.append([False, [row('new', 'AMD', 'B', 100)], [], (now + 0.6) * 1000])
+    tracker.update()
+    assert handle.order_id == 'new'
+
+
+def test_fill_notification_drained_by_another_caller_is_applied():
+    driver, tracker = make_tracker()
+    tracker.prime()
+    handle = tracker.track(OrderSpec(Order.BUY, 'AMD', 100, price=10), time.time())
+    driver.notifications.append([1, '10:00:00\nOrder filled\nYour Limit Buy order of 100 AMD was filled at 10.50',
+                                 time.time() * 1000 + 10])
+    tracker.notification.refresh()  # ex: load_symbol() refreshed the notifications first
+
+    tracker.update()
+    assert handle.state == OrderState.filled
+    assert (handle.filled_quantity, handle.fill_price) == (100, 10.5)
+
+
+def test_row_removed_without_notification_closes_the_handle():
+    driver, tracker = make_tracker()
+    tracker.prime()
+    now = time.time()
+    handle = tracker.track(OrderSpec(Order.BUY, 'AMD', 100, price=10), now)
+    driver.tables.append([False, [row('1', 'AMD', 'B', 100)], [], now * 1000])
+    tracker.update()
+    driver.tables.append([False, [], ['1'], (now - 10) * 1000])  # removed longer ago than CLOSE_GRACE
+    tracker.update()
+    assert handle.state == OrderState.closed
+
+
+def test_browser_clock_behind_python_does_not_give_negative_latencies():
+    registry.reset()
+    driver, tracker = make_tracker()
+    tracker.prime()
+    now = time.time()
+    handle = tracker.track(OrderSpec(Order.BUY, 'AMD', 100, price=10), now)
+    driver.tables.append([False, [row('1', 'AMD', 'B', 100)], [], (now - 0.5) * 1000])
+    tracker.update()
+
+    assert handle.order_id == '1' and handle.ack_latency == 0.0
+    assert registry.snapshot()['counters']['orders_clock_skew'] == 1
+    assert registry.histogram('OrderHandle.ack_latency').min == 0.0
+    assert abs(registry.histogram('OrderHandle.clock_skew').max - 0.5) < 0.01
@@ -0,0 +1,61 @@
+import threading
+
+import pytest
+
+from tradezero_api.scheduler import CommandScheduler, Priority
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = CommandScheduler()
+    yield scheduler
+    scheduler.stop()
+
+
+def block(scheduler):
+    """occupy the driver thread until the returned event is set, so the next commands wait in the queue"""
+    started, release = threading.Event(), threading.Event()
+    scheduler.submit(lambda: started.set() or release.wait(5), priority=Priority.ORDER)
+    assert started.wait(5)
+    return release
+
+
+def test_commands_run_in_order_of_priority_then_fifo(scheduler):
+    release = block(scheduler)
+    order = []
+    futures = [scheduler.submit(order.append, name, priority=priority) for name, priority in [
+        ('quote 1', Priority.QUOTE), ('background', Priority.BACKGROUND), ('quote 2', Priority.QUOTE),
+        ('account', Priority.ACCOUNT), ('order', Priority.ORDER),
+    ]]
+    release.set()
+    for future in futures:
+        future.result(5)
+    assert order == ['order', 'account', 'quote 1', 'quote 2', 'background']
+
+
+def test_identical_reads_waiting_together_are_coalesced(scheduler):
+    release = block(scheduler)
+    calls = []
+    first = scheduler.submit(lambda: calls.append(1) or len(calls), priority=Priority.QUOTE, key='quote')
+    second = scheduler.submit(lambda: calls.append(2) or len(calls), priority=Priority.QUOTE, key='quote')
+    release.set()
+
+    assert first is second
+    assert first.result(5) == 1 and calls == [1]
+    assert scheduler.metrics()['QUOTE']['coalesced'] == 1
+
+    # once it ran, the same key gets a fresh result
+    assert scheduler.submit(lambda: 'fresh', priority=Priority.QUOTE, key='quote').result(5) == 'fresh'
+
+
+def test_exceptions_are_set_on_the_future(scheduler):
+    future = scheduler.submit(lambda: 1 / 0)
+    with pytest.raises(ZeroDivisionError):
+        future.result(5)
+
+
+def test_submit_after_stop_raises():
+    scheduler = CommandScheduler()
+    scheduler.stop()
+    with pytest.raises(Exception, match='not running'):
+        scheduler.submit(lambda: None)
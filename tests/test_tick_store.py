@@ -0,0 +1,79 @@
+import numpy as np
+
+from tradezero_api import tick_store
+from tradezero_api.tick_store import TickStore
+
+
+def test_ticks_are_forward_filled():
+    store = TickStore(capacity=4)
+    store.record('amd', ts=1, last=10, bid=9)
+    store.record('AMD', ts=2, ask=11)
+    assert store.column('AMD', 'last').tolist() == [10, 10]
+    assert store.column('AMD', 'bid').tolist() == [9, 9]
+    assert np.isnan(store.column('AMD', 'ask')[0]) and store.column('AMD', 'ask')[1] == 11
+
+
+def test_same_timestamp_is_merged():
+    store = TickStore(capacity=4)
+    store.record('AMD', ts=1, last=10)
+    store.record('AMD', ts=2, last=11)
+    store.record('AMD', ts=1, bid=9)
+    assert store.column('AMD', 'ts').tolist() == [1, 2]
+    assert store.column('AMD', 'bid')[0] == 9
+
+
+def test_late_ticks_are_inserted_in_order_without_overwriting_the_last_one():
+    store = TickStore(capacity=2)
+    store.record('AMD', ts=1, last=1, bid=1)
+    store.record('AMD', ts=3, last=3)
+    store.record('AMD', ts=2, bid=2)  # ex: a snapshot timed by python, a bit behind the browser clock
+    store.record('AMD', ts=0.5, last=0)
+    store.record('AMD', ts=2, last=2)  # merged with the buffered late tick of the same ts
+
+    assert store.column('AMD', 'ts').tolist() == [0.5, 1, 2, 3]
+    assert store.column('AMD', 'last').tolist() == [0, 1, 2, 3]
+    assert store.column('AMD', 'bid')[2] == 2
+
+
+def test_late_ticks_are_merged_in_batches(monkeypatch):
+    monkeypatch.setattr(tick_store, 'LATE_BATCH_SIZE', 3)
+    store = TickStore(capacity=2)
+    store.record('AMD', ts=100, last=100)
+    for ts in (5, 3, 4, 1):
+        store.record('AMD', ts=ts, last=ts)
+    ticks = store._symbols['AMD']
+    assert ticks.size == 4 and len(ticks.late) == 1  # the first 3 were merged at once
+    assert store.column('AMD', 'ts').tolist() == [1, 3, 4, 5, 100]
+
+
+def test_slice_uses_the_timestamps():
+    store = TickStore()
+    for ts in range(10):
+        store.record('AMD', ts=ts, last=ts)
+    assert store.slice('AMD', 3, 6)['last'].tolist() == [3, 4, 5]
+
+
+def test_reopen_after_flush(tmp_path):
+    store = TickStore(str(tmp_path), capacity=2)
+    for ts in range(5):
+        store.record('AMD', ts=ts, last=ts, vol=ts * 10)
+    store.flush()
+
+    reopened = TickStore(str(tmp_path))
+    assert reopened.column('AMD', 'last').tolist() == [0, 1, 2, 3, 4]
+    assert reopened.column('AMD', 'vol').tolist() == [0, 10, 20, 30, 40]
+
+
+def test_reopen_after_growth_without_flush_keeps_the_columns(tmp_path):
+    store = TickStore(str(tmp_path), capacity=2)
+    store.record('AMD', ts=0, last=0, vol=0)
+    store.flush()
+    for ts in range(1, 9):  # grows from 2 to 16 ticks after the last flush
+        store.record('AMD', ts=ts, last=ts, vol=ts * 10)
+    del store
+
+    reopened = TickStore(str(tmp_path))
+    size = reopened.size('AMD')
+    assert size >= 1
+    assert reopened.column('AMD', 'last').tolist() == list(range(size))
+    assert reopened.column('AMD', 'vol').tolist() == [ts * 10 for ts in range(size)]
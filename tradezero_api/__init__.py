@@ -4,5 +4,69 @@
 
 from __future__ import annotations
 
-from .main import TradeZero
-from .enums import OrderType, TIF, Order, PortfolioTab
+from typing import TYPE_CHECKING
+
+from .enums import OrderType, TIF, Order, PortfolioTab, NotificationKind, OrderState, PositionChange, ConnectionState
+
+# the other names are imported from their module on the first access (PEP 562), so that importing the package
+# doesn't load selenium, pandas and numpy until they are needed
+_LAZY_IMPORTS = {
+    'TradeZero': '.main',
+    'TickStore': '.tick_store',
+    'NotificationEvent': '.notification',
+    'PositionEvent': '.portfolio',
+    'OrderSpec': '.orders',
+    'OrderResult': '.orders',
+    'OrderHandle': '.orders',
+    'AsyncTradeZero': '.async_api',
+    'CommandScheduler': '.scheduler',
+    'Priority': '.scheduler',
+    'SessionPool': '.pool',
+    'MetricsRegistry': '.metrics',
+    'registry': '.metrics',
+    'DriverProfiler': '.profiler',
+    'NetworkTap': '.network_tap',
+    'JsonFeedDecoder': '.network_tap',
+    'FeedEvent': '.network_tap',
+    'NetworkFrame': '.network_tap',
+    'SessionStore': '.session',
+    'UIState': '.session',
+    'ConnectionWatchdog': '.watchdog',
+    'ConnectionEvent': '.watchdog',
+    'Scanner': '.scanner',
+}
+
+__all__ = ['OrderType', 'TIF', 'Order', 'PortfolioTab', 'NotificationKind', 'OrderState', 'PositionChange',
+           'ConnectionState', *_LAZY_IMPORTS]
+
+
+def __getattr__(name: str):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    import importlib
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value  # the next accesses don't go through __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .main import TradeZero
+    from .tick_store import TickStore
+    from .notification import NotificationEvent
+    from .portfolio import PositionEvent
+    from .orders import OrderSpec, OrderResult, OrderHandle
+    from .async_api import AsyncTradeZero
+    from .scheduler import CommandScheduler, Priority
+    from .pool import SessionPool
+    from .metrics import MetricsRegistry, registry
+    from .profiler import DriverProfiler
+    from .network_tap import NetworkTap, JsonFeedDecoder, FeedEvent, NetworkFrame
+    from .session import SessionStore, UIState
+    from .watchdog import ConnectionWatchdog, ConnectionEvent
+    from .scanner import Scanner
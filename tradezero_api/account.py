@@ -1,9 +1,85 @@
 from __future__ import annotations
 
+import time
 import warnings
 from collections import namedtuple
 
-from selenium.webdriver.common.by import By
+AccountAttributes = namedtuple('AccountAttributes', ['realized_pnl', 'unrealized_pnl', 'total_pnl', 'buying_power',
+                                                     'cash', 'exposure', 'equity', 'equity_ratio', 'used_lvg',
+                                                     'allowed_lvg'])
+
+VALUE_TRANSLATION = str.maketrans('', '', '$%x,')
+
+HIDE_ELEMENTS_JS = """
+arguments[0].forEach(function (id) {
+    var element = document.getElementById(id);
+    if (element !== null) {
+        element.setAttribute('style', 'display: none;');
+    }
+});
+"""
+
+# returns [style, text] for each id
+READ_ATTRIBUTES_JS = """
+return arguments[0].map(function (id) {
+    var element = document.getElementById(id);
+    return element === null ? [null, null] : [element.getAttribute('style'), element.innerText];
+});
+"""
+
+# observe the attribute elements and keep only the last [style, text] of the ones that changed,
+# the observed elements are kept in tzApi.accountElements to detect when the web app replaces them
+SUBSCRIBE_JS = """
+var api = window.tzApi = window.tzApi || {};
+if (api.accountObserver) {
+    api.accountObserver.disconnect();
+}
+var ids = arguments[0];
+api.accountChanges = {};
+api.accountIds = ids;
+api.accountElements = ids.map(function (id) { return document.getElementById(id); });
+api.accountObserver = new MutationObserver(function (mutations) {
+    mutations.forEach(function (mutation) {
+        var node = mutation.target.nodeType === Node.TEXT_NODE ? mutation.target.parentNode : mutation.target;
+        for (var i = 0; i < ids.length; i++) {
+            var element = document.getElementById(ids[i]);
+            if (element !== null && element.contains(node)) {
+                api.accountChanges[ids[i]] = [element.getAttribute('style'), element.innerText];
+            }
+        }
+    });
+});
+ids.forEach(function (id) {
+    var element = document.getElementById(id);
+    if (element !== null) {
+        api.accountObserver.observe(element, {childList: true, subtree: true, characterData: true, attributes: true});
+    }
+});
+"""
+
+# returns null if the observer must be (re)installed: the page was reloaded or an element was replaced
+DRAIN_CHANGES_JS = """
+var api = window.tzApi;
+if (!api || !api.accountObserver) {
+    return null;
+}
+for (var i = 0; i < api.accountIds.length; i++) {
+    if (document.getElementById(api.accountIds[i]) !== api.accountElements[i]) {
+        return null;
+    }
+}
+var changes = api.accountChanges;
+api.accountChanges = {};
+return changes;
+"""
+
+UNSUBSCRIBE_JS = """
+var api = window.tzApi;
+if (api && api.accountObserver) {
+    api.accountObserver.disconnect();
+    api.accountObserver = null;
+}
+"""
 
 
 class Account:
@@ -24,14 +100,16 @@ class Account:
             "h-loginId",
             "trading-order-label-account",
         ]
+        self.max_age: float | None = None
+        self._values: dict[str, list[str | None]] = {}
+        self._record: AccountAttributes | None = None
+        self._last_drain = 0.0
 
     def hide_attributes(self):
         """
         Hides all account attributes i.e, account username, equity-value, cash-value, realized-value...
         """
-        for id_ in self.attribute_ids:
-            element = self.driver.find_element(By.ID, id_)
-            self.driver.execute_script("arguments[0].setAttribute('style', 'display: none;')", element)
+        self.driver.execute_script(HIDE_ELEMENTS_JS, self.attribute_ids)
 
     @property
     def attributes(self):
@@ -43,22 +121,71 @@ class Account:
         setting self.hide_attributes = True or by calling hide_attributes(),
         a namedtuple will be returned with None values.
 
+        all the attributes are read with a single WebDriver call, or if subscribe() was called,
+        only the values that changed are fetched (at most once every max_age seconds).
+
         :return: namedtuple
         """
-        Data = namedtuple('Data', ['realized_pnl', 'unrealized_pnl', 'total_pnl', 'buying_power', 'cash',
-                                   'exposure', 'equity', 'equity_ratio', 'used_lvg', 'allowed_lvg'])
+        if self.max_age is None:
+            ids = self.attribute_ids[:-3]
+            self._values = dict(zip(ids, self.driver.execute_script(READ_ATTRIBUTES_JS, ids)))
+            self._record = None
+            return self._make_record()
+
+        if time.perf_counter() - self._last_drain >= self.max_age:
+            self._drain()
+        return self._make_record()
+
+    def _make_record(self) -> AccountAttributes:
+        """build the namedtuple from the last values read (it's rebuilt only after a change)"""
+        if self._record is not None:
+            return self._record
 
-        attribute_ids = self.attribute_ids[:-3]
-        values = []
-        for id_ in attribute_ids:
-            element = self.driver.find_element(By.ID, id_)
+        styles_texts = [self._values.get(id_, [None, None]) for id_ in self.attribute_ids[:-3]]
+        if any(text is None for _, text in styles_texts):
+            raise Exception('Error: one or more account attributes are not present in the page')
+        if any(style == 'display: none;' for style, _ in styles_texts):
+            warnings.warn('cannot fetch attribute that has been hidden')
+            return AccountAttributes._make([None] * len(AccountAttributes._fields))
 
-            if element.get_attribute('style') == 'display: none;':
-                warnings.warn('cannot fetch attribute that has been hidden')
+        self._record = AccountAttributes._make(float(text.translate(VALUE_TRANSLATION)) for _, text in styles_texts)
+        return self._record
 
-                empty_list = [None] * len(attribute_ids)
-                return Data._make(empty_list)
+    def subscribe(self, max_age: float = 0.25):
+        """
+        start observing the account attributes in the page, after that attributes only fetches the values
+        that changed since the last read, and at most once every max_age seconds (in between it returns
+        the last values without any WebDriver call), which is ideal for risk checks before every order.
+
+        :param max_age: float, default: 0.25, max age in seconds of the values returned by attributes
+        """
+        self.max_age = max_age
+        self._install_observer()
+
+    def unsubscribe(self):
+        """stop observing the account attributes, attributes will read the page on every call"""
+        self.max_age = None
+        self.driver.execute_script(UNSUBSCRIBE_JS)
+
+    def _install_observer(self):
+        """install the observer and read all the values"""
+        ids = self.attribute_ids[:-3]
+        self.driver.execute_script(SUBSCRIBE_JS, ids)
+        self._values = dict(zip(ids, self.driver.execute_script(READ_ATTRIBUTES_JS, ids)))
+        self._record = None
+        self._last_drain = time.perf_counter()
+
+    def _drain(self):
+        """
+        fetch the values that changed since the last drain
+        (reinstall the observer if the page was reloaded, or if the web app replaced the attribute elements)
+        """
+        changes = self.driver.execute_script(DRAIN_CHANGES_JS)
+        if changes is None:
+            self._install_observer()
+            return
 
-            value = element.text.translate(str.maketrans('', '', '$%x,'))
-            values.append(float(value))
-        return Data._make(values)
+        if changes:
+            self._values.update(changes)
+            self._record = None
+        self._last_drain = time.perf_counter()
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Callable, Any, Literal, Hashable
+
+from .main import TradeZero
+from .enums import Order, TIF
+from .orders import OrderSpec, OrderResult
+from .scheduler import CommandScheduler, Priority
+
+
+class AsyncTradeZero:
+    """
+    An asyncio facade for TradeZero.
+
+    Selenium's driver is not thread-safe, so the TradeZero instance (and its driver) lives on a dedicated
+    thread, and every call is sent to it through a CommandScheduler and executed one at a time,
+    this way any amount of coroutines can share the same session without blocking the event loop.
+    orders have priority over account and portfolio reads, which have priority over quotes,
+    and identical reads that are waiting in the queue at the same time are executed only once.
+
+    example:
+    async with AsyncTradeZero(user_name='username', password='password') as tz:
+        await tz.login()
+        amd, aapl = await asyncio.gather(tz.data('AMD'), tz.data('AAPL'))
+    """
+
+    def __init__(self, user_name: str, password: str, **kwargs):
+        """
+        the browser is launched on the driver thread, so this doesn't block the event loop,
+        the first awaited call will wait for it to be ready.
+
+        :param user_name: TradeZero user_name
+        :param password: TradeZero password
+        :param kwargs: any other argument for TradeZero (headless, hide_attributes, ...)
+        """
+        self.tz: TradeZero | None = None
+        self._start_error: BaseException | None = None
+        self.scheduler = CommandScheduler()
+        self._started = self.scheduler.submit(self._start, user_name, password, priority=Priority.ORDER, **kwargs)
+
+    def _start(self, user_name: str, password: str, **kwargs):
+        try:
+            self.tz = TradeZero(user_name, password, **kwargs)
+        except BaseException as e:
+            self._start_error = e  # raised again by every run()
+            raise
+        # so that await handle.filled() updates the orders on the driver thread
+        self.tz.Orders.submit = lambda func: self.scheduler.submit(func, priority=Priority.ACCOUNT,
+                                                                   key='orders_update')
+        # the heartbeat and the reconnection run on the driver thread, between the other commands
+        self.tz.Watchdog.submit = lambda func: self.scheduler.submit(func, priority=Priority.ACCOUNT, key='watchdog')
+        self.tz.Watchdog.reconnect_in_background = True
+        # the drains of the streams run on the driver thread too
+        self.tz.Watchlist.submit = lambda func: self.scheduler.submit(func, priority=Priority.QUOTE)
+        if self.tz.Network is not None:
+            self.tz.Network.submit = lambda func: self.scheduler.submit(func, priority=Priority.QUOTE)
+
+    async def run(self, func: Callable[..., Any], *args, priority: Priority = Priority.BACKGROUND,
+                  key: Hashable | None = None, **kwargs) -> Any:
+        """
+        run any function on the driver thread, the function receives the TradeZero instance as the first argument
+
+        example:
+        await tz.run(lambda tz: tz.Watchlist.add('AMD'))
+
+        :param func: callable, func(tz, *args, **kwargs)
+        :param priority: Priority, default: BACKGROUND
+        :param key: hashable, default: None, calls with the same key that are waiting at the same time
+         are executed only once (only use it for reads)
+        :return: the value returned by the function
+        """
+        future = self.scheduler.submit(lambda: func(self._session(), *args, **kwargs), priority=priority, key=key)
+        if key is not None:
+            # the future might be shared with other callers, so cancelling this one must not cancel it
+            return await asyncio.shield(asyncio.wrap_future(future))
+        return await asyncio.wrap_future(future)
+
+    def _session(self) -> TradeZero:
+        """the TradeZero instance, on the driver thread (after _start, the first command)"""
+        if self.tz is None:
+            raise Exception('Error: the browser failed to start') from self._start_error
+        return self.tz
+
+    def metrics(self) -> dict[str, dict]:
+        """see CommandScheduler.metrics()"""
+        return self.scheduler.metrics()
+
+    async def login(self, log_time_elapsed: bool = False):
+        """see TradeZero.login()"""
+        return await self.run(TradeZero.login, log_time_elapsed=log_time_elapsed, priority=Priority.ORDER)
+
+    async def conn(self, log_tz_conn: bool = False) -> bool:
+        """see TradeZero.conn()"""
+        return await self.run(TradeZero.conn, log_tz_conn=log_tz_conn, priority=Priority.ORDER)
+
+    async def start_watchdog(self, interval: float = 2.0):
+        """see ConnectionWatchdog.start(), the session is reconnected in the background"""
+        await asyncio.wrap_future(self._started)
+        self._session().Watchdog.start(interval)
+
+    async def watchlist_stream(self, interval: float = 0.05, timeout: float | None = None):
+        """
+        see Watchlist.astream(), the drains are scheduled with the quotes
+
+        example:
+        async for symbol, field, value, ts in tz.watchlist_stream():
+            print(symbol, field, value)
+        """
+        await asyncio.wrap_future(self._started)
+        async for update in self._session().Watchlist.astream(interval, timeout):
+            yield update
+
+    async def feed_stream(self, interval: float = 0.02, timeout: float | None = None):
+        """
+        see NetworkTap.astream() (requires network_tap=True), the polls are scheduled with the quotes
+        """
+        await asyncio.wrap_future(self._started)
+        network = self._session().Network
+        if network is None:
+            raise Exception('Error: the network tap is disabled, pass network_tap=True')
+        async for event in network.astream(interval, timeout):
+            yield event
+
+    async def data(self, symbol: str):
+        """see TradeZero.data()"""
+        return await self.run(TradeZero.data, symbol, priority=Priority.QUOTE, key=('data', symbol.upper()))
+
+    async def quote_snapshot(self) -> dict[str, str]:
+        """see TradeZero.quote_snapshot()"""
+        return await self.run(TradeZero.quote_snapshot, priority=Priority.QUOTE, key='quote_snapshot')
+
+    async def limit_order(self, order_direction: Order, symbol: str, share_amount: int, limit_price: float,
+                          time_in_force: TIF = TIF.DAY, log_info: bool = False):
+        """see TradeZero.limit_order()"""
+        return await self.run(TradeZero.limit_order, order_direction, symbol, share_amount, limit_price,
+                              time_in_force=time_in_force, log_info=log_info, priority=Priority.ORDER)
+
+    async def market_order(self, order_direction: Order, symbol: str, share_amount: int,
+                           time_in_force: TIF = TIF.DAY, log_info: bool = False):
+        """see TradeZero.market_order()"""
+        return await self.run(TradeZero.market_order, order_direction, symbol, share_amount,
+                              time_in_force=time_in_force, log_info=log_info, priority=Priority.ORDER)
+
+    async def stop_market_order(self, order_direction: Order, symbol: str, share_amount: int, stop_price: float,
+                                time_in_force: TIF = TIF.DAY, log_info: bool = False):
+        """see TradeZero.stop_market_order()"""
+        return await self.run(TradeZero.stop_market_order, order_direction, symbol, share_amount, stop_price,
+                              time_in_force=time_in_force, log_info=log_info, priority=Priority.ORDER)
+
+    async def submit_orders(self, orders: list[OrderSpec], log_info: bool = False) -> list[OrderResult]:
+        """see TradeZero.submit_orders()"""
+        return await self.run(TradeZero.submit_orders, orders, log_info=log_info, priority=Priority.ORDER)
+
+    async def portfolio(self, return_type: Literal['df', 'dict'] = 'df'):
+        """see Portfolio.portfolio()"""
+        return await self.run(lambda tz: tz.Portfolio.portfolio(return_type),
+                              priority=Priority.ACCOUNT, key=('portfolio', return_type))
+
+    async def account_attributes(self):
+        """see Account.attributes"""
+        return await self.run(lambda tz: tz.Account.attributes, priority=Priority.ACCOUNT, key='account_attributes')
+
+    async def notifications(self, notif_amount: int = 1) -> list[list[str]]:
+        """see Notification.get_notifications()"""
+        return await self.run(lambda tz: tz.Notification.get_notifications(notif_amount),
+                              priority=Priority.ACCOUNT, key=('notifications', notif_amount))
+
+    async def close(self):
+        """close the browser and stop the driver thread"""
+        if not self.scheduler.running:
+            return
+
+        try:
+            await asyncio.wrap_future(self._started)
+        except Exception:
+            pass  # the browser failed to start, only the driver thread is left to stop
+        try:
+            if self.tz is not None:
+                await self.run(TradeZero.exit, priority=Priority.ORDER)
+        finally:
+            await asyncio.get_running_loop().run_in_executor(None, self.scheduler.stop)
+
+    async def __aenter__(self):
+        await asyncio.wrap_future(self._started)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import os
+import json
+from pathlib import Path
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.common.exceptions import SessionNotCreatedException
+
+# the path of the chromedriver resolved by webdriver_manager is cached here, so the next sessions
+# start without any version lookup (and work offline)
+CACHE_FILE = Path(os.environ.get('TZ_CACHE_DIR', Path.home() / '.cache' / 'tradezero_api')) / 'chromedriver.json'
+
+
+def _read_cache() -> dict[str, str]:
+    try:
+        return json.loads(CACHE_FILE.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_cache(cache: dict[str, str]):
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        CACHE_FILE.write_text(json.dumps(cache))
+    except OSError:
+        pass  # the cache is only an optimization
+
+
+def resolve_chromedriver(version: str | None = None, refresh: bool = False) -> str:
+    """
+    return the path of the chromedriver executable, in the following order:
+    the TZ_CHROMEDRIVER environment variable, the path cached by a previous call (if the file still exists),
+    or else the one downloaded (or found in its own cache) by webdriver_manager, which is then cached.
+
+    :param version: str, default: None, pin the version of chromedriver (ex: '114.0.5735.90'), None means
+     the version that matches the installed Chrome
+    :param refresh: bool, default: False, if True ignore the cached path (ex: after Chrome was updated)
+    :return: str, path of chromedriver
+    """
+    path = os.environ.get('TZ_CHROMEDRIVER')
+    if path:
+        return path
+
+    key = version or 'latest'
+    cache = _read_cache()
+    if not refresh and key in cache and os.path.isfile(cache[key]):
+        return cache[key]
+
+    from webdriver_manager.chrome import ChromeDriverManager  # slow to import, and only needed here
+    path = ChromeDriverManager(version=version).install() if version else ChromeDriverManager().install()
+    cache[key] = path
+    _write_cache(cache)
+    return path
+
+
+def launch_chrome(options: webdriver.ChromeOptions, driver_path: str | None = None,
+                  version: str | None = None) -> webdriver.Chrome:
+    """
+    start Chrome with the cached chromedriver, if it doesn't match the installed Chrome anymore
+    it's resolved again (once)
+
+    :param options: ChromeOptions
+    :param driver_path: str, default: None, path of chromedriver, None means resolve_chromedriver(version)
+    :param version: str, default: None, see resolve_chromedriver()
+    :return: webdriver.Chrome
+    """
+    if driver_path is not None:
+        return webdriver.Chrome(service=ChromeService(driver_path), options=options)
+
+    try:
+        return webdriver.Chrome(service=ChromeService(resolve_chromedriver(version)), options=options)
+    except SessionNotCreatedException:
+        path = resolve_chromedriver(version, refresh=True)
+        return webdriver.Chrome(service=ChromeService(path), options=options)
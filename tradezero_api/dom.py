@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from collections import namedtuple
+from typing import TYPE_CHECKING
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+READ_TEXTS_JS = """
+return arguments[0].map(function (id) {
+    var element = document.getElementById(id);
+    return element === null ? null : element.innerText;
+});
+"""
+
+READ_TABLE_JS = """
+var table = document.getElementById(arguments[0]);
+if (table === null) {
+    return null;
+}
+var keyAttribute = arguments[1];
+var rows = [];
+for (var i = 0; i < table.tBodies.length; i++) {
+    var trs = table.tBodies[i].rows;
+    for (var j = 0; j < trs.length; j++) {
+        var cells = [];
+        for (var k = 0; k < trs[j].cells.length; k++) {
+            cells.push(trs[j].cells[k].textContent.trim());
+        }
+        rows.push([keyAttribute ? trs[j].getAttribute(keyAttribute) : trs[j].id, cells]);
+    }
+}
+return rows;
+"""
+
+# return only the rows that were added or changed, and the keys of the removed rows, since the last call
+# with the same name (the last text of each row is kept in the page)
+READ_TABLE_CHANGES_JS = """
+var table = document.getElementById(arguments[0]);
+if (table === null) {
+    return null;
+}
+var name = arguments[1], keyAttribute = arguments[2], keyCell = arguments[3];
+var api = window.tzApi = window.tzApi || {};
+api.tables = api.tables || {};
+var state = api.tables[name];
+var reset = !state || state.table !== table;
+if (reset) {
+    state = api.tables[name] = {table: table, rows: {}};
+}
+var changed = [], seen = {};
+for (var i = 0; i < table.tBodies.length; i++) {
+    var trs = table.tBodies[i].rows;
+    for (var j = 0; j < trs.length; j++) {
+        var cells = [];
+        for (var k = 0; k < trs[j].cells.length; k++) {
+            cells.push(trs[j].cells[k].textContent.trim());
+        }
+        var key = keyAttribute ? trs[j].getAttribute(keyAttribute) : keyCell !== null ? cells[keyCell] : trs[j].id;
+        if (!key) {
+            continue;
+        }
+        seen[key] = true;
+        var fingerprint = cells.join('\u0001');
+        if (state.rows[key] !== fingerprint) {
+            state.rows[key] = fingerprint;
+            changed.push([key, cells]);
+        }
+    }
+}
+var removed = Object.keys(state.rows).filter(function (key) { return !seen[key]; });
+removed.forEach(function (key) { delete state.rows[key]; });
+return [reset, changed, removed, Date.now()];
+"""
+
+TableChanges = namedtuple('TableChanges', ['reset', 'changed', 'removed', 'ts'])
+TableChanges.__doc__ = """
+The rows of a table that changed since the last read_table_changes() call:
+reset is True if it's the first read (or the table was re-rendered), in which case changed has all the rows,
+changed is a list of (key, cells) of the new and modified rows, removed is a list of keys,
+and ts is the epoch time (in seconds, measured by the browser) of the read.
+"""
+
+
+def read_texts(driver: WebDriver, element_ids: list[str]) -> list[str | None]:
+    """
+    read the visible text of several elements in a single WebDriver round trip,
+    instead of calling find_element() and .text for each one of them.
+
+    :param driver: WebDriver
+    :param element_ids: list of element ids
+    :return: list with the text of each element (same order as element_ids), None if the element was not found
+    """
+    return driver.execute_script(READ_TEXTS_JS, list(element_ids))
+
+
+def parse_number(text: str) -> float:
+    """
+    convert the text of a price or volume element to float
+
+    :param text: str, ex: '1,234.50'
+    :return: float
+    :raises ValueError: if the text is not a number (ex: empty string when the data isn't loaded yet)
+    """
+    return float(text.replace(',', ''))  # replace comma for volume, and when prices > 999
+
+
+def read_table(driver: WebDriver, table_id: str,
+               key_attribute: str | None = None) -> list[tuple[str, list[str]]] | None:
+    """
+    read the body rows of a table in a single WebDriver round trip, only the text of the cells is
+    transferred (instead of the whole driver.page_source).
+
+    :param driver: WebDriver
+    :param table_id: the id of the table element
+    :param key_attribute: name of the row attribute to return as the row key, default: None (the row id)
+    :return: list of (key, cells) tuples, or None if the table is not present in the page
+    """
+    rows = driver.execute_script(READ_TABLE_JS, table_id, key_attribute)
+    if rows is None:
+        return None
+    return [(key, cells) for key, cells in rows]
+
+
+def read_table_changes(driver: WebDriver, table_id: str, name: str | None = None, key_attribute: str | None = None,
+                       key_cell: int | None = None) -> TableChanges | None:
+    """
+    read only the rows of a table that changed since the last call (a single WebDriver round trip),
+    the rows are compared in the page so the unchanged ones are not transferred at all.
+
+    :param driver: WebDriver
+    :param table_id: the id of the table element
+    :param name: str, default: None (the table id), each name keeps its own copy of the last rows, so different
+     readers of the same table must use different names
+    :param key_attribute: name of the row attribute used as key, default: None
+    :param key_cell: index of the cell used as key if key_attribute is None, default: None (the row id)
+    :return: TableChanges namedtuple, or None if the table is not present in the page
+    """
+    result = driver.execute_script(READ_TABLE_CHANGES_JS, table_id, name or table_id, key_attribute, key_cell)
+    if result is None:
+        return None
+    reset, changed, removed, ts = result
+    return TableChanges(reset, [(key, cells) for key, cells in changed], removed, ts / 1000)
+
+
+def rows_to_frame(rows: list[list[str]], columns: list[str] | None = None) -> pd.DataFrame:
+    """
+    build a DataFrame from the cells returned by read_table(), the same way pd.read_html() does:
+    numeric columns (with thousands separators) are converted to numbers and empty cells become NaN.
+
+    :param rows: list of cells for each row
+    :param columns: optional column names
+    :return: pandas.DataFrame
+    """
+    import pandas as pd  # imported on the first use, it's slow to import
+
+    df = pd.DataFrame(rows, columns=columns)
+    for col in df.columns:
+        values = df[col].where(df[col] != '')
+        try:
+            df[col] = pd.to_numeric(values.str.replace(',', '', regex=False))
+        except (ValueError, TypeError, AttributeError):
+            df[col] = values
+    return df
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.remote.webelement import WebElement
+
+
+class CachedElement:
+    """
+    A proxy for a cached WebElement, it behaves like the element itself (click(), send_keys(), text, ...)
+    but if the element went stale (ex: the panel was re-rendered) it's located again and the call is retried.
+    """
+
+    def __init__(self, cache: ElementCache, by: str, value: str):
+        self._cache = cache
+        self._locator = (by, value)
+
+    @property
+    def element(self) -> WebElement:
+        """the underlying WebElement (ex: to pass it as an argument to execute_script)"""
+        return self._cache.get(*self._locator)
+
+    def _retry(self, action: Callable[[WebElement], Any]) -> Any:
+        """call action(element), and if the element is stale locate it again and retry"""
+        try:
+            return action(self._cache.get(*self._locator))
+        except StaleElementReferenceException:
+            return action(self._cache.refresh(*self._locator))
+
+    def __getattr__(self, name: str) -> Any:
+        class_attr = getattr(WebElement, name, None)
+        if class_attr is None:
+            return getattr(self.element, name)  # plain instance attribute
+
+        if isinstance(class_attr, property):
+            return self._retry(lambda element: getattr(element, name))
+
+        def method(*args, **kwargs):
+            return self._retry(lambda element: getattr(element, name)(*args, **kwargs))
+        return method
+
+
+class ElementCache:
+    """
+    Caches the WebElements of the static parts of the page (inputs, buttons, drop-down menus...) by locator,
+    so they are located only once instead of on every call.
+    stale elements are located again automatically, and the whole cache should be invalidated
+    when the page is reloaded (TradeZero.conn() and login() take care of it).
+    """
+
+    def __init__(self, driver: WebDriver):
+        self.driver = driver
+        self._elements: dict[tuple[str, str], WebElement] = {}
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    def get(self, by: str, value: str) -> WebElement:
+        """
+        return the cached WebElement for the given locator, or locate it if it's not cached yet
+
+        :param by: By.ID, By.XPATH, ...
+        :param value: the id, xpath...
+        :return: WebElement
+        :raises NoSuchElementException: if the element is not present in the page
+        """
+        element = self._elements.get((by, value))
+        if element is not None:
+            self.hits += 1
+            return element
+
+        self.misses += 1
+        element = self.driver.find_element(by, value)
+        self._elements[by, value] = element
+        return element
+
+    def refresh(self, by: str, value: str) -> WebElement:
+        """drop a stale element from the cache and locate it again"""
+        self.stale += 1
+        self._elements.pop((by, value), None)
+        return self.get(by, value)
+
+    def find(self, by: str, value: str) -> CachedElement:
+        """
+        return a proxy of the element that re-locates it automatically if it goes stale,
+        use it like a WebElement: cache.find(By.ID, 'trading-order-input-quantity').send_keys(100)
+
+        :param by: By.ID, By.XPATH, ...
+        :param value: the id, xpath...
+        :return: CachedElement
+        """
+        return CachedElement(self, by, value)
+
+    def invalidate(self):
+        """clear the cache, must be called after the page is reloaded"""
+        self._elements.clear()
+
+    def stats(self) -> dict[str, int]:
+        """
+        :return: dict with the amount of hits, misses, stale elements and cached elements
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'stale': self.stale, 'size': len(self._elements)}
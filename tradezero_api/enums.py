@@ -35,3 +35,42 @@ class PortfolioTab(str, Enum):
     closed_positions = 'portfolio-tab-cp-1'
     active_orders = 'portfolio-tab-ao-1'
     inactive_orders = 'portfolio-tab-io-1'
+
+
+class NotificationKind(str, Enum):
+    """The kind of event of a notification, see Notification.poll_new()"""
+    order_accepted = 'order_accepted'
+    order_partially_filled = 'order_partially_filled'
+    order_filled = 'order_filled'
+    order_canceled = 'order_canceled'
+    order_rejected = 'order_rejected'
+    symbol_not_found = 'symbol_not_found'
+    insufficient_bp = 'insufficient_bp'
+    other = 'other'
+
+
+class OrderState(str, Enum):
+    """The state of an order tracked by an OrderHandle"""
+    pending = 'pending'
+    accepted = 'accepted'
+    partially_filled = 'partially_filled'
+    filled = 'filled'
+    canceled = 'canceled'
+    rejected = 'rejected'
+    closed = 'closed'  # left the active orders, without a notification telling if it was filled or canceled
+
+
+class PositionChange(str, Enum):
+    """The kind of change of a position, see Portfolio.refresh()"""
+    opened = 'opened'
+    closed = 'closed'
+    size_changed = 'size_changed'
+
+
+class ConnectionState(str, Enum):
+    """The state of the session seen by the ConnectionWatchdog"""
+    connected = 'connected'
+    logged_out = 'logged_out'  # the login form is shown (TradeZero asks for a login twice a day)
+    stale = 'stale'  # the page is loaded but the quotes stopped updating
+    crashed = 'crashed'  # the page doesn't respond (tab crashed, page not loaded, browser disconnected)
+    reconnecting = 'reconnecting'
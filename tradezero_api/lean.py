@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import json
+
+from .enums import PortfolioTab
+
+# the arguments added to Chrome by TradeZero(..., lean=True)
+LEAN_CHROME_ARGUMENTS = [
+    '--blink-settings=imagesEnabled=false',
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--mute-audio',
+    '--force-prefers-reduced-motion',
+]
+
+# the urls blocked by TradeZero(..., lean=True), see Network.setBlockedURLs ('*' matches anything)
+BLOCKED_URL_PATTERNS = [
+    # images and fonts
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*fonts.googleapis.com*', '*fonts.gstatic.com*',
+    # analytics and support widgets
+    '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*', '*hotjar.com*', '*segment.io*',
+    '*mixpanel.com*', '*intercom.io*', '*fullstory.com*', '*newrelic.com*', '*nr-data.net*', '*sentry.io*',
+    # charts
+    '*tradingview.com*', '*charting_library*',
+]
+
+# the CSS injected in every page by TradeZero(..., lean=True)
+NO_ANIMATIONS_CSS = """
+*, *::before, *::after {
+    animation: none !important;
+    transition: none !important;
+    scroll-behavior: auto !important;
+}
+"""
+
+INJECT_CSS_JS = """
+(function (css) {
+    function inject() {
+        var style = document.createElement('style');
+        style.id = 'tz-lean-style';
+        style.textContent = css;
+        (document.head || document.documentElement).appendChild(style);
+    }
+    if (document.documentElement) {
+        inject();
+    } else {
+        document.addEventListener('DOMContentLoaded', inject);
+    }
+})(%s);
+"""
+
+# the element ids that tradezero_api reads or clicks, their whole subtree is kept by prune_panels(),
+# (TradeZero adds the ids of the quote and of the account attributes)
+KEEP_ELEMENT_IDS = [
+    # order panel
+    'trading-order-input-symbol', 'trading-order-select-type', 'trading-order-select-time',
+    'trading-order-input-quantity', 'trading-order-input-price', 'trading-order-input-sprice',
+    'trading-order-button-buy', 'trading-order-button-sell', 'trading-order-button-short',
+    'trading-order-button-cover',
+    # watchlist
+    'trading-l1-input-symbol', 'trading-l1-table',
+    # portfolio and orders
+    *[tab.value for tab in PortfolioTab], 'portfolio-content-tab-op-1', 'portfolio-content-tab-ao-1',
+    'opTable-1', 'aoTable-1',
+    # locates
+    'locate-tab-1', 'short-list-input-symbol', 'short-list-input-shares', 'short-list-button-locate',
+    'short-list-locate-status', 'short-list-table', 'locate-inventory-table',
+    # notifications
+    'notifications-list-1',
+    # login form (shown again when the session expires)
+    'login', 'password',
+]
+
+KEEP_SELECTORS = [
+    "[id*='portfolio-container'] div div h2",  # the header that tells that the page is loaded
+    'span.message',  # the last notification, see Notification.get_last_notification_message()
+]
+
+# args: [ids, selectors, detach], detaches (or hides) the elements that contain none of the kept elements,
+# and returns the amount of pruned elements. they are kept in tzApi.prunedPanels to be restored
+PRUNE_PANELS_JS = """
+var keepIds = arguments[0], keepSelectors = arguments[1], detach = arguments[2];
+var api = window.tzApi = window.tzApi || {};
+api.prunedPanels = api.prunedPanels || [];
+
+var anchors = [];
+keepIds.forEach(function (id) {
+    var element = document.getElementById(id);
+    if (element !== null) {
+        anchors.push(element);
+    }
+});
+keepSelectors.forEach(function (selector) {
+    document.querySelectorAll(selector).forEach(function (element) { anchors.push(element); });
+});
+if (anchors.length === 0) {
+    return 0;  // the app is not loaded, everything would be pruned
+}
+
+var kept = new Set(anchors);
+var skipped = {SCRIPT: true, STYLE: true, LINK: true, TEMPLATE: true, META: true, NOSCRIPT: true};
+var count = 0;
+function prune(node) {
+    Array.prototype.slice.call(node.children).forEach(function (child) {
+        if (kept.has(child) || skipped[child.tagName]) {
+            return;
+        }
+        if (anchors.some(function (anchor) { return child.contains(anchor); })) {
+            prune(child);
+            return;
+        }
+        if (detach) {
+            api.prunedPanels.push([child, node, child.nextSibling, null]);
+            node.removeChild(child);
+        } else {
+            api.prunedPanels.push([child, null, null, child.style.display]);
+            child.style.display = 'none';
+        }
+        count++;
+    });
+}
+prune(document.body);
+return count;
+"""
+
+RESTORE_PANELS_JS = """
+var api = window.tzApi;
+var pruned = (api && api.prunedPanels) || [];
+for (var i = pruned.length - 1; i >= 0; i--) {
+    var child = pruned[i][0], parent = pruned[i][1], next = pruned[i][2];
+    if (parent === null) {
+        child.style.display = pruned[i][3];
+    } else if (parent.isConnected) {
+        parent.insertBefore(child, next !== null && next.parentNode === parent ? next : null);
+    }
+}
+if (api) {
+    api.prunedPanels = [];
+}
+return pruned.length;
+"""
+
+
+def apply_lean_profile(driver, blocked_urls: list[str] | None = None):
+    """
+    block the given urls and disable the CSS animations and transitions, for all the next pages
+    (call it before loading the web app)
+
+    :param driver: WebDriver (Chrome)
+    :param blocked_urls: list of url patterns, default: None (BLOCKED_URL_PATTERNS)
+    """
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS if blocked_urls is None
+                                                      else blocked_urls})
+    driver.execute_cdp_cmd('Emulation.setEmulatedMedia', {
+        'features': [{'name': 'prefers-reduced-motion', 'value': 'reduce'}],
+    })
+    driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument',
+                           {'source': INJECT_CSS_JS % json.dumps(NO_ANIMATIONS_CSS)})
+
+
+def prune_panels(driver, keep_ids: list[str], detach: bool = False) -> int:
+    """
+    remove from the page the panels that the library never reads (charts, news, ...), so the browser stops
+    laying them out and painting them. the elements with the given ids, their whole subtree and their
+    ancestors are kept. it's undone by a reload, or by restore_panels()
+
+    :param driver: WebDriver
+    :param keep_ids: list of str, ids of the elements to keep
+    :param detach: bool, default: False, the panels are only hidden (display: none), if True they are removed
+     from the DOM, which saves more memory but only if the web app handles the removal of its elements
+    :return: int, amount of elements pruned
+    """
+    return driver.execute_script(PRUNE_PANELS_JS, keep_ids, KEEP_SELECTORS, detach)
+
+
+def restore_panels(driver) -> int:
+    """
+    put back the panels removed by prune_panels()
+
+    :param driver: WebDriver
+    :return: int, amount of elements restored
+    """
+    return driver.execute_script(RESTORE_PANELS_JS)
@@ -1,17 +1,17 @@
 from __future__ import annotations
 
-import time
 import os
+import time
 import warnings
+import threading
 from collections import namedtuple
+from typing import TYPE_CHECKING
 
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import Select
-from selenium.common.exceptions import NoSuchElementException, WebDriverException, StaleElementReferenceException
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
 from termcolor import colored
 
 from .time_helpers import Time, Timer, time_it
@@ -19,121 +19,284 @@ from .watchlist import Watchlist
 from .portfolio import Portfolio
 from .notification import Notification
 from .account import Account
-from .enums import Order, TIF
-
-os.system('color')
+from .enums import Order, TIF, OrderType, NotificationKind, ConnectionState
+from .dom import read_texts, parse_number
+from .wait import wait_until, PORTFOLIO_LOADED, SYMBOL_LOADED, LOCATE_STATUS, LOCATE_LOADED, LOGIN_OR_APP
+from .element_cache import ElementCache
+from .network_tap import NetworkTap
+from .chromedriver import launch_chrome
+from .session import SessionStore, UIState
+from .metrics import registry
+from .watchdog import ConnectionWatchdog
+from .lean import LEAN_CHROME_ARGUMENTS, KEEP_ELEMENT_IDS, apply_lean_profile, prune_panels, restore_panels
+from .orders import OrderSpec, OrderResult, OrderHandle, OrderTracker, validate_order, ticket_args, FILL_AND_SUBMIT_JS
+
+if TYPE_CHECKING:
+    from .tick_store import TickStore
 
 TZ_HOME_URL = 'https://standard.tradezeroweb.us/'
 
+QUOTE_ELEMENT_IDS = {
+    'symbol': 'trading-order-symbol',
+    'open': 'trading-order-open',
+    'high': 'trading-order-high',
+    'low': 'trading-order-low',
+    'close': 'trading-order-close',
+    'volume': 'trading-order-vol',
+    'last': 'trading-order-p',
+    'ask': 'trading-order-ask',
+    'bid': 'trading-order-bid',
+}
+
+READ_ORDER_TYPE_JS = """
+var select = document.getElementById('trading-order-select-type');
+return select !== null && select.selectedIndex >= 0 ? select.options[select.selectedIndex].text : null;
+"""
+
+Data = namedtuple('Data', ['open', 'high', 'low', 'close', 'volume', 'last', 'ask', 'bid'])
+
+_console_colors_enabled = False
+
+
+def print_colored(text: str, color: str):
+    """print colored text, the colors of the Windows console are enabled on the first call (not at import)"""
+    global _console_colors_enabled
+    if not _console_colors_enabled:
+        if os.name == 'nt':
+            os.system('color')
+        _console_colors_enabled = True
+    print(colored(text, color))
+
 
 class TradeZero(Time):
     def __init__(self, user_name: str, password: str, headless: bool = False,
-                 hide_attributes: bool = False):
+                 hide_attributes: bool = False, tick_store: TickStore | None = None,
+                 quote_cache_ttl: float | None = None, home_url: str = TZ_HOME_URL, network_tap: bool = False,
+                 driver_path: str | None = None, chromedriver_version: str | None = None,
+                 user_data_dir: str | None = None, session_file: str | None = None, lean: bool = False):
         """
         :param user_name: TradeZero user_name
         :param password: TradeZero password
         :param headless: default: False, True will run the browser in headless mode, which means it won't be visible
         :param hide_attributes: bool, if True: Hide account attributes (acc username, equity, total exposure...)
+        :param tick_store: TickStore, default: None, if given all the quotes read from the page will be recorded in it
+        :param quote_cache_ttl: float, default: None, max age in seconds of the quote used by bid, ask and last
+         (ex: 0.05), None means that every call reads the price from the page
+        :param home_url: str, default: TradeZero's web app, the url to load (ex: the mock site of the benchmarks)
+        :param network_tap: bool, default: False, if True the messages received by the web app (WebSocket frames)
+         can be read directly from the network with self.Network, see NetworkTap
+        :param driver_path: str, default: None, path of chromedriver, None means the cached one
+         (resolved with webdriver_manager only the first time, see resolve_chromedriver())
+        :param chromedriver_version: str, default: None, pin the version of chromedriver
+        :param user_data_dir: str, default: None, directory of a persistent Chrome profile, the cookies are kept
+         between runs so login() resumes the session instead of logging-in again (one directory per session)
+        :param session_file: str, default: None, file where the cookies and the UI state (watchlist, order type)
+         are saved by login() and exit(), and restored at the next start, see SessionStore
+        :param lean: bool, default: False, if True the images, fonts, analytics and charts are not downloaded,
+         and the animations are disabled, so each session uses less CPU and memory (see also prune_panels())
         """
         super().__init__()
+        self._started_at = time.perf_counter()
         self.user_name = user_name
         self.password = password
         self.hide_attributes = hide_attributes
+        self.tick_store = tick_store
+        self.quote_cache_ttl = quote_cache_ttl
+        self.home_url = home_url
+        self._quote_cache: tuple[float, dict[str, str]] | None = None
+        self._quote_lock = threading.Lock()
+        self.Session = SessionStore(session_file) if session_file else None
+        self._ui_state: UIState | None = None
+        self.resumed = False
+        self.time_to_ready: float | None = None
+        self.lean = lean
+        self._pruned_panels: bool | None = None  # the detach argument of the last prune_panels()
 
-        service = ChromeService(ChromeDriverManager().install())
         options = webdriver.ChromeOptions()
         options.add_experimental_option('excludeSwitches', ['enable-logging'])
         if headless is True:
             options.headless = headless
+        if network_tap is True:
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+        if user_data_dir is not None:
+            options.add_argument(f'--user-data-dir={os.path.abspath(os.path.expanduser(user_data_dir))}')
+        if lean is True:
+            for argument in LEAN_CHROME_ARGUMENTS:
+                options.add_argument(argument)
+
+        self.driver = launch_chrome(options, driver_path=driver_path, version=chromedriver_version)
+        if lean is True:
+            apply_lean_profile(self.driver)
+        self.driver.get(self.home_url)
+        if self.Session is not None:
+            self._ui_state = self.Session.restore(self.driver)
+        self.elements = ElementCache(self.driver)
 
-        self.driver = webdriver.Chrome(service=service, options=options)
-        self.driver.get(TZ_HOME_URL)
-
-        self.Watchlist = Watchlist(self.driver)
-        self.Portfolio = Portfolio(self.driver)
         self.Notification = Notification(self.driver)
+        self.Watchlist = Watchlist(self.driver, tick_store=tick_store, elements=self.elements,
+                                   notification=self.Notification)
+        self.Portfolio = Portfolio(self.driver, elements=self.elements)
         self.Account = Account(self.driver)
+        self.Orders = OrderTracker(self.driver, self.Notification)
+        self.Network = NetworkTap(self.driver, tick_store=tick_store) if network_tap else None
+        self.Watchdog = ConnectionWatchdog(
+            self.driver, lambda state: self.conn(reload=state in (ConnectionState.stale, ConnectionState.crashed)),
+            feed_expected=lambda: self.is_weekday and self.time_between((9, 30), (16, 0)))
 
-        # to instantiate the time, pytz, and datetime modules:
-        Timer()
-        self.time_between(time1=(9, 30), time2=(10, 30))
-
-    def _dom_fully_loaded(self, iter_amount: int = 1):
+    def _dom_fully_loaded(self, timeout: float = 0):
         """
         check that webpage elements are fully loaded/visible.
         there is no need to call this method, but instead call tz_conn() and that will take care of all the rest.
 
-        :param iter_amount: int, default: 1, number of times it will iterate.
+        :param timeout: float, default: 0, max amount of seconds to wait for the page to load (0 means check once)
         :return: if the elements are fully loaded: return True, else: return False.
         """
-        container_xpath = "//*[contains(@id,'portfolio-container')]//div//div//h2"
-        for i in range(iter_amount):
-            elements = self.driver.find_elements(By.XPATH, container_xpath)
-            text_elements = [x.text for x in elements]
-            if 'Portfolio' in text_elements:
-                return True
-            time.sleep(0.5)
-        return False
+        return wait_until(self.driver, PORTFOLIO_LOADED, timeout=timeout) is True
 
     @time_it
     def login(self, log_time_elapsed: bool = False):
         """
-        log-in TradeZero's website
+        log-in TradeZero's website, if the session was resumed (see user_data_dir and session_file)
+        the login form is skipped. then the UI state is restored, see restore_ui_state()
 
         :param log_time_elapsed: bool, if True it will print time elapsed for login
         """
-        login_form = self.driver.find_element(By.ID, "login")
-        login_form.send_keys(self.user_name)
+        self.elements.invalidate()  # the elements of the previous page are not valid anymore
+        self.resumed = wait_until(self.driver, LOGIN_OR_APP, timeout=75) == 'app'
+        if not self.resumed:
+            login_form = self.driver.find_element(By.ID, "login")
+            login_form.send_keys(self.user_name)
+
+            password_form = self.driver.find_element(By.ID, "password")
+            password_form.send_keys(self.password, Keys.RETURN)
+
+            self._dom_fully_loaded(timeout=75)
+
+        self.Notification.refresh()  # start capturing the notifications
+        self.restore_ui_state()
+
+        if self.time_to_ready is None:
+            self.time_to_ready = time.perf_counter() - self._started_at
+            registry.record('TradeZero.time_to_ready_warm' if self.resumed else 'TradeZero.time_to_ready_cold',
+                            self.time_to_ready)
+        if self.Session is not None:
+            self.save_session()
+
+    def ui_state(self) -> UIState:
+        """
+        :return: UIState namedtuple of the current page: (symbols, order_type, hide_attributes, saved_at)
+        """
+        order_type = self.driver.execute_script(READ_ORDER_TYPE_JS)
+        return UIState(sorted(self.Watchlist.symbols), order_type, self.hide_attributes, time.time())
+
+    def restore_ui_state(self, ui_state: UIState | None = None):
+        """
+        restore what is lost when the page is reloaded: the symbols of the watchlist, the selected order type,
+        and the hidden account attributes. login() and conn() call it, there is no need to call it directly.
 
-        password_form = self.driver.find_element(By.ID, "password")
-        password_form.send_keys(self.password, Keys.RETURN)
+        :param ui_state: UIState, default: None, the last one saved (by save_session(), or by a previous run)
+        """
+        ui_state = ui_state or self._ui_state
+        if ui_state is not None:
+            self.Watchlist.symbols.update(ui_state.symbols)
 
-        self._dom_fully_loaded(150)
-        if self.hide_attributes:
+        if self.hide_attributes or (ui_state is not None and ui_state.hide_attributes):
             self.Account.hide_attributes()
 
-        Select(self.driver.find_element(By.ID, "trading-order-select-type")).select_by_index(1)
+        order_menu = Select(self.elements.find(By.ID, "trading-order-select-type"))
+        if ui_state is not None and ui_state.order_type:
+            order_menu.select_by_visible_text(ui_state.order_type)
+        else:
+            order_menu.select_by_index(1)
+
+        self.Watchlist.restore()
+        if self._pruned_panels is not None:  # the reload put them back
+            self.prune_panels(detach=self._pruned_panels)
+
+    def prune_panels(self, detach: bool = False) -> int:
+        """
+        remove the panels of the web app that this library never reads (charts, news, ...) so that the browser
+        stops rendering them, every element used by the library is kept. they are pruned again after
+        a reconnection, until restore_panels() is called
+
+        :param detach: bool, default: False, the panels are only hidden (display: none), if True they are removed
+         from the DOM (see lean.prune_panels())
+        :return: int, amount of elements pruned
+        """
+        self._pruned_panels = detach
+        keep_ids = KEEP_ELEMENT_IDS + list(QUOTE_ELEMENT_IDS.values()) + self.Account.attribute_ids
+        return prune_panels(self.driver, keep_ids, detach=detach)
+
+    def restore_panels(self) -> int:
+        """
+        put back the panels removed by prune_panels()
+
+        :return: int, amount of elements restored
+        """
+        self._pruned_panels = None
+        return restore_panels(self.driver)
+
+    def save_session(self):
+        """
+        save the cookies and the UI state to session_file, so that the next run resumes the session,
+        it's called by login() and exit()
+
+        :raises Exception: if no session_file was given
+        """
+        if self.Session is None:
+            raise Exception('Error: cannot save the session, no session_file was given')
+        self._ui_state = self.ui_state()
+        self.Session.save(self.driver, self._ui_state)
 
-    def conn(self, log_tz_conn: bool = False):
+    @time_it
+    def conn(self, log_tz_conn: bool = False, reload: bool = False):
         """
         make sure that the website stays connected and is fully loaded.
         TradeZero will ask for a Login twice a day, and sometimes it will require the page to be reloaded,
         so this will make sure that its fully loaded, by reloading or doing the login.
+        the ConnectionWatchdog calls it automatically before the next trading call, see self.Watchdog
 
         :param log_tz_conn: bool, default: False. if True it will print if it reconnects through the login or refresh.
+        :param reload: bool, default: False, if True reload the page even if it looks loaded (ex: stale quotes)
         :return: True if connected
         :raises Exception: if it fails to reconnect after a while
         """
-        if self._dom_fully_loaded(1):
+        if not reload and self._dom_fully_loaded():
             return True
 
         try:
             self.driver.find_element(By.ID, "login")
             self.login()
 
-            self.Watchlist.restore()
-
             if log_tz_conn is True:
-                print(colored('tz_conn(): Login worked', 'cyan'))
+                print_colored('tz_conn(): Login worked', 'cyan')
             return True
 
         except NoSuchElementException:
-            self.driver.get("https://standard.tradezeroweb.us/")
-            if self._dom_fully_loaded(150):
-
-                if self.hide_attributes:
-                    self.Account.hide_attributes()
-
-                self.Watchlist.restore()
+            self.driver.get(self.home_url)
+            self.elements.invalidate()
+            page = wait_until(self.driver, LOGIN_OR_APP, timeout=75)
+            if page is not None:
+                if page == 'login':  # the session expired, the reload shows the login form
+                    self.login()
+                else:
+                    self.restore_ui_state()
 
                 if log_tz_conn is True:
-                    print(colored('tz_conn(): Refresh worked', 'cyan'))
+                    print_colored('tz_conn(): Refresh worked', 'cyan')
                 return True
 
         raise Exception('@ tz_conn(): Error: not able to reconnect, max retries exceeded')
 
     def exit(self):
-        """close Selenium window and driver"""
+        """close Selenium window and driver, the session is saved first if session_file was given"""
+        self.Watchdog.stop()
+        if self.Session is not None:
+            try:
+                self.save_session()
+            except WebDriverException:
+                pass  # the browser is already gone, the session saved by login() is kept
+
         try:
             self.driver.close()
         except WebDriverException:
@@ -141,90 +304,147 @@ class TradeZero(Time):
 
         self.driver.quit()
 
-    def load_symbol(self, symbol: str):
+    @time_it
+    def load_symbol(self, symbol: str, timeout: float = 5):
         """
         make sure the data for the symbol is fully loaded and that the symbol itself is valid
 
         :param symbol: str
-        :return: True if symbol data loaded, False if prices == 0.00 (mkt closed), Error if symbol not found
+        :param timeout: float, default: 5, max amount of seconds to wait for the data to load
+        :return: True if symbol data loaded, False if prices == 0.00 (mkt closed), None if the timeout was reached
         :raises Exception: if symbol not found
         """
-        if symbol.upper() == self.current_symbol():
-            price = self.driver.find_element(By.ID, "trading-order-ask").text.replace('.', '').replace(',', '')
+        return self._load_symbol(symbol, timeout)[0]
+
+    def _load_symbol(self, symbol: str, timeout: float = 5) -> tuple[bool | None, dict[str, str] | None]:
+        """
+        load_symbol() that also returns the quote snapshot read while loading (or None if the timeout was reached),
+        so the prices of the symbol don't need another round trip
+        """
+        snapshot = self.quote_snapshot()
+        if symbol.upper() == snapshot['symbol']:
+            price = snapshot['ask'].replace('.', '').replace(',', '')
             if price.isdigit() and float(price) > 0:
-                return True
+                return True, snapshot
 
-        input_symbol = self.driver.find_element(By.ID, "trading-order-input-symbol")
+        self.invalidate_quote()
+        started = time.time()
+        input_symbol = self.elements.find(By.ID, "trading-order-input-symbol")
         input_symbol.send_keys(symbol.lower(), Keys.RETURN)
-        time.sleep(0.04)
 
-        for i in range(300):
-            price = self.driver.find_element(By.ID, "trading-order-ask").text.replace('.', '').replace(',', '')
-            if price == '':
-                time.sleep(0.01)
+        try:
+            result = wait_until(self.driver, SYMBOL_LOADED, symbol.upper(), QUOTE_ELEMENT_IDS, timeout=timeout)
+        finally:
+            # a concurrent cached_quote() during the load may have cached the quote of the previous symbol
+            self.invalidate_quote()
+        if result is None:
+            self.Notification.refresh()
+            if self.Notification.find(NotificationKind.symbol_not_found, symbol, since=started) is not None:
+                raise Exception(f"ERROR: {symbol=} Not found")
+            warnings.warn(f'Timed out while loading the symbol {symbol.upper()}')
+            return None, None
+
+        if result.get('notFound'):
+            raise Exception(f"ERROR: {symbol=} Not found")
+
+        snapshot = self._store_snapshot(time.perf_counter(), result['quote'])
+        price = snapshot['ask'].replace('.', '').replace(',', '')
+        if float(price) == 0:
+            warnings.warn(f"Market Closed, ask/bid = {price}")
+            return False, snapshot
+        return True, snapshot
+
+    def quote_snapshot(self) -> dict[str, str]:
+        """
+        read the current symbol and all the prices of the order panel in a single WebDriver round trip,
+        the values are returned as raw text, use parse_number() (or float) to convert them.
+        this always reads the page, and the result is stored in the quote cache (see quote_cache_ttl)
+
+        :return: dict with the keys: 'symbol', 'open', 'high', 'low', 'close', 'volume', 'last', 'ask', 'bid'
+        """
+        read_time = time.perf_counter()
+        texts = read_texts(self.driver, list(QUOTE_ELEMENT_IDS.values()))
+        return self._store_snapshot(read_time, dict(zip(QUOTE_ELEMENT_IDS, texts)))
 
-            elif price.isdigit() and float(price) == 0:
-                warnings.warn(f"Market Closed, ask/bid = {price}")
-                return False
+    def _store_snapshot(self, read_time: float, texts: dict[str, str | None]) -> dict[str, str]:
+        """record the texts of QUOTE_ELEMENT_IDS read at read_time (perf_counter) and cache them as the quote"""
+        snapshot = {key: texts.get(key) or '' for key in QUOTE_ELEMENT_IDS}
+        snapshot['symbol'] = snapshot['symbol'].replace('(USD)', '').strip()
 
-            elif price.isdigit():
-                return True
+        if self.tick_store is not None:
+            self.tick_store.record_snapshot(snapshot)
+
+        self._quote_cache = (read_time, snapshot)
+        return snapshot
+
+    def cached_quote(self) -> dict[str, str]:
+        """
+        return the last quote_snapshot() if it's not older than quote_cache_ttl, else read a new one.
+        concurrent callers (from different threads) wait for the same read instead of each reading the page.
+
+        :return: dict, see quote_snapshot()
+        """
+        if self.quote_cache_ttl is None:
+            return self.quote_snapshot()
+
+        with self._quote_lock:
+            cache = self._quote_cache
+            if cache is not None and time.perf_counter() - cache[0] <= self.quote_cache_ttl:
+                return cache[1]
+            return self.quote_snapshot()
+
+    def invalidate_quote(self):
+        """discard the cached quote, it's called automatically when a new symbol is loaded"""
+        with self._quote_lock:
+            self._quote_cache = None
+
+    def refresh_quote(self) -> dict[str, str]:
+        """
+        force a fresh read of the quote (ignoring the cache), the following bid, ask and last will use it
 
-            elif i == 15 or i == 299:
-                last_notif = self.Notification.get_last_notification_message()
-                message = f'Symbol not found: {symbol.upper()}'
-                if message == last_notif:
-                    raise Exception(f"ERROR: {symbol=} Not found")
+        :return: dict, see quote_snapshot()
+        """
+        with self._quote_lock:
+            return self.quote_snapshot()
 
     def current_symbol(self):
         """get current symbol"""
-        return self.driver.find_element(By.ID, 'trading-order-symbol').text.replace('(USD)', '')
+        text, = read_texts(self.driver, [QUOTE_ELEMENT_IDS['symbol']])
+        return (text or '').replace('(USD)', '').strip()
 
     @property
     def bid(self):
-        """get bid price"""
-        return float(self.driver.find_element(By.ID, 'trading-order-bid').text.replace(',', ''))
+        """get bid price (from the cached quote if quote_cache_ttl is set, see cached_quote())"""
+        return parse_number(self.cached_quote()['bid'])
 
     @property
     def ask(self):
-        """get ask price"""
-        return float(self.driver.find_element(By.ID, 'trading-order-ask').text.replace(',', ''))
+        """get ask price (from the cached quote if quote_cache_ttl is set, see cached_quote())"""
+        return parse_number(self.cached_quote()['ask'])
 
     @property
     def last(self):
-        """get last price"""
-        return float(self.driver.find_element(By.ID, 'trading-order-p').text.replace(',', ''))
+        """get last price (from the cached quote if quote_cache_ttl is set, see cached_quote())"""
+        return parse_number(self.cached_quote()['last'])
 
+    @time_it
     def data(self, symbol: str):
         """
         return a namedtuple with data for the given symbol, the properties are:
         'open', 'high', 'low', 'close', 'volume', 'last', 'ask', 'bid'.
+        the values are read from the page along with the wait for the symbol to load (see load_symbol()),
+        without another WebDriver round trip
 
         :param symbol: str: ex: 'aapl', 'amd', 'NVDA', 'GM'
         :return: namedtuple = (open, high, low, close, volume, last, ask, bid)
         """
-        Data = namedtuple('Data', ['open', 'high', 'low', 'close', 'volume', 'last', 'ask', 'bid'])
-
-        if self.load_symbol(symbol) is False:
+        loaded, snapshot = self._load_symbol(symbol)
+        if loaded is False:
             return Data(0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
 
-        element_ids = [
-            'trading-order-open',
-            'trading-order-high',
-            'trading-order-low',
-            'trading-order-close',
-            'trading-order-vol',
-            'trading-order-p',
-            'trading-order-ask',
-            'trading-order-bid',
-        ]
-        lst = []
-        for id_ in element_ids:
-            val = self.driver.find_element(By.ID, id_).text
-            val = float(val.replace(',', ''))  # replace comma for volume, and when prices > 999
-            lst.append(val)
-
-        return Data._make(lst)
+        if snapshot is None:
+            snapshot = self.quote_snapshot()
+        return Data._make(parse_number(snapshot[field]) for field in Data._fields)
 
     def calculate_order_quantity(self, symbol: str, buying_power: float, float_option: bool = False):
         """
@@ -244,7 +464,9 @@ class TradeZero(Time):
             return quantity
         return int(quantity)
 
-    def locate_stock(self, symbol: str, share_amount: int, max_price: float = 0, debug_info: bool = False):
+    @time_it
+    def locate_stock(self, symbol: str, share_amount: int, max_price: float = 0, debug_info: bool = False,
+                     timeout: float = 45):
         """
         Locate a stock, requires: stock symbol, and share_amount. optional: max_price.
         if the locate_price is less than max_price: it will accept, else: decline.
@@ -253,9 +475,12 @@ class TradeZero(Time):
         :param share_amount: int, must be a multiple of 100 (100, 200, 300...)
         :param max_price: float, default: 0, total price you are willing to pay for locates
         :param debug_info: bool, if True it will print info about the locates in the console
+        :param timeout: float, default: 45, max amount of seconds to wait for the locate status and price
         :return: named tuple with the following attributes: 'price_per_share' and 'total'
         :raises Exception: if share_amount is not divisible by 100
+        :raises Exception: if the locate status or price didn't load before the timeout
         """
+        self.Watchdog.ensure_connected()
         Data = namedtuple('Data', ['price_per_share', 'total'])
 
         if share_amount is not None and share_amount % 100 != 0:
@@ -264,51 +489,52 @@ class TradeZero(Time):
         if not self.load_symbol(symbol):
             return
 
-        if self.last <= 1.00:
-            print(f'Error: Cannot locate stocks priced under $1.00 ({symbol=}, price={self.last})')
+        last = self.last
+        if last <= 1.00:
+            print(f'Error: Cannot locate stocks priced under $1.00 ({symbol=}, price={last})')
 
-        self.driver.find_element(By.ID, "locate-tab-1").click()
-        input_symbol = self.driver.find_element(By.ID, "short-list-input-symbol")
+        self.elements.find(By.ID, "locate-tab-1").click()
+        input_symbol = self.elements.find(By.ID, "short-list-input-symbol")
         input_symbol.clear()
         input_symbol.send_keys(symbol, Keys.RETURN)
 
-        input_shares = self.driver.find_element(By.ID, "short-list-input-shares")
+        input_shares = self.elements.find(By.ID, "short-list-input-shares")
         input_shares.clear()
         input_shares.send_keys(share_amount)
 
-        while self.driver.find_element(By.ID, "short-list-locate-status").text == '':
-            time.sleep(0.1)
+        status = wait_until(self.driver, LOCATE_STATUS, timeout=timeout)
+        if status is None:
+            raise Exception(f'Error: timed out while waiting for the locate status ({symbol=})')
 
-        if self.driver.find_element(By.ID, "short-list-locate-status").text == 'Easy to borrow':
+        if status == 'Easy to borrow':
             locate_pps = 0.00
             locate_total = 0.00
             if debug_info:
-                print(colored(f'Stock ({symbol}) is "Easy to borrow"', 'green'))
+                print_colored(f'Stock ({symbol}) is "Easy to borrow"', 'green')
             return Data(locate_pps, locate_total)
 
-        self.driver.find_element(By.ID, "short-list-button-locate").click()
+        started = time.time()
+        self.elements.find(By.ID, "short-list-button-locate").click()
 
-        for i in range(300):
-            try:
-                locate_pps = float(self.driver.find_element(By.ID, f"oitem-l-{symbol.upper()}-cell-2").text)
-                locate_total = float(self.driver.find_element(By.ID, f"oitem-l-{symbol.upper()}-cell-6").text)
-                break
-
-            except (ValueError, NoSuchElementException, StaleElementReferenceException):
-                time.sleep(0.15)
-                if i == 15 or i == 299:
-                    insufficient_bp = 'Insufficient BP to short a position with requested quantity.'
-                    last_notif = self.Notification.get_last_notification_message()
-                    if insufficient_bp in last_notif:
-                        warnings.warn(f"ERROR! {insufficient_bp}")
-                        return
-        else:
+        result = wait_until(self.driver, LOCATE_LOADED, symbol.upper(), timeout=timeout)
+        if result is None:
+            self.Notification.refresh()
+            if self.Notification.find(NotificationKind.insufficient_bp, since=started) is not None:
+                result = {'insufficientBp': True}
+        if result is None:
             raise Exception(f'Error: not able to locate symbol element ({symbol=})')
 
+        if result.get('insufficientBp'):
+            warnings.warn("ERROR! Insufficient BP to short a position with requested quantity.")
+            return
+
+        locate_pps = float(result['pps'])
+        locate_total = float(result['total'])
+
         if locate_total <= max_price:
             self.driver.find_element(By.XPATH, f'//*[@id="oitem-l-{symbol.upper()}-cell-8"]/span[1]').click()
             if debug_info:
-                print(colored(f'HTB Locate accepted ({symbol}, $ {locate_total})', 'cyan'))
+                print_colored(f'HTB Locate accepted ({symbol}, $ {locate_total})', 'cyan')
         else:
             self.driver.find_element(By.XPATH, f'//*[@id="oitem-l-{symbol.upper()}-cell-8"]/span[2]').click()
 
@@ -326,6 +552,7 @@ class TradeZero(Time):
         :raises Exception: if given symbol in not already located
         :raises ValueError: if quantity is not divisible by 100 or quantity > located shares
         """
+        self.Watchdog.ensure_connected()
         located_symbols = self.driver.find_elements(By.XPATH, '//*[@id="locate-inventory-table"]/tbody/tr/td[1]')
         located_symbols = [x.text for x in located_symbols]
 
@@ -350,9 +577,10 @@ class TradeZero(Time):
 
     @time_it
     def limit_order(self, order_direction: Order, symbol: str, share_amount: int, limit_price: float,
-                    time_in_force: TIF = TIF.DAY, log_info: bool = False):
+                    time_in_force: TIF = TIF.DAY, log_info: bool = False) -> OrderHandle:
         """
         Place a Limit Order, the following params are required: order_direction, symbol, share_amount, and limit_price.
+        returns an OrderHandle that tracks the order until it's filled, canceled or rejected.
 
         :param order_direction: str: 'buy', 'sell', 'short', 'cover'
         :param symbol: str: e.g: 'aapl', 'amd', 'NVDA', 'GM'
@@ -360,9 +588,11 @@ class TradeZero(Time):
         :param share_amount: int
         :param time_in_force: str, default: 'DAY', must be one of the following: 'DAY', 'GTC', or 'GTX'
         :param log_info: bool, if True it will print information about the order
-        :return: True if operation succeeded
+        :return: OrderHandle
         :raises AttributeError: if time_in_force argument not one of the following: 'DAY', 'GTC', 'GTX'
         """
+        self.Watchdog.ensure_connected()
+        self.Orders.prime()
         symbol = symbol.lower()
         order_direction = order_direction.value
         time_in_force = time_in_force.value
@@ -372,41 +602,47 @@ class TradeZero(Time):
 
         self.load_symbol(symbol)
 
-        order_menu = Select(self.driver.find_element(By.ID, "trading-order-select-type"))
+        order_menu = Select(self.elements.find(By.ID, "trading-order-select-type"))
         order_menu.select_by_index(1)
 
-        tif_menu = Select(self.driver.find_element(By.ID, "trading-order-select-time"))
+        tif_menu = Select(self.elements.find(By.ID, "trading-order-select-time"))
         tif_menu.select_by_visible_text(time_in_force)
 
-        input_quantity = self.driver.find_element(By.ID, "trading-order-input-quantity")
+        input_quantity = self.elements.find(By.ID, "trading-order-input-quantity")
         input_quantity.clear()
         input_quantity.send_keys(share_amount)
 
-        price_input = self.driver.find_element(By.ID, "trading-order-input-price")
+        price_input = self.elements.find(By.ID, "trading-order-input-price")
         price_input.clear()
         price_input.send_keys(limit_price)
 
-        self.driver.find_element(By.ID, f"trading-order-button-{order_direction}").click()
+        submitted_at = time.time()
+        self.elements.find(By.ID, f"trading-order-button-{order_direction}").click()
 
         if log_info is True:
             print(f"Time: {self.time}, Order direction: {order_direction}, Symbol: {symbol}, "
                   f"Limit Price: {limit_price}, Shares amount: {share_amount}")
+        spec = OrderSpec(Order(order_direction), symbol, share_amount, OrderType.limit, limit_price, TIF(time_in_force))
+        return self.Orders.track(spec, submitted_at)
 
     @time_it
     def market_order(self, order_direction: Order, symbol: str, share_amount: int,
-                     time_in_force: TIF = TIF.DAY, log_info: bool = False):
+                     time_in_force: TIF = TIF.DAY, log_info: bool = False) -> OrderHandle:
         """
         Place a Market Order, The following params are required: order_direction, symbol, and share_amount
+        returns an OrderHandle that tracks the order until it's filled, canceled or rejected.
 
         :param order_direction: str: 'buy', 'sell', 'short', 'cover'
         :param symbol: str: e.g: 'aapl', 'amd', 'NVDA', 'GM'
         :param share_amount: int
         :param time_in_force: str, default: 'DAY', must be one of the following: 'DAY', 'GTC', or 'GTX'
         :param log_info: bool, if True it will print information about the order
-        :return:
+        :return: OrderHandle
         :raises Exception: if time not during market hours (9:30 - 16:00)
         :raises AttributeError: if time_in_force argument not one of the following: 'DAY', 'GTC', 'GTX'
         """
+        self.Watchdog.ensure_connected()
+        self.Orders.prime()
         symbol = symbol.lower()
         order_direction = order_direction.value
         time_in_force = time_in_force.value
@@ -419,28 +655,32 @@ class TradeZero(Time):
 
         self.load_symbol(symbol)
 
-        order_menu = Select(self.driver.find_element(By.ID, "trading-order-select-type"))
+        order_menu = Select(self.elements.find(By.ID, "trading-order-select-type"))
         order_menu.select_by_index(0)
 
-        tif_menu = Select(self.driver.find_element(By.ID, "trading-order-select-time"))
+        tif_menu = Select(self.elements.find(By.ID, "trading-order-select-time"))
         tif_menu.select_by_visible_text(time_in_force)
 
-        input_quantity = self.driver.find_element(By.ID, "trading-order-input-quantity")
+        input_quantity = self.elements.find(By.ID, "trading-order-input-quantity")
         input_quantity.clear()
         input_quantity.send_keys(share_amount)
 
-        self.driver.find_element(By.ID, f"trading-order-button-{order_direction}").click()
+        submitted_at = time.time()
+        self.elements.find(By.ID, f"trading-order-button-{order_direction}").click()
 
         if log_info is True:
             print(f"Time: {self.time}, Order direction: {order_direction}, Symbol: {symbol}, "
                   f"Price: {self.last}, Shares amount: {share_amount}")
+        spec = OrderSpec(Order(order_direction), symbol, share_amount, OrderType.market, None, TIF(time_in_force))
+        return self.Orders.track(spec, submitted_at)
 
     @time_it
     def stop_market_order(self, order_direction: Order, symbol: str, share_amount: int, stop_price: float,
-                          time_in_force: TIF = TIF.DAY, log_info: bool = False):
+                          time_in_force: TIF = TIF.DAY, log_info: bool = False) -> OrderHandle:
         """
         Place a Stop Market Order, the following params are required: order_direction, symbol,
         share_amount, and stop_price.
+        returns an OrderHandle that tracks the order until it's filled, canceled or rejected.
         note that a Stop Market Order can only be placed during market-hours (09:30:00 - 16:00:00), therefore if a
         Stop Market Order is placed outside market hours it will raise an error.
 
@@ -450,10 +690,12 @@ class TradeZero(Time):
         :param share_amount: int
         :param time_in_force: str, default: 'DAY', must be one of the following: 'DAY', 'GTC', or 'GTX'
         :param log_info: bool, if True it will print information about the order
-        :return: True if operation succeeded
+        :return: OrderHandle
         :raises Exception: if time not during market hours (9:30 - 16:00)
         :raises AttributeError: if time_in_force argument not one of the following: 'DAY', 'GTC', 'GTX'
         """
+        self.Watchdog.ensure_connected()
+        self.Orders.prime()
         symbol = symbol.lower()
         order_direction = order_direction.value
         time_in_force = time_in_force.value
@@ -466,22 +708,74 @@ class TradeZero(Time):
 
         self.load_symbol(symbol)
 
-        order_menu = Select(self.driver.find_element(By.ID, "trading-order-select-type"))
+        order_menu = Select(self.elements.find(By.ID, "trading-order-select-type"))
         order_menu.select_by_index(2)
 
-        tif_menu = Select(self.driver.find_element(By.ID, "trading-order-select-time"))
+        tif_menu = Select(self.elements.find(By.ID, "trading-order-select-time"))
         tif_menu.select_by_visible_text(time_in_force)
 
-        input_quantity = self.driver.find_element(By.ID, "trading-order-input-quantity")
+        input_quantity = self.elements.find(By.ID, "trading-order-input-quantity")
         input_quantity.clear()
         input_quantity.send_keys(share_amount)
 
-        price_input = self.driver.find_element(By.ID, "trading-order-input-sprice")
+        price_input = self.elements.find(By.ID, "trading-order-input-sprice")
         price_input.clear()
         price_input.send_keys(stop_price)
 
-        self.driver.find_element(By.ID, f"trading-order-button-{order_direction}").click()
+        submitted_at = time.time()
+        self.elements.find(By.ID, f"trading-order-button-{order_direction}").click()
 
         if log_info is True:
             print(f"Time: {self.time}, Order direction: {order_direction}, Symbol: {symbol}, "
                   f"Stop Price: {stop_price}, Shares amount: {share_amount}")
+        spec = OrderSpec(Order(order_direction), symbol, share_amount, OrderType.stop, stop_price, TIF(time_in_force))
+        return self.Orders.track(spec, submitted_at)
+
+    @time_it
+    def submit_orders(self, orders: list[OrderSpec], log_info: bool = False) -> list[OrderResult]:
+        """
+        Submit a basket of orders as fast as possible, all the orders are validated before sending the first one,
+        and each ticket is filled and submitted with a single WebDriver call (after loading the symbol).
+
+        example:
+        results = tz.submit_orders([
+            OrderSpec(Order.BUY, 'AMD', 100, OrderType.limit, price=101.5),
+            OrderSpec(Order.SHORT, 'UBER', 200, OrderType.market),
+        ])
+
+        :param orders: list of OrderSpec namedtuples
+        :param log_info: bool, if True it will print information about each order
+        :return: list of OrderResult namedtuples: (spec, submitted_at, latency, error, handle), in the same order
+        :raises ValueError: if one or more orders are not valid (in which case no order is sent)
+        :raises Exception: if there are market or stop orders and the time is not during market hours (9:30 - 16:00)
+        """
+        self.Watchdog.ensure_connected()
+        self.Orders.prime()
+        orders = [OrderSpec(*spec) for spec in orders]
+        errors = [f'order #{i} ({spec.symbol}): {error}'
+                  for i, spec in enumerate(orders) for error in validate_order(spec)]
+        if errors:
+            raise ValueError('Error: invalid orders:\n' + '\n'.join(errors))
+
+        if any(spec.order_type != OrderType.limit for spec in orders) and not self.time_between((9, 30), (16, 0)):
+            raise Exception(f'Error: Market and Stop orders are not allowed at this time ({self.time})')
+
+        results = []
+        for spec in orders:
+            timer = Timer()
+            try:
+                if self.load_symbol(spec.symbol) is None:
+                    raise Exception(f'Error: timed out while loading the symbol {spec.symbol}')
+
+                submitted_at = self.driver.execute_script(FILL_AND_SUBMIT_JS, ticket_args(spec)) / 1000
+                results.append(OrderResult(spec, submitted_at, timer.time_elapsed, None,
+                                           self.Orders.track(spec, submitted_at)))
+
+            except Exception as e:
+                results.append(OrderResult(spec, None, timer.time_elapsed, e))
+
+            if log_info is True:
+                print(f"Time: {self.time}, Order direction: {spec.direction.value}, Symbol: {spec.symbol}, "
+                      f"Type: {spec.order_type.name}, Price: {spec.price}, Shares amount: {spec.quantity}, "
+                      f"Latency: {results[-1].latency * 1000:.1f}ms, Error: {results[-1].error}")
+        return results
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import json
+import threading
+
+
+class LatencyHistogram:
+    """
+    A latency histogram with log-linear buckets (like HdrHistogram): the values are recorded in microseconds,
+    the buckets are exact up to 2**sub_bucket_bits microseconds, and above that each power of two is split into
+    2**(sub_bucket_bits - 1) buckets, so the relative error of the percentiles is below 2**(1 - sub_bucket_bits)
+    (1.6% by default), with a constant recording cost and only a few hundred buckets from 1us to hours.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 7):
+        """
+        :param sub_bucket_bits: int, default: 7, precision of the buckets (see the class docstring)
+        """
+        self.sub_bucket_bits = sub_bucket_bits
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        """
+        :param seconds: float, the latency in seconds, a negative latency is recorded as 0
+        """
+        seconds = max(seconds, 0.0)
+        value = int(seconds * 1_000_000)
+        shift = value.bit_length() - self.sub_bucket_bits
+        index = value if shift <= 0 else (shift << self.sub_bucket_bits) + (value >> shift)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += seconds
+        if seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def _bucket_value(self, index: int) -> float:
+        """the middle of a bucket, in seconds"""
+        shift = index >> self.sub_bucket_bits
+        if shift == 0:
+            return index / 1_000_000
+        sub_bucket = index & ((1 << self.sub_bucket_bits) - 1)
+        return ((sub_bucket << shift) + (1 << (shift - 1))) / 1_000_000
+
+    def percentile(self, percent: float) -> float:
+        """
+        :param percent: float, between 0 and 100, ex: 99.9
+        :return: the latency in seconds below which the given percentage of the values are (0.0 if empty)
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(1, round(percent / 100 * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(max(self._bucket_value(index), self.min), self.max)
+        return self.max
+
+    def merge(self, other: LatencyHistogram):
+        """add the values of another histogram with the same sub_bucket_bits"""
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+
+class _MethodStats:
+    """latency histogram, calls and errors of one method"""
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.errors = 0
+
+    def as_dict(self) -> dict:
+        histogram = self.histogram
+        calls = histogram.count
+        return {
+            'calls': calls,
+            'errors': self.errors,
+            'error_rate': self.errors / calls if calls else 0.0,
+            'avg': histogram.total / calls if calls else 0.0,
+            'min': histogram.min if calls else 0.0,
+            'max': histogram.max,
+            'p50': histogram.percentile(50),
+            'p90': histogram.percentile(90),
+            'p99': histogram.percentile(99),
+            'p999': histogram.percentile(99.9),
+        }
+
+
+class MetricsRegistry:
+    """
+    Collects the latency of the methods decorated with @time_it (login, load_symbol, the order methods...)
+    and any other counter, recording a value costs about a microsecond so it can stay on while trading.
+    note that each process has its own registry (ex: the sessions of a SessionPool).
+
+    example:
+    from tradezero_api import registry
+
+    print(registry.snapshot()['methods']['TradeZero.limit_order']['p99'])
+    print(registry.to_prometheus())
+    """
+
+    def __init__(self, prefix: str = 'tradezero'):
+        """
+        :param prefix: str, default: 'tradezero', prefix of the metric names in the Prometheus exposition
+        """
+        self.prefix = prefix
+        self._methods: dict[str, _MethodStats] = {}
+        self._counters: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, method: str, seconds: float, error: bool = False):
+        """
+        record a call of a method
+
+        :param method: str, name of the method, ex: 'TradeZero.login'
+        :param seconds: float, latency of the call
+        :param error: bool, default: False, True if the call raised an exception
+        """
+        with self._lock:
+            stats = self._methods.get(method)
+            if stats is None:
+                stats = self._methods[method] = _MethodStats()
+            stats.histogram.record(seconds)
+            if error:
+                stats.errors += 1
+
+    def increment(self, counter: str, amount: float = 1):
+        """
+        :param counter: str, name of the counter, ex: 'orders_submitted'
+        :param amount: float, default: 1
+        """
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + amount
+
+    def histogram(self, method: str) -> LatencyHistogram | None:
+        """the histogram of a method, or None if it was never called"""
+        stats = self._methods.get(method)
+        return None if stats is None else stats.histogram
+
+    def reset(self):
+        """remove all the recorded values"""
+        with self._lock:
+            self._methods.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> dict:
+        """
+        return the metrics as a dict, ex:
+        {'methods': {'TradeZero.login': {'calls': 1, 'errors': 0, 'error_rate': 0.0, 'avg': 8.1, 'min': 8.1,
+                                         'max': 8.1, 'p50': 8.1, 'p90': 8.1, 'p99': 8.1, 'p999': 8.1}, ...},
+         'counters': {'orders_submitted': 12}}
+        the times are in seconds
+
+        :return: dict
+        """
+        with self._lock:
+            return {
+                'methods': {method: stats.as_dict() for method, stats in self._methods.items()},
+                'counters': dict(self._counters),
+            }
+
+    def to_json(self, **kwargs) -> str:
+        """
+        :param kwargs: arguments for json.dumps (ex: indent=2)
+        :return: the snapshot() as a JSON string
+        """
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def to_prometheus(self) -> str:
+        """
+        :return: the metrics in the Prometheus text exposition format (a summary for the latency of each method,
+         and a counter for the calls, errors and each counter)
+        """
+        snapshot = self.snapshot()
+        latency = f'{self.prefix}_method_latency_seconds'
+        lines = [f'# HELP {latency} Latency of the TradeZero methods.', f'# TYPE {latency} summary']
+        for method, stats in snapshot['methods'].items():
+            for quantile, key in (('0.5', 'p50'), ('0.9', 'p90'), ('0.99', 'p99'), ('0.999', 'p999')):
+                lines.append(f'{latency}{{method="{method}",quantile="{quantile}"}} {stats[key]}')
+            lines.append(f'{latency}_sum{{method="{method}"}} {stats["avg"] * stats["calls"]}')
+            lines.append(f'{latency}_count{{method="{method}"}} {stats["calls"]}')
+
+        for key, help_text in (('calls', 'Calls of the TradeZero methods.'),
+                               ('errors', 'Calls of the TradeZero methods that raised an exception.')):
+            metric = f'{self.prefix}_method_{key}_total'
+            lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} counter']
+            lines += [f'{metric}{{method="{method}"}} {stats[key]}' for method, stats in snapshot['methods'].items()]
+
+        for counter, value in snapshot['counters'].items():
+            metric = f'{self.prefix}_{counter}_total'
+            lines += [f'# TYPE {metric} counter', f'{metric} {value}']
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
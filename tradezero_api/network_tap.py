@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import re
+import json
+import time
+import base64
+import asyncio
+from collections import namedtuple
+from concurrent.futures import Future
+from typing import Callable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .tick_store import TickStore
+
+NetworkFrame = namedtuple('NetworkFrame', ['kind', 'url', 'payload', 'ts'])
+NetworkFrame.__doc__ = """
+A message received by the page: kind is 'ws' (a WebSocket frame) or 'xhr' (the body of an XHR/fetch response),
+payload is the text of the message, and ts is the epoch time in seconds when the browser received it.
+"""
+
+FeedEvent = namedtuple('FeedEvent', ['kind', 'symbol', 'data', 'ts'])
+FeedEvent.__doc__ = """
+A decoded message of the web app's feed: kind is 'quote', 'order', 'position' (or any other type of message),
+symbol is None if the message has no symbol, data is the dict of the message, ts is the time of the frame.
+"""
+
+# engine.io/socket.io packets start with their type, ex: '42["quote",{"s":"AMD","l":101.5}]'
+PACKET_PREFIX = re.compile(r'^\d+')
+
+SYMBOL_KEYS = ('symbol', 'sym', 's')
+TYPE_KEYS = ('type', 'event', 'channel', 't')
+
+
+class JsonFeedDecoder:
+    """
+    Decodes JSON messages into FeedEvents: a message can be an object with a type field ({'type': 'quote', ...}),
+    a socket.io event ('42["quote", {...}]'), or a list of them.
+    the type names of the web app's protocol are translated with kinds, ex: {'l1': 'quote', 'ord': 'order'}
+    (the kinds that are not in the dict are kept as they are), and the field names with fields,
+    ex: {'l': 'last', 'b': 'bid', 'a': 'ask', 'v': 'volume'}.
+    any other callable that receives a NetworkFrame and returns a list of FeedEvents can be used as decoder.
+    """
+
+    def __init__(self, kinds: dict[str, str] | None = None, fields: dict[str, str] | None = None):
+        """
+        :param kinds: dict, default: None, the names of the message types of the protocol -> kind of FeedEvent
+        :param fields: dict, default: None, the names of the fields of the protocol -> names of the data keys
+        """
+        self.kinds = kinds or {}
+        self.fields = fields or {}
+
+    def __call__(self, frame: NetworkFrame) -> list[FeedEvent]:
+        payload = PACKET_PREFIX.sub('', frame.payload, count=1) if frame.kind == 'ws' else frame.payload
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return []  # a ping, or a binary message of another protocol
+
+        # a socket.io event: ['quote', {...}]
+        if isinstance(message, list) and len(message) == 2 and isinstance(message[0], str):
+            return self._decode(message[1], message[0], frame.ts)
+        messages = message if isinstance(message, list) else [message]
+        return [event for item in messages for event in self._decode(item, None, frame.ts)]
+
+    def _decode(self, message, kind: str | None, ts: float) -> list[FeedEvent]:
+        if isinstance(message, list):
+            return [event for item in message for event in self._decode(item, kind, ts)]
+        if not isinstance(message, dict):
+            return []
+
+        data = {self.fields.get(key, key): value for key, value in message.items()}
+        if kind is None:
+            kind = next((data[key] for key in TYPE_KEYS if isinstance(data.get(key), str)), None)
+            if kind is None:
+                return []
+        symbol = next((data[key] for key in SYMBOL_KEYS if isinstance(data.get(key), str)), None)
+        return [FeedEvent(self.kinds.get(kind, kind), symbol.upper() if symbol else None, data, ts)]
+
+
+class NetworkTap:
+    """
+    Reads the messages that the web app receives over the network (WebSocket frames, and optionally the
+    XHR/fetch responses) through the Chrome DevTools Protocol, before they are rendered in the page,
+    and decodes them into FeedEvents (quotes, orders, positions...).
+
+    the frames are read from the performance log of Chrome (Network.webSocketFrameReceived, ...), so all the frames
+    received since the last poll are fetched with a single WebDriver call, and the driver must be created
+    with the performance log enabled (TradeZero(..., network_tap=True) takes care of it).
+
+    example:
+    tz = TradeZero(user_name='username', password='password', network_tap=True)
+    tz.login()
+    for event in tz.Network.stream():
+        if event.kind == 'quote':
+            print(event.symbol, event.data)
+    """
+
+    def __init__(self, driver, decoder: Callable[[NetworkFrame], list[FeedEvent]] | None = None,
+                 include_xhr: bool = False, tick_store: TickStore | None = None):
+        """
+        :param driver: WebDriver (Chrome) with the performance log enabled
+        :param decoder: callable that decodes a NetworkFrame into a list of FeedEvents,
+         default: None (JsonFeedDecoder())
+        :param include_xhr: bool, default: False, if True the bodies of the XHR/fetch responses are decoded too
+         (it costs one more WebDriver call per response)
+        :param tick_store: TickStore, default: None, if given the quote events are recorded in it
+        """
+        self.driver = driver
+        self.decoder = decoder or JsonFeedDecoder()
+        self.include_xhr = include_xhr
+        self.tick_store = tick_store
+        self.quotes: dict[str, dict] = {}
+        self.frames_received = 0
+        self._sockets: dict[str, str] = {}
+        self._responses: dict[str, str] = {}
+        # optional function that runs the polls of astream() on the driver thread (AsyncTradeZero sets it),
+        # it receives a callable and returns a concurrent.futures.Future
+        self.submit: Callable[[Callable], Future] | None = None
+
+    def read_frames(self) -> list[NetworkFrame]:
+        """
+        return the frames received by the page since the last call
+
+        :return: list of NetworkFrame namedtuples (kind, url, payload, ts)
+        """
+        frames = []
+        for entry in self.driver.get_log('performance'):
+            message = json.loads(entry['message'])['message']
+            method, params = message.get('method'), message.get('params', {})
+            ts = entry['timestamp'] / 1000
+
+            if method == 'Network.webSocketCreated':
+                self._sockets[params['requestId']] = params.get('url')
+            elif method == 'Network.webSocketFrameReceived':
+                response = params['response']
+                payload = response.get('payloadData', '')
+                if response.get('opcode') == 2:
+                    payload = base64.b64decode(payload).decode('utf-8', errors='replace')
+                frames.append(NetworkFrame('ws', self._sockets.get(params['requestId']), payload, ts))
+            elif method == 'Network.webSocketClosed':
+                self._sockets.pop(params['requestId'], None)
+            elif self.include_xhr and method == 'Network.responseReceived' and params.get('type') in ('XHR', 'Fetch'):
+                self._responses[params['requestId']] = params['response'].get('url')
+            elif self.include_xhr and method == 'Network.loadingFinished' and params['requestId'] in self._responses:
+                url = self._responses.pop(params['requestId'])
+                body = self._response_body(params['requestId'])
+                if body is not None:
+                    frames.append(NetworkFrame('xhr', url, body, ts))
+        self.frames_received += len(frames)
+        return frames
+
+    def _response_body(self, request_id: str) -> str | None:
+        try:
+            result = self.driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+        except Exception:
+            return None  # the body is not available anymore (ex: the page navigated)
+        if result.get('base64Encoded'):
+            return base64.b64decode(result['body']).decode('utf-8', errors='replace')
+        return result['body']
+
+    def poll(self) -> list[FeedEvent]:
+        """
+        return the events decoded from the frames received since the last call (a single WebDriver call),
+        the last values of each symbol are also merged in self.quotes (see quote())
+
+        :return: list of FeedEvent namedtuples (kind, symbol, data, ts)
+        """
+        events = [event for frame in self.read_frames() for event in self.decoder(frame)]
+        for event in events:
+            if event.kind != 'quote' or event.symbol is None:
+                continue
+            self.quotes.setdefault(event.symbol, {}).update(event.data)
+            if self.tick_store is not None:
+                values = {column: event.data[column] for column in ('last', 'bid', 'ask', 'vol')
+                          if isinstance(event.data.get(column), (int, float))}
+                if isinstance(event.data.get('volume'), (int, float)):
+                    values['vol'] = event.data['volume']
+                if values:
+                    self.tick_store.record(event.symbol, event.ts, **values)
+        return events
+
+    def quote(self, symbol: str) -> dict | None:
+        """
+        :param symbol: str
+        :return: the last values received for the symbol (without any WebDriver call), or None
+        """
+        return self.quotes.get(symbol.upper())
+
+    def stream(self, interval: float = 0.02, timeout: float | None = None):
+        """
+        A generator that yields the events of the feed as they are received by the page
+
+        :param interval: float, seconds between each poll
+        :param timeout: float, default: None, stop after the given amount of seconds (None means never)
+        :return: generator of FeedEvent namedtuples: (kind, symbol, data, ts)
+        """
+        end = None if timeout is None else time.perf_counter() + timeout
+        while end is None or time.perf_counter() < end:
+            yield from self.poll()
+            time.sleep(interval)
+
+    async def astream(self, interval: float = 0.02, timeout: float | None = None):
+        """
+        asyncio version of stream(), it sleeps with asyncio.sleep() between each poll.
+        the polls run on the driver thread if self.submit is set (AsyncTradeZero sets it, see
+        AsyncTradeZero.feed_stream()), else in the default executor, then the session must not be used
+        from another thread at the same time
+
+        :param interval: float, seconds between each poll
+        :param timeout: float, default: None, stop after the given amount of seconds (None means never)
+        :return: async generator of FeedEvent namedtuples: (kind, symbol, data, ts)
+        """
+        loop = asyncio.get_running_loop()
+        end = None if timeout is None else time.perf_counter() + timeout
+        while end is None or time.perf_counter() < end:
+            if self.submit is not None:
+                events = await asyncio.shield(asyncio.wrap_future(self.submit(self.poll)))
+            else:
+                events = await loop.run_in_executor(None, self.poll)
+            for event in events:
+                yield event
+            await asyncio.sleep(interval)
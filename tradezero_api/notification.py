@@ -1,15 +1,108 @@
 from __future__ import annotations
 
+import re
+from collections import namedtuple, deque
+
 from selenium.webdriver.common.by import By
 
 from .time_helpers import Time
+from .enums import NotificationKind
+from .wait import wait_until, NOTIFICATION_CONTAINS
+
+NotificationEvent = namedtuple('NotificationEvent', ['seq', 'time', 'title', 'message', 'kind',
+                                                     'symbol', 'side', 'quantity', 'price', 'ts'])
+
+# ex: 'Your Limit Buy order of 100 AMD was filled at 101.50', 'Your Limit Buy order of 1 AMD was canceled.'
+ORDER_MESSAGE = re.compile(
+    r'(?P<side>buy|sell|short|cover) order of (?P<quantity>[\d,]+) (?P<symbol>[A-Z0-9.]+) '
+    r'(?:was|has been) (?P<status>partially filled|filled|executed|canceled|cancelled|rejected|accepted|placed)'
+    r'(?: at \$?(?P<price>[\d,]+(?:\.\d+)?))?',
+    re.IGNORECASE)
+SYMBOL_NOT_FOUND = re.compile(r'Symbol not found: (?P<symbol>\S+)')
+INSUFFICIENT_BP = re.compile(r'Insufficient BP', re.IGNORECASE)
+
+ORDER_STATUS_KINDS = {
+    'partially filled': NotificationKind.order_partially_filled,
+    'filled': NotificationKind.order_filled,
+    'executed': NotificationKind.order_filled,
+    'canceled': NotificationKind.order_canceled,
+    'cancelled': NotificationKind.order_canceled,
+    'rejected': NotificationKind.order_rejected,
+    'accepted': NotificationKind.order_accepted,
+    'placed': NotificationKind.order_accepted,
+}
+
+# capture every <li> inserted in the notifications list as [seq, text, timestamp],
+# starting with the ones already in the list when the observer is installed
+SUBSCRIBE_JS = """
+var list = document.getElementById('notifications-list-1');
+if (list === null) {
+    return false;
+}
+var api = window.tzApi = window.tzApi || {};
+if (api.notificationObserver && api.notificationList === list) {
+    return true;
+}
+if (api.notificationObserver) {
+    api.notificationObserver.disconnect();
+}
+var maxSize = arguments[0];
+api.notificationList = list;
+api.notificationBuffer = [];
+api.notificationSeq = api.notificationSeq || 0;
+api.notificationSeen = new WeakSet();
+// the notifications already shown are captured too (the newest is first in the list), with the time 0: unknown
+for (var i = list.children.length - 1; i >= 0; i--) {
+    var item = list.children[i];
+    api.notificationSeen.add(item);
+    if (item.nodeName === 'LI' && item.innerText.trim() !== '') {
+        api.notificationBuffer.push([++api.notificationSeq, item.innerText.trim(), 0]);
+    }
+}
+api.notificationObserver = new MutationObserver(function (mutations) {
+    var now = Date.now();
+    mutations.forEach(function (mutation) {
+        mutation.addedNodes.forEach(function (node) {
+            if (node.nodeName !== 'LI' || api.notificationSeen.has(node) || node.innerText.trim() === '') {
+                return;
+            }
+            api.notificationSeen.add(node);
+            api.notificationBuffer.push([++api.notificationSeq, node.innerText.trim(), now]);
+        });
+    });
+    if (api.notificationBuffer.length > maxSize) {
+        api.notificationBuffer.splice(0, api.notificationBuffer.length - maxSize);
+    }
+});
+api.notificationObserver.observe(list, {childList: true});
+return true;
+"""
+
+DRAIN_JS = """
+var api = window.tzApi;
+if (!api || !api.notificationObserver || api.notificationList !== document.getElementById('notifications-list-1')) {
+    return null;
+}
+var buffer = api.notificationBuffer;
+api.notificationBuffer = [];
+return buffer;
+"""
 
 
 class Notification(Time):
     """A class for retrieving notifications from the web-app"""
 
-    def __init__(self, driver):
+    def __init__(self, driver, history_size: int = 1000):
+        """
+        :param driver: WebDriver
+        :param history_size: int, default: 1000, amount of events kept by poll_new() in self.events
+        """
         self.driver = driver
+        self.buffer_size = 10_000
+        self.events: deque[NotificationEvent] = deque(maxlen=history_size)
+        self.received = 0  # amount of events received since the start, see events_since()
+        self._pending: deque[NotificationEvent] = deque(maxlen=history_size)
+        self._subscribed = False
 
     def get_last_notification_message(self):
         """
@@ -19,6 +112,17 @@ class Notification(Time):
         """
         return self.driver.find_element(By.CSS_SELECTOR, 'span.message').text
 
+    def wait_for_notification(self, text: str, timeout: float = 10):
+        """
+        wait until the last notification message contains the given text,
+        returns as soon as the notification is shown (no polling)
+
+        :param text: str, ex: 'Symbol not found'
+        :param timeout: float, default: 10, max amount of seconds to wait
+        :return: the notification message, or None if the timeout was reached
+        """
+        return wait_until(self.driver, NOTIFICATION_CONTAINS, text, timeout=timeout)
+
     def get_notifications(self, notif_amount: int = 1):
         """
         return a nested list with each sublist containing [time, title, message],
@@ -70,3 +174,131 @@ class Notification(Time):
                 notification[0] = str(self.time)
 
             yield notification
+
+    def subscribe(self, buffer_size: int = 10_000):
+        """
+        start capturing every notification as soon as it's inserted in the page (with a MutationObserver),
+        so that no notification is lost, even if many arrive between two calls of poll_new().
+        TradeZero.login() calls it automatically.
+
+        :param buffer_size: max amount of notifications kept in the page between two polls (the oldest are dropped)
+        :raises Exception: if the notifications list is not present in the page
+        """
+        self.buffer_size = buffer_size
+        if not self.driver.execute_script(SUBSCRIBE_JS, buffer_size):
+            raise Exception('Error: cannot subscribe to the notifications, "notifications-list-1" not found')
+        self._subscribed = True
+
+    def refresh(self) -> list[NotificationEvent]:
+        """
+        fetch the notifications that were inserted since the last refresh (a single WebDriver call)
+        into the local index (self.events, see find()), without consuming them for poll_new().
+        if the observer is not installed yet (or the page was reloaded) it's installed, and the notifications
+        already shown are fetched by the next refresh, with ts=0 since their time is unknown.
+
+        :return: list of the new NotificationEvent, oldest first
+        """
+        buffer = self.driver.execute_script(DRAIN_JS)
+        if buffer is None:
+            self._subscribed = bool(self.driver.execute_script(SUBSCRIBE_JS, self.buffer_size))
+            return []
+
+        events = []
+        for seq, text, ts in buffer:
+            event = self.parse(text, seq=seq, ts=ts / 1000)
+            self.events.append(event)
+            self.received += 1
+            events.append(event)
+        self._pending.extend(events)
+        return events
+
+    def poll_new(self) -> list[NotificationEvent]:
+        """
+        return the notifications that were inserted since the last call, each one parsed into a
+        NotificationEvent namedtuple: (seq, time, title, message, kind, symbol, side, quantity, price, ts)
+        kind is a NotificationKind (order_filled, order_canceled, symbol_not_found...), and symbol, side,
+        quantity and price are None if they are not part of the message.
+        the first call subscribes automatically (if subscribe() wasn't called already) and returns an empty list,
+        the notifications already shown at that moment are returned by the next call (with ts=0).
+
+        example:
+        for event in tz.Notification.poll_new():
+            if event.kind == NotificationKind.order_filled:
+                print(f'{event.symbol} filled at {event.price}')
+
+        :return: list of NotificationEvent, oldest first
+        """
+        self.refresh()
+        events = list(self._pending)
+        self._pending.clear()
+        return events
+
+    def events_since(self, cursor: int) -> tuple[list[NotificationEvent], int]:
+        """
+        return the events added to self.events after the given cursor, whoever called refresh(),
+        so that several readers can follow the notifications without consuming them for each other
+
+        :param cursor: int, the cursor returned by the previous call, or 0
+        :return: tuple: (list of NotificationEvent oldest first, the new cursor)
+        """
+        amount = min(self.received - cursor, len(self.events))
+        return (list(self.events)[-amount:] if amount > 0 else []), self.received
+
+    def parse(self, text: str, seq: int | None = None, ts: float | None = None) -> NotificationEvent:
+        """
+        parse the text of a notification ('time\\ntitle\\nmessage') into a NotificationEvent
+
+        :param text: str
+        :param seq: int, sequence number
+        :param ts: float, epoch time in seconds when it was received
+        :return: NotificationEvent
+        """
+        lines = text.split('\n')
+        if len(lines) < 3:
+            lines = [''] * (3 - len(lines)) + lines  # without the time, or the title
+        time_, title, message = lines[0], lines[1], ' '.join(lines[2:])
+        if time_ in ('', '-'):
+            time_ = str(self.time)
+
+        symbol = side = quantity = price = None
+        match = ORDER_MESSAGE.search(message)
+        if match is not None:
+            kind = ORDER_STATUS_KINDS[match['status'].lower()]
+            symbol, side = match['symbol'].upper(), match['side'].lower()
+            quantity = int(match['quantity'].replace(',', ''))
+            price = float(match['price'].replace(',', '')) if match['price'] else None
+
+        elif (match := SYMBOL_NOT_FOUND.search(message)) is not None:
+            kind = NotificationKind.symbol_not_found
+            symbol = match['symbol'].upper()
+
+        elif INSUFFICIENT_BP.search(message) is not None:
+            kind = NotificationKind.insufficient_bp
+
+        else:
+            kind = NotificationKind.other
+        return NotificationEvent(seq, time_, title, message, kind, symbol, side, quantity, price, ts)
+
+    def find(self, kind: NotificationKind, symbol: str | None = None, since: float | None = None,
+             after_seq: int | None = None):
+        """
+        return the most recent event (received by refresh() or poll_new()) of the given kind, without reading the page
+
+        :param kind: NotificationKind
+        :param symbol: str, default: None, only events for the given symbol
+        :param since: float, default: None, only events received after the given epoch time
+        :param after_seq: int, default: None, only events with a greater seq (see NOTIFICATION_SEQ in wait.py),
+         unlike since it doesn't depend on the clocks of python and the browser
+        :return: NotificationEvent or None
+        """
+        symbol = symbol.upper() if symbol is not None else None
+        for event in reversed(self.events):
+            if since is not None and event.ts is not None and event.ts < since:
+                return None
+            if after_seq is not None and event.seq is not None and event.seq <= after_seq:
+                return None
+            if after_seq is not None and event.ts == 0:
+                continue  # already shown when the capture started (after a reload its seq starts over)
+            if event.kind == kind and (symbol is None or event.symbol == symbol):
+                return event
+        return None
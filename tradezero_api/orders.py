@@ -0,0 +1,431 @@
+from __future__ import annotations
+
+import time
+import asyncio
+import threading
+from collections import namedtuple
+from concurrent.futures import Future
+from typing import Callable
+
+from .enums import Order, OrderType, TIF, OrderState, NotificationKind
+from .dom import read_table_changes
+from .notification import Notification, NotificationEvent
+from .metrics import registry
+
+OrderSpec = namedtuple('OrderSpec', ['direction', 'symbol', 'quantity', 'order_type', 'price', 'time_in_force'],
+                       defaults=[OrderType.limit, None, TIF.DAY])
+OrderSpec.__doc__ = """
+An order for TradeZero.submit_orders(), ex:
+OrderSpec(Order.BUY, 'AMD', 100, OrderType.limit, price=101.5)
+OrderSpec(Order.SHORT, 'UBER', 200, OrderType.market)
+
+price is the limit price for limit orders and the stop price for stop orders (ignored for market orders)
+"""
+
+OrderResult = namedtuple('OrderResult', ['spec', 'submitted_at', 'latency', 'error', 'handle'],
+                         defaults=[None])
+OrderResult.__doc__ = """
+The result of an order sent with TradeZero.submit_orders():
+submitted_at is the epoch time (in seconds, measured by the browser) when the order button was clicked,
+latency is the amount of seconds it took to load the symbol, fill the ticket and submit it,
+error is None if the order was submitted, else the exception that was raised,
+and handle is the OrderHandle that tracks the order (None if it wasn't submitted).
+"""
+
+# index of each order type in the drop-down menu, and the id of its price input
+ORDER_TICKETS = {
+    OrderType.market: (0, None),
+    OrderType.limit: (1, 'trading-order-input-price'),
+    OrderType.stop: (2, 'trading-order-input-sprice'),
+}
+
+FILL_AND_SUBMIT_JS = """
+var ticket = arguments[0];
+
+function dispatch(element) {
+    element.dispatchEvent(new Event('input', {bubbles: true}));
+    element.dispatchEvent(new Event('change', {bubbles: true}));
+}
+function setValue(id, value) {
+    var input = document.getElementById(id);
+    var setter = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(input), 'value').set;
+    setter.call(input, value);
+    dispatch(input);
+}
+
+var orderType = document.getElementById('trading-order-select-type');
+orderType.selectedIndex = ticket.typeIndex;
+dispatch(orderType);
+
+var tif = document.getElementById('trading-order-select-time');
+for (var i = 0; i < tif.options.length; i++) {
+    if (tif.options[i].text === ticket.tif) {
+        tif.selectedIndex = i;
+        dispatch(tif);
+        break;
+    }
+}
+
+setValue('trading-order-input-quantity', String(ticket.quantity));
+if (ticket.priceInput !== null) {
+    setValue(ticket.priceInput, String(ticket.price));
+}
+
+var submittedAt = Date.now();
+document.getElementById('trading-order-button-' + ticket.direction).click();
+return submittedAt;
+"""
+
+
+def validate_order(spec: OrderSpec) -> list[str]:
+    """
+    check that an order spec is valid (without checking the market hours)
+
+    :param spec: OrderSpec
+    :return: list of error messages, empty if the spec is valid
+    """
+    errors = []
+    if not isinstance(spec.direction, Order):
+        errors.append(f'direction must be an Order enum, not {spec.direction!r}')
+    if not isinstance(spec.symbol, str) or not spec.symbol:
+        errors.append(f'invalid symbol {spec.symbol!r}')
+    if not isinstance(spec.quantity, int) or spec.quantity <= 0:
+        errors.append(f'quantity must be a positive int, not {spec.quantity!r}')
+    if spec.order_type not in ORDER_TICKETS:
+        errors.append(f'order_type must be one of: {", ".join(t.name for t in ORDER_TICKETS)}, '
+                      f'not {spec.order_type!r}')
+    elif spec.order_type != OrderType.market and (not isinstance(spec.price, (int, float)) or spec.price <= 0):
+        errors.append(f'a positive price is required for {spec.order_type.name} orders, not {spec.price!r}')
+    if spec.time_in_force not in list(TIF):
+        errors.append(f'time_in_force must be one of: DAY, GTC, GTX, not {spec.time_in_force!r}')
+    return errors
+
+
+def ticket_args(spec: OrderSpec) -> dict:
+    """
+    return the argument for FILL_AND_SUBMIT_JS
+
+    :param spec: a valid OrderSpec
+    :return: dict
+    """
+    type_index, price_input = ORDER_TICKETS[spec.order_type]
+    return {
+        'typeIndex': type_index,
+        'tif': TIF(spec.time_in_force).value,
+        'quantity': spec.quantity,
+        'priceInput': price_input,
+        'price': spec.price,
+        'direction': spec.direction.value,
+    }
+
+
+# the columns of the active orders table (aoTable-1), without the first cell (the cancel button)
+ACTIVE_ORDER_COLUMNS = ['ref_number', 'symbol', 'side', 'qty', 'type', 'status', 'tif', 'limit', 'stop', 'placed']
+
+# the texts used for each side in the notifications and in the active orders table
+SIDE_ALIASES = {
+    Order.BUY: {'buy', 'b'},
+    Order.SELL: {'sell', 's'},
+    Order.SHORT: {'short', 'ss', 'sell short'},
+    Order.COVER: {'cover', 'bc', 'buy to cover'},
+}
+
+NOTIFICATION_STATES = {
+    NotificationKind.order_accepted: OrderState.accepted,
+    NotificationKind.order_partially_filled: OrderState.partially_filled,
+    NotificationKind.order_filled: OrderState.filled,
+    NotificationKind.order_canceled: OrderState.canceled,
+    NotificationKind.order_rejected: OrderState.rejected,
+}
+
+TERMINAL_STATES = {OrderState.filled, OrderState.canceled, OrderState.rejected, OrderState.closed}
+
+# seconds to wait for the notification of an order that left the active orders table, before closing its handle
+CLOSE_GRACE = 3
+
+
+class OrderHandle:
+    """
+    Tracks the state of a submitted order: pending -> accepted -> (partially_filled) -> filled, canceled or rejected
+    (or closed: it left the active orders table without a notification telling how).
+    the state is updated by OrderTracker.update() from the notifications and the active orders table,
+    see wait_filled() and filled() to wait for the fill.
+
+    example:
+    handle = tz.limit_order(Order.BUY, 'AMD', 100, 101.5)
+    if handle.wait_filled(timeout=30):
+        print(f'filled at {handle.fill_price}, after {handle.fill_latency * 1000:.0f}ms')
+    """
+
+    def __init__(self, tracker: OrderTracker, spec: OrderSpec, submitted_at: float):
+        """
+        :param tracker: the OrderTracker that updates this handle
+        :param spec: OrderSpec
+        :param submitted_at: epoch time in seconds when the order was submitted
+        """
+        self.tracker = tracker
+        self.spec = spec
+        self.submitted_at = submitted_at
+        self.state = OrderState.pending
+        self.order_id: str | None = None
+        self.row: dict[str, str] | None = None
+        self.fill_price: float | None = None
+        self.filled_quantity = 0  # the whole quantity once filled (the partial fills don't tell their quantity)
+        self.acked_at: float | None = None
+        self.done_at: float | None = None
+        self.removed_at: float | None = None  # when the order left the active orders table
+        self.events: list[NotificationEvent] = []
+
+    def __repr__(self):
+        return (f'OrderHandle({self.spec.direction.value} {self.spec.quantity} {self.spec.symbol.upper()}, '
+                f'state={self.state.value}, order_id={self.order_id})')
+
+    @property
+    def done(self) -> bool:
+        """True if the order is filled, canceled, rejected or closed"""
+        return self.state in TERMINAL_STATES
+
+    @property
+    def ack_latency(self) -> float | None:
+        """seconds between the submission and the first sign that the broker accepted the order, or None"""
+        return None if self.acked_at is None else self.acked_at - self.submitted_at
+
+    @property
+    def fill_latency(self) -> float | None:
+        """seconds between the submission and the fill, or None if not filled"""
+        if self.state != OrderState.filled or self.done_at is None:
+            return None
+        return self.done_at - self.submitted_at
+
+    def update(self) -> OrderState:
+        """
+        update the state of all the tracked orders (see OrderTracker.update())
+
+        :return: the state of this order
+        """
+        self.tracker.update()
+        return self.state
+
+    def wait_filled(self, timeout: float = 30, interval: float = 0.1) -> bool | None:
+        """
+        block until the order is filled, canceled, rejected or closed
+
+        :param timeout: float, default: 30, max amount of seconds to wait
+        :param interval: float, default: 0.1, seconds between two updates
+        :return: True if filled, False if canceled, rejected or closed (see self.state),
+         None if the timeout was reached
+        """
+        deadline = time.perf_counter() + timeout
+        while self.update() not in TERMINAL_STATES:
+            if time.perf_counter() >= deadline:
+                return None
+            time.sleep(interval)
+        return self.state == OrderState.filled
+
+    async def filled(self, timeout: float = 30, interval: float = 0.1) -> bool | None:
+        """
+        wait until the order is filled, canceled, rejected or closed, without blocking the event loop:
+        the updates run on the driver thread if the tracker has a submit function (AsyncTradeZero sets it),
+        else in the default executor.
+
+        :param timeout: float, default: 30, max amount of seconds to wait
+        :param interval: float, default: 0.1, seconds between two updates
+        :return: True if filled, False if canceled, rejected or closed (see self.state),
+         None if the timeout was reached
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while not self.done:
+            if self.tracker.submit is not None:
+                await asyncio.shield(asyncio.wrap_future(self.tracker.submit(self.tracker.update)))
+            else:
+                await loop.run_in_executor(None, self.tracker.update)
+            if self.done:
+                break
+            if loop.time() >= deadline:
+                return None
+            await asyncio.sleep(interval)
+        return self.state == OrderState.filled
+
+
+class OrderTracker:
+    """
+    Keeps the OrderHandle of every order submitted through TradeZero, and updates their state
+    with a single call that reads the new notifications (see Notification.refresh())
+    and the rows of the active orders table that changed since the last update (see read_table_changes()).
+    """
+
+    def __init__(self, driver, notification: Notification):
+        """
+        :param driver: WebDriver
+        :param notification: the Notification instance of the session
+        """
+        self.driver = driver
+        self.notification = notification
+        self.handles: list[OrderHandle] = []
+        # optional function that runs the updates of OrderHandle.filled() on the driver thread,
+        # it receives a callable and returns a concurrent.futures.Future
+        self.submit: Callable[[Callable], Future] | None = None
+        self._lock = threading.RLock()
+        # the notifications are also refreshed by other calls (load_symbol, Watchlist.add_many...),
+        # so the tracker reads Notification.events from its own cursor
+        self._cursor = notification.received
+        # browser time of the first read of the active orders table, and the orders that were already in it
+        # (placed before this session, or by another one) which are never matched to a handle
+        self._table_seen_at: float | None = None
+        self._foreign_ids: set[str] = set()
+
+    def prime(self):
+        """
+        read the active orders table once before the first order is submitted, so that the orders already in it
+        are not mistaken for the new ones (it does nothing after the first call, the order methods call it)
+        """
+        with self._lock:
+            if self._table_seen_at is not None:
+                return
+            changes = read_table_changes(self.driver, 'aoTable-1', name='orderTracker', key_attribute='order-id')
+            if changes is not None:
+                self._table_seen_at = changes.ts
+                self._foreign_ids.update(order_id for order_id, _ in changes.changed)
+
+    @property
+    def open_handles(self) -> list[OrderHandle]:
+        """the handles of the orders that are not filled, canceled or rejected yet"""
+        return [handle for handle in self.handles if not handle.done]
+
+    def track(self, spec: OrderSpec, submitted_at: float) -> OrderHandle:
+        """
+        create the handle of an order that was just submitted
+
+        :param spec: OrderSpec
+        :param submitted_at: epoch time in seconds when the order was submitted
+        :return: OrderHandle
+        """
+        with self._lock:
+            handle = OrderHandle(self, spec, submitted_at)
+            self.handles = [h for h in self.handles if not h.done]  # the finished ones are not tracked anymore
+            self.handles.append(handle)
+            registry.increment('orders_submitted')
+            return handle
+
+    def update(self):
+        """update the state of the open orders from the new notifications and the active orders table"""
+        with self._lock:
+            if not self.open_handles:
+                self._cursor = self.notification.received
+                return
+            self.notification.refresh()
+            events, self._cursor = self.notification.events_since(self._cursor)
+            for event in events:
+                self._apply_event(event)
+
+            changes = read_table_changes(self.driver, 'aoTable-1', name='orderTracker', key_attribute='order-id')
+            if changes is not None:
+                if self._table_seen_at is None:
+                    # prime() wasn't called, so the rows already in the table can't be told apart from the new ones
+                    self._table_seen_at = min(handle.submitted_at for handle in self.open_handles)
+                for order_id, cells in changes.changed:
+                    self._apply_row(order_id, dict(zip(ACTIVE_ORDER_COLUMNS, cells[1:])), changes.ts)
+                for order_id in changes.removed:
+                    handle = self._by_order_id(order_id)
+                    if handle is not None:
+                        handle.row = None
+                        handle.removed_at = changes.ts
+
+            # the notification of a fill or a cancel usually arrives with the removal of the row
+            now = time.time()
+            for handle in self.open_handles:
+                if handle.removed_at is not None and now - handle.removed_at > CLOSE_GRACE:
+                    self._set_state(handle, OrderState.closed, handle.removed_at)
+
+    def _by_order_id(self, order_id: str) -> OrderHandle | None:
+        return next((handle for handle in self.handles if handle.order_id == order_id), None)
+
+    def _match(self, symbol: str | None, side: str | None, quantity: int | None, ts: float,
+               unbound: bool = False) -> OrderHandle | None:
+        """
+        the oldest open order with the given symbol and side, submitted before ts,
+        with the same quantity if there is one
+
+        :param unbound: bool, default: False, only the orders without an order_id (for a new row of the table)
+        """
+        if symbol is None or side is None:
+            return None
+        side = side.lower()
+        candidates = [
+            handle for handle in self.open_handles
+            if handle.spec.symbol.upper() == symbol.upper() and side in SIDE_ALIASES[handle.spec.direction]
+            and handle.submitted_at <= ts + 1  # the clocks of python and the browser might differ slightly
+            and not (unbound and handle.order_id is not None)
+        ]
+        for handle in candidates:
+            if handle.spec.quantity == quantity:
+                return handle
+        return candidates[0] if candidates else None
+
+    def _apply_event(self, event: NotificationEvent):
+        state = NOTIFICATION_STATES.get(event.kind)
+        if state is None:
+            return
+        handle = self._match(event.symbol, event.side, event.quantity, event.ts)
+        if handle is None:
+            return
+
+        handle.events.append(event)
+        if handle.acked_at is None:
+            self._set_acked(handle, event.ts)
+        if state == OrderState.filled:
+            handle.filled_quantity = handle.spec.quantity
+        if event.price is not None and state in (OrderState.partially_filled, OrderState.filled):
+            handle.fill_price = event.price
+        self._set_state(handle, state, event.ts)
+
+    def _apply_row(self, order_id: str, row: dict[str, str], ts: float):
+        handle = self._by_order_id(order_id)
+        if handle is None:
+            if order_id in self._foreign_ids:
+                return
+            try:
+                quantity = int(float(row['qty'].replace(',', '')))
+            except (KeyError, ValueError):
+                quantity = None
+            handle = self._match(row.get('symbol'), row.get('side'), quantity, ts, unbound=True)
+            if handle is None or (self._table_seen_at is not None and handle.submitted_at < self._table_seen_at - 1):
+                return  # an order that wasn't submitted through this session
+            handle.order_id = order_id
+
+        handle.row = row
+        handle.removed_at = None
+        if handle.acked_at is None:
+            self._set_acked(handle, ts)
+        status = row.get('status', '').lower()
+        if 'partial' in status:
+            self._set_state(handle, OrderState.partially_filled, ts)
+        elif handle.state == OrderState.pending:
+            self._set_state(handle, OrderState.accepted, ts)
+
+    @staticmethod
+    def _after_submission(handle: OrderHandle, ts: float) -> float:
+        """
+        the browser time ts, but not before the submission (python time): the clocks of python and the browser
+        may differ, the skew is counted in 'orders_clock_skew' and recorded in 'OrderHandle.clock_skew'
+        """
+        if ts >= handle.submitted_at:
+            return ts
+        registry.increment('orders_clock_skew')
+        registry.record('OrderHandle.clock_skew', handle.submitted_at - ts)
+        return handle.submitted_at
+
+    def _set_acked(self, handle: OrderHandle, ts: float):
+        handle.acked_at = self._after_submission(handle, ts)
+        registry.record('OrderHandle.ack_latency', handle.ack_latency)
+
+    def _set_state(self, handle: OrderHandle, state: OrderState, ts: float):
+        if handle.done:
+            return
+        handle.state = state
+        if state in TERMINAL_STATES:
+            handle.done_at = self._after_submission(handle, ts)
+            registry.increment(f'orders_{state.value}')
+            if state == OrderState.filled:
+                registry.record('OrderHandle.fill_latency', handle.fill_latency)
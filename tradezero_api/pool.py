@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+import queue
+import signal
+import warnings
+import multiprocessing as mp
+
+from .main import TradeZero, Data
+from .time_helpers import Timer
+
+READY = 'ready'
+DEAD = 'dead'
+STARTED = 'started'
+
+
+def _session_worker(index: int, user_name: str, password: str, kwargs: dict, tasks, results):
+    """
+    the loop of each worker process: log-in, then load the symbols from the shared task queue until None.
+    since all the sessions take their tasks from the same queue, faster sessions simply take more symbols.
+    """
+    # a stuck session is terminated by SessionPool (see task_timeout), exit normally so the browser is closed
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(1))
+
+    # Chrome can't share a profile between two browsers, so each session gets its own
+    if kwargs.get('user_data_dir'):
+        kwargs = {**kwargs, 'user_data_dir': os.path.join(kwargs['user_data_dir'], f'session-{index}')}
+    if kwargs.get('session_file'):
+        kwargs = {**kwargs, 'session_file': f"{kwargs['session_file']}.{index}"}
+
+    try:
+        tz = TradeZero(user_name, password, **kwargs)
+        tz.login()
+    except Exception as e:
+        results.put((DEAD, index, None, repr(e)))
+        return
+    results.put((READY, index, None, None))
+
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                return
+
+            batch_id, task_id, symbol = task
+            results.put((STARTED, index, (batch_id, task_id), None))
+            try:
+                data = tz.data(symbol)
+            except Exception as e:
+                # maybe the session was logged out or the page needs to be reloaded, so retry once after conn()
+                try:
+                    tz.conn()
+                except Exception as conn_error:
+                    tasks.put(task)  # let another session load this symbol
+                    results.put((DEAD, index, None, repr(conn_error)))
+                    return
+                try:
+                    data = tz.data(symbol)
+                except Exception:
+                    results.put(((batch_id, task_id), index, None, repr(e)))
+                    continue
+            results.put(((batch_id, task_id), index, tuple(data) if data is not None else None, None))
+    finally:
+        tz.exit()
+
+
+class SessionPool:
+    """
+    A pool of logged-in TradeZero sessions, each one running in its own process (with its own browser),
+    to load many symbols in parallel: each session loads one symbol at a time through the order panel,
+    so the throughput scales with the amount of sessions (and CPU cores).
+
+    example:
+    with SessionPool(user_name='username', password='password', size=4, headless=True) as pool:
+        data = pool.data_many(['AAPL', 'AMD', 'NVDA', 'GM', ...])
+        print(data['AMD'].last)
+    """
+
+    def __init__(self, user_name: str, password: str, size: int | None = None, start_timeout: float = 120,
+                 task_timeout: float | None = 60, **kwargs):
+        """
+        :param user_name: TradeZero user_name
+        :param password: TradeZero password
+        :param size: int, amount of sessions, default: None (amount of CPU cores)
+        :param start_timeout: float, default: 120, max amount of seconds to wait for the sessions to log-in
+        :param task_timeout: float, default: 60, max amount of seconds a session can spend on one symbol,
+         a session that takes longer is considered stuck: its process is terminated and replaced by a new session
+         (which logs-in again), and the symbol is given to another session (once). None to wait forever
+        :param kwargs: any other argument for TradeZero (headless, hide_attributes, ...),
+         user_data_dir and session_file are suffixed with the index of each session
+        :raises Exception: if none of the sessions was able to log-in
+        """
+        self.size = size or os.cpu_count() or 1
+        self.task_timeout = task_timeout
+        self.last_errors: dict[str, str] = {}
+        self.symbols_per_session: dict[int, int] = {}
+        self._batch_id = 0
+        # index of the session -> the task it's loading and the perf_counter() when it started
+        self._running: dict[int, tuple[tuple[int, int], float]] = {}
+        self._retried: set[tuple[int, int]] = set()
+        self._symbols: list[str] = []
+        self._worker_args = (user_name, password, kwargs)
+        self._starting: set[int] = set()  # the sessions that are logging-in
+
+        self._context = mp.get_context('spawn')
+        self._tasks = self._context.Queue()
+        self._results = self._context.Queue()
+        self._processes = [None] * self.size
+        for i in range(self.size):
+            self._start_session(i)
+
+        self.alive = set()
+        for _ in range(self.size):
+            try:
+                status, index, _, error = self._results.get(timeout=start_timeout)
+            except queue.Empty:
+                break
+            self._starting.discard(index)
+            if status == READY:
+                self.alive.add(index)
+            else:
+                warnings.warn(f'Session #{index} was not able to log-in: {error}')
+
+        if not self.alive:
+            self.close()
+            raise Exception('Error: none of the sessions was able to log-in')
+
+    def data_many(self, symbols: list[str], timeout: float | None = None) -> dict[str, Data | None]:
+        """
+        load the data of many symbols in parallel, see TradeZero.data()
+
+        :param symbols: list of symbols
+        :param timeout: float, default: None, max amount of seconds to wait for all the symbols
+         (each symbol is limited by task_timeout anyway)
+        :return: dict with the symbols as keys and the Data namedtuples as values,
+         the symbols that couldn't be loaded have None as value (and the error in self.last_errors)
+        :raises Exception: if all the sessions died before loading all the symbols
+        """
+        symbols = [symbol.upper() for symbol in symbols]
+        data: dict[str, Data | None] = {symbol: None for symbol in symbols}
+        self._symbols = symbols
+        self.last_errors = {}
+
+        # the results of a previous call that timed out might still arrive, so they are tagged with a batch id
+        self._batch_id += 1
+        self._retried = set()
+        for task_id, symbol in enumerate(symbols):
+            self._tasks.put((self._batch_id, task_id, symbol))
+
+        timer = Timer()
+        checked_at = time.perf_counter()
+        remaining = len(symbols)
+        while remaining:
+            if timeout is not None and timer.time_elapsed > timeout:
+                warnings.warn(f'data_many() timed out, {remaining} symbols were not loaded')
+                self._drain_tasks()
+                break
+            try:
+                status, index, values, error = self._results.get(timeout=1)
+            except queue.Empty:
+                status = None
+            if status == DEAD:
+                self.alive.discard(index)
+                self._starting.discard(index)
+                self._running.pop(index, None)  # the worker put its task back in the queue
+                warnings.warn(f'Session #{index} disconnected: {error}')
+            # the sessions are checked at least every second, even while the others keep sending results
+            if status is None or status == DEAD or time.perf_counter() - checked_at > 1:
+                checked_at = time.perf_counter()
+                for task_id in self._check_alive():
+                    remaining -= 1
+                    self.last_errors[symbols[task_id]] = 'the session died or got stuck while loading it'
+            if status is None or status == DEAD:
+                continue
+
+            if status == READY:  # a session that logged-in after start_timeout, or that replaced a stuck one
+                self.alive.add(index)
+                self._starting.discard(index)
+                continue
+            if status == STARTED:
+                self._running[index] = (values, time.perf_counter())
+                continue
+
+            batch_id, task_id = status
+            if index in self._running and self._running[index][0] == status:
+                del self._running[index]
+            if batch_id != self._batch_id:
+                continue
+
+            remaining -= 1
+            self.symbols_per_session[index] = self.symbols_per_session.get(index, 0) + 1
+            if error is None:
+                data[symbols[task_id]] = None if values is None else Data._make(values)
+            else:
+                self.last_errors[symbols[task_id]] = error
+        return data
+
+    def _check_alive(self) -> list[int]:
+        """
+        terminate the sessions stuck on a task for more than task_timeout (they are replaced by new sessions),
+        remove the sessions whose process exited, and put back in the queue the task each one was loading
+        (once, a symbol that kills or blocks a second session too is given up)
+
+        :return: list of the task ids of the current batch that were given up
+        :raises Exception: if there are no sessions left
+        """
+        stuck = []
+        if self.task_timeout is not None:
+            now = time.perf_counter()
+            stuck = [index for index, (_, started_at) in self._running.items()
+                     if now - started_at > self.task_timeout]
+        for index in stuck:
+            warnings.warn(f'Session #{index} spent more than {self.task_timeout}s on a symbol, restarting it')
+            self._stop_session(index)
+
+        failed = []
+        for index in list(self._running):
+            if self._processes[index].is_alive():
+                continue
+            task, _ = self._running.pop(index)
+            batch_id, task_id = task
+            if batch_id != self._batch_id:
+                continue
+            if task in self._retried:
+                failed.append(task_id)
+            else:
+                self._retried.add(task)
+                self._tasks.put((batch_id, task_id, self._symbols[task_id]))
+
+        self.alive = {i for i in self.alive if self._processes[i].is_alive()}
+        for index in stuck:
+            self._start_session(index)
+        self._starting = {i for i in self._starting if self._processes[i].is_alive()}
+        if not self.alive and not self._starting:
+            raise Exception('Error: all the sessions are disconnected')
+        return failed
+
+    def _start_session(self, index: int):
+        """start the process of a session, it posts READY once logged-in (or DEAD)"""
+        user_name, password, kwargs = self._worker_args
+        process = self._context.Process(target=_session_worker, name=f'tradezero-session-{index}', daemon=True,
+                                        args=(index, user_name, password, kwargs, self._tasks, self._results))
+        process.start()
+        self._processes[index] = process
+        self._starting.add(index)
+
+    def _stop_session(self, index: int):
+        """terminate the process of a session (its browser is closed on SIGTERM), or kill it if it doesn't exit"""
+        process = self._processes[index]
+        process.terminate()
+        process.join(timeout=10)
+        if process.is_alive():
+            process.kill()
+            process.join()
+
+    def _drain_tasks(self):
+        """remove the tasks that were not started yet, so they don't delay the next batch"""
+        while True:
+            try:
+                self._tasks.get_nowait()
+            except queue.Empty:
+                return
+
+    def close(self):
+        """log-out all the sessions and terminate the processes"""
+        for _ in self._processes:
+            self._tasks.put(None)
+        for process in self._processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        self.alive = set()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -1,18 +1,105 @@
 from __future__ import annotations
 
+import time
 import warnings
-from typing import overload, Optional, Literal
+from collections import namedtuple, deque
+from typing import overload, Optional, Literal, TYPE_CHECKING
 
-import pandas as pd
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
 
-from .enums import PortfolioTab, OrderType
+from .enums import PortfolioTab, OrderType, PositionChange
+from .dom import read_table, read_table_changes, rows_to_frame
+from .element_cache import ElementCache
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+PORTFOLIO_COLUMNS = ['symbol', 'type', 'qty', 'p_close', 'entry', 'price', 'change', '%change', 'day_pnl', 'pnl',
+                     'overnight']
+
+PositionEvent = namedtuple('PositionEvent', ['change', 'symbol', 'old_qty', 'new_qty', 'ts'])
+PositionEvent.__doc__ = """
+A change of a position detected by Portfolio.refresh(): change is a PositionChange (opened, closed, size_changed),
+old_qty is None for opened positions, new_qty is None for closed positions,
+and ts is the epoch time (in seconds, measured by the browser) when the change was read.
+"""
+
+
+def _parse_cell(text: str) -> int | float | str:
+    """convert the text of a cell to int or float if it's a number, NaN if it's empty"""
+    if text == '':
+        return float('nan')
+    number = text.replace(',', '')
+    try:
+        return int(number)
+    except ValueError:
+        pass
+    try:
+        return float(number)
+    except ValueError:
+        return text
 
 
 class Portfolio:
-    def __init__(self, driver: WebDriver):
+    def __init__(self, driver: WebDriver, elements: ElementCache | None = None):
+        """
+        :param driver: WebDriver
+        :param elements: ElementCache, default: None (a new cache is created)
+        """
         self.driver = driver
+        self.elements = elements or ElementCache(driver)
+        self.positions: dict[str, dict] = {}  # the open positions by symbol, see refresh()
+        self.max_age: float = 0  # portfolio() and invested() refresh the positions if they're older than this
+        # the last events, including the ones detected by the refreshes of portfolio() and invested()
+        self.events: deque[PositionEvent] = deque(maxlen=1000)
+        self._last_refresh: float | None = None
+
+    def refresh(self) -> list[PositionEvent]:
+        """
+        update the positions index (self.positions) with a single WebDriver call: the rows of the open positions
+        table are compared in the page, and only the rows that changed are transferred and parsed,
+        so the cost scales with the amount of positions that changed, not with the size of the portfolio.
+
+        :return: list of PositionEvent namedtuples (change, symbol, old_qty, new_qty, ts) for the positions
+         that were opened, closed or changed size since the last refresh
+        """
+        changes = read_table_changes(self.driver, 'opTable-1', name='portfolio', key_cell=0)
+        self._last_refresh = time.perf_counter()
+        if changes is None:
+            return []
+
+        events = []
+        changed = {}
+        for symbol, cells in changes.changed:
+            if len(cells) < len(PORTFOLIO_COLUMNS):
+                continue  # ex: 'You have no open positions.'
+            changed[symbol] = {column: _parse_cell(text) for column, text in zip(PORTFOLIO_COLUMNS[1:], cells[1:])}
+
+        removed = set(changes.removed)
+        if changes.reset:
+            removed |= self.positions.keys() - changed.keys()
+
+        for symbol in removed:
+            position = self.positions.pop(symbol, None)
+            if position is not None:
+                events.append(PositionEvent(PositionChange.closed, symbol, position['qty'], None, changes.ts))
+
+        for symbol, position in changed.items():
+            old = self.positions.get(symbol)
+            self.positions[symbol] = position
+            if old is None:
+                events.append(PositionEvent(PositionChange.opened, symbol, None, position['qty'], changes.ts))
+            elif old['qty'] != position['qty']:
+                events.append(PositionEvent(PositionChange.size_changed, symbol, old['qty'], position['qty'],
+                                            changes.ts))
+        self.events.extend(events)
+        return events
+
+    def _refresh_if_stale(self):
+        """refresh the positions if the last refresh is older than max_age seconds"""
+        if self._last_refresh is None or time.perf_counter() - self._last_refresh >= self.max_age:
+            self.refresh()
 
     @overload
     def portfolio(self, return_type: Literal['df'] = 'df') -> Optional[pd.DataFrame]:
@@ -27,25 +114,25 @@ class Portfolio:
         return the Portfolio table as a pandas.DataFrame or nested dict, with the symbol column as index.
         the column names are the following: 'type', 'qty', 'p_close', 'entry',
         'price', 'change', '%change', 'day_pnl', 'pnl', 'overnight'
-        note that if the portfolio is empty Pandas won't be able to locate the table,
-        and therefore will return None
+        note that if the portfolio is empty it will return None
+
+        the table is not re-parsed, only the rows that changed since the last call are read (see refresh()).
 
         :param return_type: 'df' or 'dict'
         :return: pandas.DataFrame or None if table empty
         """
-        portfolio_symbols = self.driver.find_elements(By.XPATH, '//*[@id="opTable-1"]/tbody/tr/td[1]')
-        df = pd.read_html(self.driver.page_source, attrs={'id': 'opTable-1'})[0]
+        self._refresh_if_stale()
 
-        if len(portfolio_symbols) == 0 or df.loc[0, 0].lower() == "you have no open positions.":
+        if not self.positions:
             warnings.warn('Portfolio is empty')
             return None
 
-        df.columns = [
-            'symbol', 'type', 'qty', 'p_close', 'entry', 'price', 'change', '%change', 'day_pnl', 'pnl', 'overnight'
-        ]
-        df = df.set_index('symbol')
         if return_type == 'dict':
-            return df.to_dict('index')
+            return {symbol: dict(position) for symbol, position in self.positions.items()}
+        import pandas as pd  # imported on the first use, it's slow to import
+
+        df = pd.DataFrame.from_dict(self.positions, orient='index', columns=PORTFOLIO_COLUMNS[1:])
+        df.index.name = 'symbol'
         return df
 
     def open_orders(self) -> pd.DataFrame:
@@ -58,6 +145,7 @@ class Portfolio:
 
         # if there are no open position: return an empty dataframe
         if df is None:
+            import pandas as pd
             return pd.DataFrame()
 
         filt = df['overnight'] == 'Yes'
@@ -66,15 +154,13 @@ class Portfolio:
     def invested(self, symbol) -> bool:
         """
         returns True if the given symbol is in portfolio, else: false
+        (a lookup in the positions index, after refreshing it if it's older than max_age)
 
         :param symbol: str: e.g: 'aapl', 'amd', 'NVDA', 'GM'
         :return: bool
         """
-        data = self.portfolio('dict')
-        if data is None:
-            return False
-
-        return symbol.upper() in data.keys()
+        self._refresh_if_stale()
+        return symbol.upper() in self.positions
 
     def _switch_portfolio_tab(self, tab: PortfolioTab) -> None:
         """
@@ -85,7 +171,7 @@ class Portfolio:
         :param tab: enum of PortfolioTab
         :return: None
         """
-        portfolio_tab = self.driver.find_element(By.ID, tab)
+        portfolio_tab = self.elements.find(By.ID, tab)
         portfolio_tab.click()
 
     def get_active_orders(self, return_type: str = 'df'):
@@ -95,14 +181,16 @@ class Portfolio:
         :param return_type: 'df' or 'dict'
         :return: dataframe or dictionary (based on the return_type parameter)
         """
-        active_orders = self.driver.find_elements(By.XPATH, '//*[@id="aoTable-1"]/tbody/tr[@order-id]')
+        rows = read_table(self.driver, 'aoTable-1', key_attribute='order-id')
+        active_orders = [cells[1:] for order_id, cells in rows or [] if order_id is not None]
         if len(active_orders) == 0:
             warnings.warn('There are no active orders')
             return
 
-        df = pd.read_html(self.driver.page_source, attrs={'id': 'aoTable-1'})[0]
-        df = df.drop(0, axis=1)  # remove the first column which contains the button "CANCEL"
-        df.columns = ['ref_number', 'symbol', 'side', 'qty', 'type', 'status', 'tif', 'limit', 'stop', 'placed']
+        # the first column (which contains the button "CANCEL") is removed above
+        df = rows_to_frame(active_orders, columns=[
+            'ref_number', 'symbol', 'side', 'qty', 'type', 'status', 'tif', 'limit', 'stop', 'placed'
+        ])
         # df = df.set_index('symbol')  # cant set it as a column since its not always unique
 
         if return_type == 'dict':
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import json
+import inspect
+import functools
+import importlib
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+
+# the classes whose public methods the commands are attributed to, with their module
+PROFILED_CLASSES = {'TradeZero': 'main', 'Watchlist': 'watchlist', 'Portfolio': 'portfolio', 'Account': 'account',
+                    'Notification': 'notification'}
+OTHER = '<other>'
+
+# the stack of the (method, call id) running in each thread, pushed by the wrappers of the profiled methods
+_calls = threading.local()
+_call_ids = itertools.count(1)
+
+# the original attributes of the profiled classes, while at least one profiler is running
+_originals: dict[tuple[type, str], object] = {}
+_running_profilers = 0
+_patch_lock = threading.Lock()
+
+
+@contextmanager
+def _calling(method: str, call_id: int):
+    stack = getattr(_calls, 'stack', None)
+    if stack is None:
+        stack = _calls.stack = []
+    stack.append((method, call_id))
+    try:
+        yield
+    finally:
+        stack.pop()
+
+
+def _wrap(method: str, func):
+    """return func wrapped so that each of its calls is marked with a new call id in the current thread"""
+    if inspect.isgeneratorfunction(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            call_id = next(_call_ids)
+            generator = func(*args, **kwargs)
+            value = None
+            while True:
+                # the commands are issued while the generator runs, not when it's created
+                with _calling(method, call_id):
+                    try:
+                        item = generator.send(value)
+                    except StopIteration as stop:
+                        return stop.value
+                try:
+                    value = yield item
+                except GeneratorExit:
+                    generator.close()
+                    raise
+        return wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with _calling(method, next(_call_ids)):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def _patch_classes():
+    """wrap the public methods and properties of the profiled classes"""
+    for class_name, module_name in PROFILED_CLASSES.items():
+        cls = getattr(importlib.import_module(f'{__package__}.{module_name}'), class_name)
+        for name, attribute in list(vars(cls).items()):
+            if name.startswith('_'):
+                continue
+            method = f'{class_name}.{name}'
+            if inspect.isfunction(attribute):
+                wrapped = _wrap(method, attribute)
+            elif isinstance(attribute, property) and attribute.fget is not None:
+                wrapped = property(_wrap(method, attribute.fget), attribute.fset, attribute.fdel, attribute.__doc__)
+            else:
+                continue
+            _originals[(cls, name)] = attribute
+            setattr(cls, name, wrapped)
+
+
+def _unpatch_classes():
+    for (cls, name), attribute in _originals.items():
+        setattr(cls, name, attribute)
+    _originals.clear()
+
+
+class _MethodProfile:
+    """calls, commands, bytes and time of the commands issued by one method"""
+
+    def __init__(self):
+        self.calls = 0
+        self.commands = 0
+        self.bytes = 0
+        self.time = 0.0
+        self.by_command: dict[str, int] = {}
+
+    def as_dict(self) -> dict:
+        return {
+            'calls': self.calls,
+            'commands': self.commands,
+            'commands_per_call': self.commands / self.calls if self.calls else 0.0,
+            'bytes': self.bytes,
+            'time': self.time,
+            'by_command': dict(self.by_command),
+        }
+
+
+class DriverProfiler:
+    """
+    Counts and times every WebDriver command (findElement, getElementText, executeScript, getPageSource...)
+    by wrapping the command executor of the driver, and attributes each command to the outermost public method
+    of TradeZero, Watchlist, Portfolio, Account or Notification that issued it (ex: the commands of load_symbol()
+    called by data() are attributed to TradeZero.data), so the cost of each method of the API is visible.
+    while a profiler runs, the public methods of these classes are wrapped to mark their calls in the current thread.
+
+    the bytes are the size of the JSON of the parameters and of the response of each command (approximately what
+    is sent over HTTP), and the time is the wall time of the command, including the round trip to the driver.
+
+    example:
+    with DriverProfiler(tz.driver) as profiler:
+        tz.data('AMD')
+        tz.Portfolio.portfolio()
+    profiler.print_report()
+    """
+
+    def __init__(self, driver):
+        """
+        :param driver: WebDriver
+        """
+        self.driver = driver
+        self.profiles: dict[str, _MethodProfile] = {}
+        self._last_calls: dict[str, int] = {}
+        self._execute = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._execute is not None
+
+    def start(self):
+        """start profiling the commands"""
+        if self.running:
+            return
+        global _running_profilers
+        with _patch_lock:
+            if not _running_profilers:
+                _patch_classes()
+            _running_profilers += 1
+        self._execute = self.driver.command_executor.execute
+        self.driver.command_executor.execute = self._profiled_execute
+
+    def stop(self):
+        """stop profiling (the report is kept)"""
+        if not self.running:
+            return
+        global _running_profilers
+        self.driver.command_executor.execute = self._execute
+        self._execute = None
+        self._last_calls.clear()
+        with _patch_lock:
+            _running_profilers -= 1
+            if not _running_profilers:
+                _unpatch_classes()
+
+    def reset(self):
+        """remove the recorded commands"""
+        with self._lock:
+            self.profiles.clear()
+            self._last_calls.clear()
+
+    def _profiled_execute(self, command: str, params: dict):
+        # the outermost call of a profiled method in this thread, marked by the wrappers of _patch_classes()
+        stack = getattr(_calls, 'stack', None)
+        method, call_id = stack[0] if stack else (OTHER, None)
+        start = time.perf_counter()
+        response = self._execute(command, params)
+        elapsed = time.perf_counter() - start
+        size = len(json.dumps(params, default=str)) + len(json.dumps(response, default=str))
+
+        with self._lock:
+            profile = self.profiles.get(method)
+            if profile is None:
+                profile = self.profiles[method] = _MethodProfile()
+            if call_id is None or self._last_calls.get(method) != call_id:
+                profile.calls += 1  # the first command of a new call of the method
+                self._last_calls[method] = call_id
+            profile.commands += 1
+            profile.bytes += size
+            profile.time += elapsed
+            profile.by_command[command] = profile.by_command.get(command, 0) + 1
+        return response
+
+    def report(self) -> dict[str, dict]:
+        """
+        return the profile of each method, ex:
+        {'TradeZero.data': {'calls': 10, 'commands': 30, 'commands_per_call': 3.0, 'bytes': 41230, 'time': 0.21,
+                            'by_command': {'executeScript': 10, 'sendKeysToElement': 10, 'executeAsyncScript': 10}},
+         ...}
+        the time is in seconds, the commands issued outside of the API are attributed to '<other>'
+
+        :return: dict
+        """
+        with self._lock:
+            return {method: profile.as_dict() for method, profile in self.profiles.items()}
+
+    def print_report(self):
+        """print the report as a table, sorted by total time"""
+        report = sorted(self.report().items(), key=lambda item: item[1]['time'], reverse=True)
+        print(f'{"method":<36} {"calls":>6} {"cmds/call":>9} {"KB/call":>8} {"ms/call":>8} {"total ms":>9}')
+        for method, profile in report:
+            calls = profile['calls'] or 1
+            print(f'{method:<36} {profile["calls"]:>6} {profile["commands_per_call"]:>9.1f} '
+                  f'{profile["bytes"] / calls / 1024:>8.1f} {profile["time"] / calls * 1000:>8.2f} '
+                  f'{profile["time"] * 1000:>9.1f}')
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
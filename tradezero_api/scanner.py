@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, TYPE_CHECKING
+
+from .metrics import registry
+from .time_helpers import time_it
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from .main import TradeZero
+
+
+class Scanner:
+    """
+    Scans a universe of thousands of symbols through the watchlist, which only stays fast with a limited
+    amount of rows: the universe is split into shards of shard_size symbols, and each session rotates the shards
+    through its watchlist (the previous shard is removed, the next one added, its rows read once).
+    with several sessions the shards are shared between them, so a full refresh takes about 1 / len(sessions).
+
+    the last values read for each symbol are kept in memory with the time they were read, so the whole universe
+    can be filtered and sorted without any WebDriver call.
+
+    example:
+    scanner = Scanner(tz, universe=symbols, shard_size=100)
+    scanner.refresh()  # or scanner.start() to refresh continuously in the background
+    for row in scanner.select(lambda row: row['vol'] > 1_000_000, sort_by='%chg', limit=20):
+        print(row['symbol'], row['%chg'], row['age'])
+
+    note that while the scanner runs, its sessions must not be used from another thread,
+    the symbols that were already in the watchlists are kept.
+    """
+
+    def __init__(self, sessions: TradeZero | list[TradeZero], universe: list[str], shard_size: int = 100,
+                 settle: float = 0.2, timeout: float = 10):
+        """
+        :param sessions: TradeZero, or list of TradeZero (logged-in) that share the shards
+        :param universe: list of str, the symbols to scan
+        :param shard_size: int, default: 100, amount of symbols in the watchlist of each session at once
+        :param settle: float, default: 0.2, seconds to wait after a shard was added before reading it
+         (so that the web app fills the rows)
+        :param timeout: float, default: 10, max amount of seconds to wait for a shard to be added
+        """
+        self.sessions = list(sessions) if isinstance(sessions, (list, tuple)) else [sessions]
+        self.universe = list(dict.fromkeys(symbol.upper() for symbol in universe))
+        self.shard_size = shard_size
+        self.settle = settle
+        self.timeout = timeout
+        self.snapshots: dict[str, dict] = {}
+        self.not_found: set[str] = set()
+        self.last_refresh: dict = {}
+        self.last_error: Exception | None = None
+        self._kept = [set(tz.Watchlist.symbols) for tz in self.sessions]  # the symbols of the user
+        self._current: list[list[str]] = [[] for _ in self.sessions]  # the shard in each watchlist
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def shards(self) -> list[list[str]]:
+        """the universe (without the symbols that were not found) split into shards"""
+        symbols = [symbol for symbol in self.universe if symbol not in self.not_found]
+        return [symbols[i:i + self.shard_size] for i in range(0, len(symbols), self.shard_size)]
+
+    def _scan_shard(self, index: int, shard: list[str]):
+        """replace the previous shard of the session by the given one, and read its rows"""
+        tz = self.sessions[index]
+        tz.Watchlist.remove_many([symbol for symbol in self._current[index]
+                                  if symbol not in shard and symbol not in self._kept[index]])
+        not_found = tz.Watchlist.add_many(shard, timeout=self.timeout)
+        self._current[index] = [symbol for symbol in shard if symbol not in not_found]
+
+        if self.settle:
+            time.sleep(self.settle)
+        rows = tz.Watchlist.read_rows(self._current[index])
+        ts = time.time()
+        with self._lock:
+            self.not_found.update(not_found)
+            for symbol, values in rows.items():
+                values['ts'] = ts
+                self.snapshots[symbol] = values
+
+    def _worker(self, index: int, shards: queue.Queue):
+        """scan the shards of the queue until it's empty (faster sessions simply take more shards)"""
+        while True:
+            try:
+                shard = shards.get_nowait()
+            except queue.Empty:
+                return
+            start = time.perf_counter()
+            self._scan_shard(index, shard)
+            registry.record('Scanner.shard', time.perf_counter() - start)
+
+    @time_it
+    def refresh(self) -> float:
+        """
+        scan the whole universe once
+
+        :return: float, seconds it took (see also self.last_refresh)
+        :raises Exception: if a session failed (the snapshots of the other shards are kept)
+        """
+        start = time.perf_counter()
+        shard_list = self.shards
+        shards = queue.Queue()
+        for shard in shard_list:
+            shards.put(shard)
+
+        if len(self.sessions) == 1:
+            self._worker(0, shards)
+        else:
+            with ThreadPoolExecutor(len(self.sessions), thread_name_prefix='tradezero-scanner') as executor:
+                futures = [executor.submit(self._worker, index, shards) for index in range(len(self.sessions))]
+            for future in futures:
+                future.result()
+
+        elapsed = time.perf_counter() - start
+        symbols = sum(len(shard) for shard in shard_list)
+        self.last_refresh = {
+            'seconds': elapsed,
+            'shards': len(shard_list),
+            'symbols': symbols,
+            'symbols_per_second': symbols / elapsed if elapsed else 0.0,
+            'not_found': len(self.not_found),
+        }
+        return elapsed
+
+    def age(self, symbol: str) -> float | None:
+        """
+        :param symbol: str
+        :return: seconds since the symbol was last read, None if it never was
+        """
+        values = self.snapshots.get(symbol.upper())
+        return None if values is None else time.time() - values['ts']
+
+    def select(self, where: Callable[[dict], bool] | None = None, sort_by: str | None = None,
+               descending: bool = True, limit: int | None = None, max_age: float | None = None) -> list[dict]:
+        """
+        filter and sort the last values of the universe, from memory
+
+        :param where: callable, default: None, receives the dict of a symbol (see below) and returns True to keep it
+        :param sort_by: str, default: None, field to sort by, ex: '%chg', 'vol', 'last'
+         (the symbols without a numeric value for it are left out)
+        :param descending: bool, default: True
+        :param limit: int, default: None, max amount of symbols returned
+        :param max_age: float, default: None, leave out the symbols read more than max_age seconds ago
+        :return: list of dict with the fields of the watchlist ('last', 'bid', 'ask', '%chg', 'chg', 'vol'...),
+         and 'symbol', 'ts' (epoch time of the read) and 'age' (seconds since the read)
+        """
+        now = time.time()
+        with self._lock:
+            rows = [dict(values, symbol=symbol, age=now - values['ts']) for symbol, values in self.snapshots.items()]
+
+        if max_age is not None:
+            rows = [row for row in rows if row['age'] <= max_age]
+        if where is not None:
+            rows = [row for row in rows if where(row)]
+        if sort_by is not None:
+            rows = [row for row in rows if isinstance(row.get(sort_by), (int, float))]
+            rows.sort(key=lambda row: row[sort_by], reverse=descending)
+        return rows[:limit]
+
+    def frame(self) -> pd.DataFrame:
+        """
+        :return: pandas.DataFrame of the last values of the universe, indexed by symbol, with the 'ts' and 'age'
+        """
+        import pandas as pd  # imported on the first use, it's slow to import
+
+        df = pd.DataFrame(self.select())
+        return df.set_index('symbol') if not df.empty else df
+
+    def _run(self, interval: float):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e  # ex: a session is reconnecting, the next refresh tries again
+            self._stop.wait(interval)
+
+    def start(self, interval: float = 0):
+        """
+        refresh the universe continuously on a background thread
+
+        :param interval: float, default: 0, seconds to wait between two full refreshes
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name='tradezero-scanner', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """stop the background refresh (the current one is finished first)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._thread = None
+
+    def close(self):
+        """stop, and remove the last shards from the watchlists (the symbols of the user are kept)"""
+        self.stop()
+        for index, tz in enumerate(self.sessions):
+            tz.Watchlist.remove_many([symbol for symbol in self._current[index] if symbol not in self._kept[index]])
+            self._current[index] = []
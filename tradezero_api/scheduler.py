@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+from enum import IntEnum
+from concurrent.futures import Future
+from typing import Callable, Hashable
+
+from .time_helpers import Timer
+
+
+class Priority(IntEnum):
+    """Priority classes of the commands sent to the driver, the lowest value runs first"""
+    ORDER = 0  # orders and cancels
+    ACCOUNT = 1  # account and portfolio reads
+    QUOTE = 2  # quote and watchlist polling
+    BACKGROUND = 3
+
+
+class _QueueStats:
+    """count, total and max time spent in the queue by the commands of one priority class"""
+
+    def __init__(self):
+        self.count = 0
+        self.coalesced = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def add(self, wait: float):
+        self.count += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def as_dict(self) -> dict:
+        return {
+            'count': self.count,
+            'coalesced': self.coalesced,
+            'avg_wait': self.total_wait / self.count if self.count else 0.0,
+            'max_wait': self.max_wait,
+        }
+
+
+class CommandScheduler:
+    """
+    Runs the commands for the driver one at a time on a dedicated thread, in order of priority
+    (orders and cancels first, then account and portfolio reads, then quote polling),
+    and FIFO within the same priority.
+
+    Reads that are submitted with a key while an identical one (same key) is still waiting in the queue
+    are coalesced: they all receive the result of a single execution.
+
+    AsyncTradeZero sends all its calls through one, the synchronous TradeZero doesn't use it:
+    its methods call the driver directly on the calling thread.
+    """
+
+    def __init__(self, name: str = 'tradezero-driver'):
+        self._heap = []
+        self._counter = itertools.count()
+        self._pending: dict[Hashable, Future] = {}
+        self._condition = threading.Condition()
+        self._stopped = False
+        self._stats = {priority: _QueueStats() for priority in Priority}
+        self._thread = threading.Thread(target=self._worker, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def running(self) -> bool:
+        return self._thread.is_alive() and not self._stopped
+
+    def submit(self, func: Callable, *args, priority: Priority = Priority.BACKGROUND,
+               key: Hashable | None = None, **kwargs) -> Future:
+        """
+        queue a command for the driver thread
+
+        :param func: callable to execute
+        :param args: arguments for func
+        :param priority: Priority, default: BACKGROUND
+        :param key: hashable, default: None, if given and a command with the same key is already waiting in
+         the queue, no new command is queued and the future of the pending one is returned
+        :param kwargs: keyword arguments for func
+        :return: concurrent.futures.Future with the result of func
+        :raises Exception: if the scheduler was stopped
+        """
+        with self._condition:
+            if not self.running:
+                raise Exception('Error: the driver thread is not running (the scheduler was stopped)')
+
+            if key is not None and key in self._pending:
+                self._stats[priority].coalesced += 1
+                return self._pending[key]
+
+            future = Future()
+            if key is not None:
+                self._pending[key] = future
+            heapq.heappush(self._heap, (priority, next(self._counter), Timer(), key, future, func, args, kwargs))
+            self._condition.notify()
+            return future
+
+    def _worker(self):
+        while True:
+            with self._condition:
+                while not self._heap and not self._stopped:
+                    self._condition.wait()
+                if not self._heap:
+                    return
+
+                priority, _, timer, key, future, func, args, kwargs = heapq.heappop(self._heap)
+                if key is not None:
+                    # once it starts running, new reads with the same key must get a fresh result
+                    self._pending.pop(key, None)
+                self._stats[priority].add(timer.time_elapsed)
+
+            if not future.set_running_or_notify_cancel():
+                continue  # the caller cancelled it while it was in the queue
+            try:
+                result = func(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+    def stop(self, wait: bool = True):
+        """
+        stop accepting new commands, the commands already in the queue are still executed
+
+        :param wait: bool, default: True, wait until the queue is empty and the thread has exited
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if wait and threading.current_thread() is not self._thread:
+            self._thread.join()
+
+    def queue_size(self) -> int:
+        """amount of commands waiting in the queue"""
+        with self._condition:
+            return len(self._heap)
+
+    def metrics(self) -> dict[str, dict]:
+        """
+        return the queue-wait metrics of each priority class, ex:
+        {'ORDER': {'count': 12, 'coalesced': 0, 'avg_wait': 0.003, 'max_wait': 0.041}, 'ACCOUNT': {...}, ...}
+        the times are in seconds
+
+        :return: dict
+        """
+        with self._condition:
+            return {priority.name: stats.as_dict() for priority, stats in self._stats.items()}
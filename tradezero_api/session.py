@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import os
+import json
+from pathlib import Path
+from collections import namedtuple
+
+UIState = namedtuple('UIState', ['symbols', 'order_type', 'hide_attributes', 'saved_at'])
+UIState.__doc__ = """
+The state of the UI that is lost when the page is reloaded: the symbols of the watchlist, the selected order type
+(text of the option, ex: 'LMT'), whether the account attributes are hidden, and the epoch time of the snapshot.
+"""
+
+READ_STORAGE_JS = """
+var items = {};
+for (var i = 0; i < window.localStorage.length; i++) {
+    var key = window.localStorage.key(i);
+    items[key] = window.localStorage.getItem(key);
+}
+return items;
+"""
+
+WRITE_STORAGE_JS = """
+var items = arguments[0];
+Object.keys(items).forEach(function (key) { window.localStorage.setItem(key, items[key]); });
+"""
+
+
+class SessionStore:
+    """
+    Saves the authentication of a session (cookies and localStorage of the web app) and the UI state to a file,
+    so that the next process resumes the session without going through the login form, and restores the
+    watchlist, order type and hidden attributes without rebuilding them by hand.
+
+    note that the file gives access to the account (like the password), it's created readable only by the user.
+    a persistent Chrome profile (TradeZero(..., user_data_dir=...)) keeps the cookies by itself,
+    the store is for when the profile can't be kept (ex: a new container on each run).
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        """
+        :param path: path of the JSON file
+        """
+        self.path = Path(path).expanduser()
+
+    def load(self) -> dict | None:
+        """
+        :return: the saved dict with the keys 'cookies', 'storage' and 'ui_state', or None if there is none
+        """
+        try:
+            return json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def save(self, driver, ui_state: UIState):
+        """
+        save the cookies and localStorage of the current page, and the given UI state
+
+        :param driver: WebDriver, on a page of the web app
+        :param ui_state: UIState
+        """
+        data = {
+            'cookies': driver.get_cookies(),
+            'storage': driver.execute_script(READ_STORAGE_JS) or {},
+            'ui_state': ui_state._asdict(),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        os.chmod(self.path, 0o600)  # the mode of os.open() only applies if the file is created
+        with os.fdopen(fd, 'w') as file:
+            json.dump(data, file)
+
+    def restore(self, driver) -> UIState | None:
+        """
+        put the saved cookies and localStorage back in the browser, and reload the page so that the
+        web app picks them up. the driver must already be on a page of the web app (the cookies are per domain)
+
+        :param driver: WebDriver
+        :return: the saved UIState, or None if nothing was saved
+        """
+        data = self.load()
+        if data is None:
+            return None
+
+        for cookie in data.get('cookies', []):
+            cookie.pop('sameSite', None)  # chromedriver rejects the values it returned itself in some versions
+            try:
+                driver.add_cookie(cookie)
+            except Exception:
+                pass  # expired, or of another domain
+        if data.get('storage'):
+            driver.execute_script(WRITE_STORAGE_JS, data['storage'])
+        driver.refresh()
+
+        ui_state = data.get('ui_state')
+        return UIState(**ui_state) if ui_state else None
+
+    def clear(self):
+        """delete the saved session (ex: after a logout)"""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import os
+import json
+import time
+import math
+import threading
+
+from typing import Callable, TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+TICK_COLUMNS = ('ts', 'last', 'bid', 'ask', 'vol')
+
+# amount of late ticks (older than the last one) buffered before they are inserted at their place
+LATE_BATCH_SIZE = 256
+
+
+class _SymbolTicks:
+    """
+    The ticks of a single symbol, stored as a 2D float64 array with one contiguous row per column
+    (ts, last, bid, ask, vol), so each column can be returned as a view without copying.
+    """
+
+    def __init__(self, capacity: int, path: str | None = None, size: int = 0,
+                 on_grow: Callable[[], None] | None = None):
+        self.path = path
+        self.size = size
+        self.data = self._allocate(capacity, path, mode='r+' if size else 'w+')
+        self.on_grow = on_grow  # called after the capacity changed (TickStore saves its metadata)
+        self.late: list[tuple[float, dict[str, float]]] = []  # ticks older than the last one, see merge_late()
+
+    @staticmethod
+    def _allocate(capacity: int, path: str | None, mode: str = 'w+') -> np.ndarray:
+        shape = (len(TICK_COLUMNS), capacity)
+        if path is None:
+            return np.full(shape, np.nan)
+        return np.memmap(path, dtype=np.float64, mode=mode, shape=shape)
+
+    @property
+    def capacity(self) -> int:
+        return self.data.shape[1]
+
+    def _grow(self, capacity: int | None = None):
+        """double the capacity (or more), the new array/file is allocated and the existing ticks copied over"""
+        capacity = max(capacity or 0, self.capacity * 2)
+        if self.path is None:
+            data = self._allocate(capacity, None)
+            data[:, :self.size] = self.data[:, :self.size]
+            self.data = data
+            return
+
+        tmp_path = self.path + '.tmp'
+        data = self._allocate(capacity, tmp_path)
+        data[:, :self.size] = self.data[:, :self.size]
+        data.flush()
+        del data
+        self.data.flush()
+        self.data = None
+        os.replace(tmp_path, self.path)
+        self.data = self._allocate(capacity, self.path, mode='r+')
+        if self.on_grow is not None:
+            self.on_grow()  # else a reopened store would map the file with the old shape
+
+    def append(self, ts: float, values: dict[str, float]):
+        if self.size and ts <= self.data[0, self.size - 1]:
+            self._append_late(ts, values)
+            return
+
+        if self.size == self.capacity:
+            self._grow()
+
+        i = self.size
+        self.data[0, i] = ts
+        for col, name in enumerate(TICK_COLUMNS[1:], start=1):
+            if name in values:
+                self.data[col, i] = values[name]
+            else:
+                # forward fill the values that didn't change
+                self.data[col, i] = self.data[col, i - 1] if i else np.nan
+        self.size += 1
+
+    def _append_late(self, ts: float, values: dict[str, float]):
+        """
+        a tick that isn't newer than the last one: the sources don't share a clock (python for the snapshots,
+        the browser for the streams). it's merged into the tick with the same ts if there is one
+        (ex: several cells of a row that changed together), else it's buffered and inserted with the other
+        late ticks by merge_late(), so the ticks are moved once per batch rather than once per late tick
+        """
+        i = int(np.searchsorted(self.data[0, :self.size], ts))
+        if self.data[0, i] == ts:
+            for name, value in values.items():
+                self.data[TICK_COLUMNS.index(name), i] = value
+            return
+
+        self.late.append((ts, values))
+        if len(self.late) >= LATE_BATCH_SIZE:
+            self.merge_late()
+
+    def merge_late(self):
+        """insert the buffered late ticks at their place (the reads of TickStore call it first)"""
+        if not self.late:
+            return
+        late: dict[float, dict[str, float]] = {}
+        for ts, values in self.late:
+            late.setdefault(ts, {}).update(values)
+        self.late = []
+
+        n, k = self.size, len(late)
+        if n + k > self.capacity:
+            self._grow(n + k)
+        ts = np.array(sorted(late))
+        # the index of each late tick once merged: the amount of ticks before it, plus the late ones before it
+        late_index = np.searchsorted(self.data[0, :n], ts, side='right') + np.arange(k)
+        is_old = np.ones(n + k, dtype=bool)
+        is_old[late_index] = False
+
+        merged = np.empty((len(TICK_COLUMNS), n + k))
+        merged[:, is_old] = self.data[:, :n]
+        for i, j in zip(late_index.tolist(), range(k)):
+            values = late[ts[j]]
+            merged[0, i] = ts[j]
+            for col, name in enumerate(TICK_COLUMNS[1:], start=1):
+                merged[col, i] = values[name] if name in values else (merged[col, i - 1] if i else np.nan)
+        self.data[:, :n + k] = merged
+        self.size = n + k
+
+
+class TickStore:
+    """
+    An append-only, columnar store for the quotes captured during a session.
+
+    each symbol has its own NumPy columns (ts, last, bid, ask, vol) that grow by doubling their capacity,
+    so the memory used is at most 2 * 40 bytes * ticks (ex: 500 symbols with 20,000 ticks each is at most 800MB,
+    or set capacity=20_000 to allocate exactly 400MB upfront). if a path is given the columns are memory-mapped
+    files in that directory (one file per symbol) and they are loaded back when the store is re-opened.
+
+    pass an instance to TradeZero(tick_store=...) and it will be filled automatically
+    from data(), bid/ask/last, Watchlist.data() and Watchlist.stream().
+    """
+
+    def __init__(self, path: str | None = None, capacity: int = 4096):
+        """
+        :param path: str, default: None, directory for the memory-mapped files (None means in-memory)
+        :param capacity: int, initial amount of ticks allocated for each symbol
+        """
+        self.path = path
+        self.capacity = capacity
+        self._symbols: dict[str, _SymbolTicks] = {}
+        self._lock = threading.Lock()  # the streams might record from another thread than the snapshots
+
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+            meta_path = os.path.join(path, 'meta.json')
+            if os.path.exists(meta_path):
+                with open(meta_path) as f:
+                    for symbol, (size, _) in json.load(f).items():
+                        # the capacity is taken from the file, it's the source of truth for the shape
+                        path = self._symbol_path(symbol)
+                        capacity = os.path.getsize(path) // (8 * len(TICK_COLUMNS))
+                        self._symbols[symbol] = _SymbolTicks(capacity, path, min(size, capacity), self._write_meta)
+
+    def _symbol_path(self, symbol: str) -> str:
+        return os.path.join(self.path, f'{symbol}.ticks')
+
+    def _get(self, symbol: str) -> _SymbolTicks:
+        symbol = symbol.upper()
+        if symbol not in self._symbols:
+            path = None if self.path is None else self._symbol_path(symbol)
+            self._symbols[symbol] = _SymbolTicks(self.capacity, path, on_grow=self._write_meta)
+        return self._symbols[symbol]
+
+    def _ticks(self, symbol: str) -> _SymbolTicks | None:
+        """the ticks of the symbol with the late ones merged, for the reads"""
+        ticks = self._symbols.get(symbol.upper())
+        if ticks is not None and ticks.late:
+            with self._lock:
+                ticks.merge_late()
+        return ticks
+
+    def _write_meta(self):
+        """write the size and capacity of each symbol, so that the store can be re-opened"""
+        if self.path is None:
+            return
+        meta = {symbol: [ticks.size, ticks.capacity] for symbol, ticks in self._symbols.items()}
+        with open(os.path.join(self.path, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+
+    def record(self, symbol: str, ts: float | None = None, **values: float):
+        """
+        append a tick for the given symbol, the columns that are not given keep their previous value.
+        a tick with the same timestamp as an existing one is merged into it, and an older tick is inserted
+        at its place (in batches, before the next read).
+
+        :param symbol: str
+        :param ts: float, epoch time in seconds, default: None (current time)
+        :param values: any of: last, bid, ask, vol
+        """
+        values = {name: value for name, value in values.items()
+                  if name in TICK_COLUMNS[1:] and value is not None}
+        if not values:
+            return
+        with self._lock:
+            self._get(symbol).append(time.time() if ts is None else ts, values)
+
+    @property
+    def symbols(self) -> list[str]:
+        """list of symbols with at least one tick"""
+        return [symbol for symbol, ticks in self._symbols.items() if ticks.size]
+
+    def size(self, symbol: str) -> int:
+        """amount of ticks recorded for the given symbol"""
+        ticks = self._ticks(symbol)
+        return 0 if ticks is None else ticks.size
+
+    @property
+    def nbytes(self) -> int:
+        """amount of bytes allocated for all the symbols"""
+        return sum(ticks.data.nbytes for ticks in self._symbols.values())
+
+    def column(self, symbol: str, name: str) -> np.ndarray:
+        """
+        return a read-only view (no copy) of a column
+
+        :param symbol: str
+        :param name: one of: 'ts', 'last', 'bid', 'ask', 'vol'
+        :return: numpy array
+        """
+        ticks = self._ticks(symbol)
+        if ticks is None:
+            return np.empty(0)
+
+        view = ticks.data[TICK_COLUMNS.index(name), :ticks.size].view(np.ndarray)
+        view.flags.writeable = False
+        return view
+
+    def slice(self, symbol: str, start: float | None = None, end: float | None = None) -> dict[str, np.ndarray]:
+        """
+        return read-only views (no copy) of all the columns between two timestamps,
+        the ticks are found with a binary search since the timestamps are sorted.
+
+        :param symbol: str
+        :param start: float, epoch time in seconds (inclusive), default: None (first tick)
+        :param end: float, epoch time in seconds (exclusive), default: None (last tick)
+        :return: dict with the column names as keys and the arrays as values
+        """
+        ts = self.column(symbol, 'ts')
+        i = 0 if start is None else int(np.searchsorted(ts, start, side='left'))
+        j = len(ts) if end is None else int(np.searchsorted(ts, end, side='left'))
+        return {name: self.column(symbol, name)[i:j] for name in TICK_COLUMNS}
+
+    def frame(self, symbol: str, start: float | None = None, end: float | None = None) -> pd.DataFrame:
+        """
+        same as slice() but returns a (copied) DataFrame with a DatetimeIndex
+
+        :return: pandas.DataFrame with the columns: 'last', 'bid', 'ask', 'vol'
+        """
+        import pandas as pd  # imported on the first use, it's slow to import
+
+        columns = self.slice(symbol, start, end)
+        index = pd.to_datetime(columns.pop('ts'), unit='s')
+        return pd.DataFrame(columns, index=index)
+
+    def flush(self):
+        """write the memory-mapped columns and the size of each symbol to disk (no-op if in-memory)"""
+        if self.path is None:
+            return
+
+        with self._lock:
+            for ticks in self._symbols.values():
+                ticks.merge_late()
+                ticks.data.flush()
+            self._write_meta()
+
+    def record_row(self, symbol: str, row: dict, ts: float | None = None):
+        """
+        record a row of prices (ex: a row of Watchlist.data('dict')), the values that can't be parsed are ignored
+
+        :param symbol: str
+        :param row: dict with any of the keys: 'last', 'bid', 'ask', 'vol' (or 'volume')
+        :param ts: float, epoch time in seconds, default: None (current time)
+        """
+        values = {}
+        for name, key in [('last', 'last'), ('bid', 'bid'), ('ask', 'ask'), ('vol', 'vol'), ('vol', 'volume')]:
+            value = _to_float(row.get(key))
+            if value is not None:
+                values[name] = value
+
+        if symbol and values:
+            self.record(symbol, ts, **values)
+
+    def record_snapshot(self, snapshot: dict[str, str]):
+        """
+        record a TradeZero.quote_snapshot(), the prices that can't be parsed are ignored
+
+        :param snapshot: dict with the keys 'symbol', 'last', 'bid', 'ask', 'volume'
+        """
+        self.record_row(snapshot.get('symbol'), snapshot)
+
+
+def _to_float(value) -> float | None:
+    """convert a price (float or text) to float, return None if it's not a valid number"""
+    try:
+        value = float(value.replace(',', '') if isinstance(value, str) else value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(value) else value
@@ -1,19 +1,32 @@
 from __future__ import annotations
 
 import time
+import functools
 import datetime as dt
 
 import pytz
 
+from .metrics import registry
+
+
+@functools.lru_cache(maxsize=None)
+def _eastern():
+    """the US/Eastern timezone, loaded on the first use"""
+    return pytz.timezone('US/Eastern')
+
 
 class Time:
     @property
     def time(self):
         """ return current EST time as a datetime object """
-        tz_ny = pytz.timezone('US/Eastern')
-        time1 = dt.datetime.now(tz=tz_ny).time()
+        time1 = dt.datetime.now(tz=_eastern()).time()
         return time1
 
+    @property
+    def is_weekday(self):
+        """ return True if the current EST date is a weekday (the holidays are not known) """
+        return dt.datetime.now(tz=_eastern()).weekday() < 5
+
     def time_between(self, time1: tuple, time2: tuple):
         """
         return True if current time between: time1, and time2, else: return False
@@ -42,13 +55,25 @@ class Timer:
 
 
 def time_it(func):
-    """Decorator for debugging the time taken to run a function"""
+    """
+    Decorator that records the latency (and errors) of every call in the metrics registry
+    (see tradezero_api.metrics), and prints the time elapsed if log_time_elapsed or log_info is True
+    """
+    name = func.__qualname__
+
+    @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        timer = Timer()
-        rv = func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            rv = func(*args, **kwargs)
+        except BaseException:
+            registry.record(name, time.perf_counter() - start, error=True)
+            raise
+        elapsed = time.perf_counter() - start
+        registry.record(name, elapsed)
 
         if kwargs.get('log_time_elapsed') or kwargs.get('log_info'):
-            print(f'Time elapsed: {timer.time_elapsed:.2f} seconds')
+            print(f'Time elapsed: {elapsed:.2f} seconds')
 
         return rv
     return wrapper
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+from typing import Any
+
+from selenium.webdriver.remote.webdriver import WebDriver
+
+# the condition is the body of a javascript function that receives the list 'args',
+# and returns a truthy value once the awaited state of the page is reached
+WAIT_JS = """
+var callback = arguments[arguments.length - 1];
+var args = arguments[0];
+var timeout = arguments[1];
+var startedAt = Date.now();
+function condition(args) {
+%s
+}
+function check() {
+    try {
+        return condition(args);
+    } catch (e) {
+        return null;
+    }
+}
+
+var result = check();
+if (result) {
+    callback(result);
+    return;
+}
+var done = false;
+var observer = new MutationObserver(function () {
+    var result = check();
+    if (result) {
+        finish(result);
+    }
+});
+var timer = setTimeout(function () { finish(null); }, timeout * 1000);
+function finish(result) {
+    if (done) {
+        return;
+    }
+    done = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    callback(result);
+}
+observer.observe(document.documentElement, {childList: true, subtree: true, characterData: true, attributes: true});
+"""
+
+LAST_MESSAGE_JS = """
+function lastMessage() {
+    var message = document.querySelector('span.message');
+    return message === null ? '' : message.innerText;
+}
+// true if any notification captured by Notification.subscribe() since the wait started has a line
+// for which test(line) is true. if they are not captured, the last notification is used once it differs from
+// the one shown when the wait started (so that a message left by a previous call is not taken for a new one)
+function messageShown(test) {
+    var api = window.tzApi = window.tzApi || {};
+    if (!api.notificationObserver || api.notificationList !== document.getElementById('notifications-list-1')) {
+        if (api.waitStartedAt !== startedAt) {
+            api.waitStartedAt = startedAt;
+            api.waitFirstMessage = lastMessage();
+        }
+        var message = lastMessage();
+        return message !== api.waitFirstMessage && test(message);
+    }
+    var buffer = api.notificationBuffer;
+    for (var i = 0; i < buffer.length; i++) {
+        if (buffer[i][2] >= startedAt && buffer[i][1].split('\\n').some(test)) {
+            return true;
+        }
+    }
+    return false;
+}
+function isMessage(text) {
+    return function (line) { return line === text; };
+}
+"""
+
+# args: [symbol, {key: element id}], returns {quote: {key: text}} with the texts of all the given elements
+# once the ask of the given symbol is loaded, or {notFound: true}
+SYMBOL_LOADED = LAST_MESSAGE_JS + """
+var symbol = document.getElementById('trading-order-symbol').innerText.replace('(USD)', '').trim();
+var ask = document.getElementById('trading-order-ask').innerText;
+if (symbol.toUpperCase() === args[0] && /^[0-9]+$/.test(ask.replace(/[.,]/g, ''))) {
+    var quote = {};
+    for (var key in args[1]) {
+        var element = document.getElementById(args[1][key]);
+        quote[key] = element === null ? '' : element.innerText;
+    }
+    return {quote: quote};
+}
+return messageShown(isMessage('Symbol not found: ' + args[0])) ? {notFound: true} : null;
+"""
+
+# args: [], returns the text of the locate status once it's not empty
+LOCATE_STATUS = """
+var status = document.getElementById('short-list-locate-status').innerText;
+return status === '' ? null : status;
+"""
+
+# args: [symbol], returns {pps: text, total: text} once the locate row of the symbol is loaded,
+# or {insufficientBp: true} if the locate was rejected
+LOCATE_LOADED = LAST_MESSAGE_JS + """
+var pps = document.getElementById('oitem-l-' + args[0] + '-cell-2');
+var total = document.getElementById('oitem-l-' + args[0] + '-cell-6');
+if (pps !== null && total !== null && !isNaN(parseFloat(pps.innerText)) && !isNaN(parseFloat(total.innerText))) {
+    return {pps: pps.innerText, total: total.innerText};
+}
+if (messageShown(function (line) { return line.indexOf('Insufficient BP to short a position') !== -1; })) {
+    return {insufficientBp: true};
+}
+return null;
+"""
+
+# args: [symbol], returns 'added' once the row of the symbol is present in the watchlist, or 'not_found'
+WATCHLIST_SYMBOL_ADDED = LAST_MESSAGE_JS + """
+if (document.getElementById('wl-' + args[0]) !== null) {
+    return 'added';
+}
+return messageShown(isMessage('Symbol not found: ' + args[0])) ? 'not_found' : null;
+"""
+
+# args: [symbols, seq], returns {added: [...], notFound: [...]} once every symbol has a row in the watchlist,
+# or a 'Symbol not found' notification captured by Notification after the given seq (see NOTIFICATION_SEQ),
+# the last message is only used if the notifications are not captured
+WATCHLIST_SYMBOLS_ADDED = LAST_MESSAGE_JS + """
+var notFound = {};
+function collect(line) {
+    if (line.indexOf('Symbol not found: ') === 0) {
+        notFound[line.slice('Symbol not found: '.length).trim()] = true;
+    }
+}
+var api = window.tzApi;
+if (api && api.notificationObserver) {
+    api.notificationBuffer.forEach(function (item) {
+        if (item[0] > args[1]) {
+            item[1].split('\\n').forEach(collect);
+        }
+    });
+} else {
+    collect(lastMessage());
+}
+var added = [], missing = [];
+for (var i = 0; i < args[0].length; i++) {
+    if (document.getElementById('wl-' + args[0][i]) !== null) {
+        added.push(args[0][i]);
+    } else if (notFound[args[0][i]]) {
+        missing.push(args[0][i]);
+    } else {
+        return null;
+    }
+}
+return {added: added, notFound: missing};
+"""
+
+# returns the seq of the last notification captured by Notification, to wait only for the next ones
+NOTIFICATION_SEQ = """
+return (window.tzApi && window.tzApi.notificationSeq) || 0;
+"""
+
+# args: [text], returns the last notification message once it contains the given text
+NOTIFICATION_CONTAINS = LAST_MESSAGE_JS + """
+var message = lastMessage();
+return message.indexOf(args[0]) !== -1 ? message : null;
+"""
+
+# args: [], returns true once the portfolio container is rendered (the page is fully loaded)
+PORTFOLIO_LOADED = """
+var headers = document.querySelectorAll("[id*='portfolio-container'] div div h2");
+for (var i = 0; i < headers.length; i++) {
+    if (headers[i].innerText === 'Portfolio') {
+        return true;
+    }
+}
+return null;
+"""
+
+
+# args: [], returns 'app' once the page is fully loaded, or 'login' if the login form is shown instead
+# (ex: the saved session expired)
+LOGIN_OR_APP = """
+var headers = document.querySelectorAll("[id*='portfolio-container'] div div h2");
+for (var i = 0; i < headers.length; i++) {
+    if (headers[i].innerText === 'Portfolio') {
+        return 'app';
+    }
+}
+return document.getElementById('login') !== null ? 'login' : null;
+"""
+
+
+def wait_until(driver: WebDriver, condition: str, *args, timeout: float = 10) -> Any | None:
+    """
+    wait until a condition on the page is met, without polling from python:
+    the condition is evaluated in the page on every DOM mutation (with a MutationObserver),
+    so this returns as soon as the page changes, with a single WebDriver call.
+
+    :param driver: WebDriver
+    :param condition: str, body of a javascript function with the parameter 'args', see the constants in this module
+    :param args: arguments for the condition (must be JSON serializable)
+    :param timeout: float, max amount of seconds to wait, 0 means check only once
+    :return: the value returned by the condition, or None if the timeout was reached
+    """
+    # the script timeout must be greater than our timeout, but setting it costs a round trip
+    if getattr(driver, '_tz_script_timeout', 0) < timeout + 5:
+        driver.set_script_timeout(timeout + 30)
+        driver._tz_script_timeout = timeout + 30
+
+    return driver.execute_async_script(WAIT_JS % condition, list(args), timeout)
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import time
+import threading
+from collections import namedtuple, deque
+from typing import Callable, Any
+
+from selenium.common.exceptions import WebDriverException
+
+from .enums import ConnectionState
+from .metrics import registry
+
+ConnectionEvent = namedtuple('ConnectionEvent', ['state', 'previous', 'reason', 'ts'])
+ConnectionEvent.__doc__ = """
+A change of the state of the connection: state and previous are ConnectionState (previous is None for the
+first check), reason is a str describing what was detected, ts is the epoch time in seconds.
+"""
+
+UNHEALTHY_STATES = (ConnectionState.logged_out, ConnectionState.stale, ConnectionState.crashed)
+
+# a single call that tells if the app is loaded, if the login form is shown instead, and how long ago the quotes
+# (watchlist rows and last price of the order panel) last changed. feedAge is null if no quote is displayed,
+# or if the quotes never changed since the page was loaded (no feed is expected then, ex: on a holiday,
+# else every reload would be followed by another one once stale_after is reached)
+HEARTBEAT_JS = """
+var api = window.tzApi = window.tzApi || {};
+var loaded = false;
+var headers = document.querySelectorAll("[id*='portfolio-container'] div div h2");
+for (var i = 0; i < headers.length; i++) {
+    if (headers[i].innerText === 'Portfolio') {
+        loaded = true;
+    }
+}
+if (!loaded) {
+    return {page: document.getElementById('login') !== null ? 'login' : null, feedAge: null};
+}
+
+var tbody = document.getElementById('trading-l1-tbody');
+var last = document.getElementById('trading-order-p');
+if (!api.feedObserver || api.feedTargets[0] !== tbody || api.feedTargets[1] !== last) {
+    if (api.feedObserver) {
+        api.feedObserver.disconnect();
+    }
+    api.feedAt = Date.now();
+    api.feedChanged = false;
+    api.feedTargets = [tbody, last];
+    api.feedObserver = new MutationObserver(function () {
+        api.feedAt = Date.now();
+        api.feedChanged = true;
+    });
+    api.feedTargets.forEach(function (node) {
+        if (node !== null) {
+            api.feedObserver.observe(node, {childList: true, subtree: true, characterData: true});
+        }
+    });
+}
+var watched = (tbody !== null && tbody.rows.length > 0) || (last !== null && last.textContent.trim() !== '');
+return {page: 'app', feedAge: watched && api.feedChanged ? Date.now() - api.feedAt : null};
+"""
+
+
+class ConnectionWatchdog:
+    """
+    Checks the session in the background with a cheap heartbeat (a single script call every interval seconds),
+    and detects when TradeZero logged out, when the quotes stopped updating, or when the page crashed.
+    the trading methods of TradeZero call ensure_connected() first, so the session is reconnected
+    before the next order instead of the order failing.
+
+    example:
+    tz.Watchdog.on_change(lambda event: print(event.state, event.reason))
+    tz.Watchdog.start(interval=2)
+    ...
+    print(tz.Watchdog.metrics())  # {'state': 'connected', 'outages': 1, 'downtime': 3.2, ...}
+
+    note that the heartbeat runs on the watchdog thread, in between the commands of the thread that uses the
+    session (chromedriver executes them one at a time), but the reconnection runs on the thread of the next
+    trading call, unless reconnect_in_background is True (AsyncTradeZero does it through its scheduler).
+    """
+
+    def __init__(self, driver, reconnect: Callable[[ConnectionState], Any], stale_after: float | None = 60,
+                 feed_expected: Callable[[], bool] | None = None, reconnect_in_background: bool = False,
+                 history_size: int = 1000):
+        """
+        :param driver: WebDriver
+        :param reconnect: callable that receives the unhealthy ConnectionState and reconnects the session
+         (raises an exception if it fails)
+        :param stale_after: float, default: 60, seconds without any quote update after which the feed is stale,
+         None means never
+        :param feed_expected: callable, default: None, returns False when the quotes are not expected to change
+         (ex: outside market hours), None means always expected
+        :param reconnect_in_background: bool, default: False, if True the watchdog thread reconnects by itself
+        :param history_size: int, default: 1000, max amount of ConnectionEvents kept in self.events
+        """
+        self.driver = driver
+        self.reconnect = reconnect
+        self.stale_after = stale_after
+        self.feed_expected = feed_expected
+        self.reconnect_in_background = reconnect_in_background
+        self.interval = 2.0
+        self.state: ConnectionState | None = None  # None until the first check
+        self.reason = ''
+        self.events: deque[ConnectionEvent] = deque(maxlen=history_size)
+        self.outages = 0
+        self.downtime = 0.0
+        self.last_heartbeat: float | None = None
+        self.heartbeat_latency: float | None = None
+        # how the heartbeat is executed, AsyncTradeZero replaces it to run it on the driver thread
+        self.submit: Callable[[Callable], Any] = lambda func: func()
+        self._down_since: float | None = None
+        self._listeners: list[Callable[[ConnectionEvent], Any]] = []
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def healthy(self) -> bool:
+        """True if the last check found the session connected (or if it was never checked)"""
+        return self.state not in UNHEALTHY_STATES
+
+    @property
+    def current_downtime(self) -> float:
+        """seconds since the session is unhealthy, 0 if it's connected"""
+        return 0.0 if self._down_since is None else time.time() - self._down_since
+
+    def on_change(self, callback: Callable[[ConnectionEvent], Any]):
+        """
+        call the given function with a ConnectionEvent on every change of state
+        (from the watchdog thread, or the thread that reconnects)
+
+        :param callback: callable
+        """
+        self._listeners.append(callback)
+
+    def heartbeat(self) -> tuple[ConnectionState, str]:
+        """
+        check the page once (a single WebDriver call)
+
+        :return: tuple: (ConnectionState, reason)
+        """
+        start = time.perf_counter()
+        try:
+            result = self.driver.execute_script(HEARTBEAT_JS)
+        except WebDriverException as e:
+            return ConnectionState.crashed, e.msg or type(e).__name__
+        finally:
+            self.heartbeat_latency = time.perf_counter() - start
+            self.last_heartbeat = time.time()
+            registry.record('ConnectionWatchdog.heartbeat', self.heartbeat_latency)
+
+        if result is None or result.get('page') is None:
+            return ConnectionState.crashed, 'the page is not loaded'
+        if result['page'] == 'login':
+            return ConnectionState.logged_out, 'the login form is shown'
+
+        feed_age = result.get('feedAge')
+        if (self.stale_after is not None and feed_age is not None and feed_age / 1000 > self.stale_after
+                and (self.feed_expected is None or self.feed_expected())):
+            return ConnectionState.stale, f'no quote update for {feed_age / 1000:.0f} seconds'
+        return ConnectionState.connected, ''
+
+    def check(self) -> ConnectionState:
+        """
+        run the heartbeat and update the state
+
+        :return: ConnectionState
+        """
+        with self._lock:
+            if self.state == ConnectionState.reconnecting:
+                return self.state
+            state, reason = self.heartbeat()
+            self._set_state(state, reason)
+            return state
+
+    def ensure_connected(self, check: bool = False) -> bool:
+        """
+        reconnect if the last check found the session unhealthy, it's a no-op otherwise
+
+        :param check: bool, default: False, if True run the heartbeat first instead of relying on the last check
+        :return: True if it had to reconnect
+        :raises Exception: if the reconnection failed
+        """
+        with self._lock:
+            if check:
+                self.check()
+            if self.healthy:
+                return False
+
+            unhealthy = self.state
+            self._set_state(ConnectionState.reconnecting, f'reconnecting ({unhealthy.value})')
+            start = time.perf_counter()
+            try:
+                self.reconnect(unhealthy)
+            except Exception as e:
+                registry.record('ConnectionWatchdog.reconnect', time.perf_counter() - start, error=True)
+                self._set_state(unhealthy, f'reconnection failed: {e!r}')
+                raise
+            registry.record('ConnectionWatchdog.reconnect', time.perf_counter() - start)
+
+            state, reason = self.heartbeat()
+            self._set_state(state, reason)
+            if state != ConnectionState.connected:
+                raise Exception(f'Error: still {state.value} after reconnecting ({reason})')
+            return True
+
+    def _set_state(self, state: ConnectionState, reason: str):
+        if state == self.state:
+            return
+
+        event = ConnectionEvent(state, self.state, reason, time.time())
+        if state in UNHEALTHY_STATES and self._down_since is None:
+            self._down_since = event.ts
+            self.outages += 1
+        elif state == ConnectionState.connected and self._down_since is not None:
+            outage = event.ts - self._down_since
+            self.downtime += outage
+            self._down_since = None
+            registry.record('ConnectionWatchdog.outage', outage)
+            registry.increment('connection_downtime_seconds', outage)
+        registry.increment(f'connection_{state.value}')
+
+        self.state, self.reason = state, reason
+        self.events.append(event)
+        for callback in self._listeners:
+            callback(event)
+
+    def _tick(self):
+        self.check()
+        if self.reconnect_in_background and not self.healthy:
+            try:
+                self.ensure_connected()
+            except Exception:
+                pass  # the state and the error are recorded, the next tick tries again
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.submit(self._tick)
+            except Exception:
+                if self._stop.is_set():
+                    return
+                # ex: the driver thread of AsyncTradeZero was stopped
+                self._set_state(ConnectionState.crashed, 'the heartbeat could not be submitted')
+
+    def start(self, interval: float = 2.0):
+        """
+        start the watchdog thread, a check runs every interval seconds
+
+        :param interval: float, default: 2, seconds between two heartbeats (the max delay to detect a problem)
+        """
+        self.interval = interval
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='tradezero-watchdog', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """stop the watchdog thread"""
+        self._stop.set()
+        if self._thread is not None and threading.current_thread() is not self._thread:
+            self._thread.join()
+        self._thread = None
+
+    def metrics(self) -> dict:
+        """
+        :return: dict with the keys: 'state', 'reason', 'outages', 'downtime' (total seconds, including
+         the current outage), 'last_heartbeat' (epoch time) and 'heartbeat_latency' (seconds)
+        """
+        return {
+            'state': None if self.state is None else self.state.value,
+            'reason': self.reason,
+            'outages': self.outages,
+            'downtime': self.downtime + self.current_downtime,
+            'last_heartbeat': self.last_heartbeat,
+            'heartbeat_latency': self.heartbeat_latency,
+        }
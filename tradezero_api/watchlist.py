@@ -1,12 +1,154 @@
 from __future__ import annotations
 
 import time
+import asyncio
 import warnings
+from collections import namedtuple
+from concurrent.futures import Future
+from typing import Callable, TYPE_CHECKING
 
-import pandas as pd
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 
+from .dom import read_table, rows_to_frame, parse_number
+from .element_cache import ElementCache
+from .enums import NotificationKind
+from .wait import wait_until, WATCHLIST_SYMBOL_ADDED, WATCHLIST_SYMBOLS_ADDED, NOTIFICATION_SEQ
+
+if TYPE_CHECKING:
+    from .tick_store import TickStore
+    from .notification import Notification
+
+# column names of the watchlist table, depending on the amount of cells on each row
+# (the first column is the 'x' button, and the third one in the wide layout is the currency)
+WATCHLIST_COLUMNS = {
+    8: ['x', 'symbol', 'last', 'bid', 'ask', '%chg', 'chg', 'vol'],
+    14: ['x', 'symbol', 'currency', 'open', 'close', 'last', 'bid', 'ask',
+         'high', 'low', '%chg', 'chg', 'vol', 'time'],
+}
+
+QuoteUpdate = namedtuple('QuoteUpdate', ['symbol', 'field', 'value', 'ts'])
+
+# the symbols of the rows of the watchlist, from their ids ('wl-AMD')
+CURRENT_SYMBOLS_JS = """
+var tbody = document.getElementById('trading-l1-tbody');
+var symbols = [];
+for (var i = 0; tbody !== null && i < tbody.rows.length; i++) {
+    if (tbody.rows[i].id.indexOf('wl-') === 0) {
+        symbols.push(tbody.rows[i].id.slice(3));
+    }
+}
+return symbols;
+"""
+
+# args: [symbols or null (all the rows)], returns [row id, cells] for each row that is present
+READ_ROWS_JS = """
+var tbody = document.getElementById('trading-l1-tbody');
+if (tbody === null) {
+    return [];
+}
+var rows = arguments[0] === null ? Array.prototype.slice.call(tbody.rows) : arguments[0].map(function (symbol) {
+    return document.getElementById('wl-' + symbol);
+});
+return rows.filter(function (row) { return row !== null; }).map(function (row) {
+    var cells = [];
+    for (var i = 0; i < row.cells.length; i++) {
+        cells.push(row.cells[i].textContent.trim());
+    }
+    return [row.id, cells];
+});
+"""
+
+# args: [symbols], clicks the 'x' of the row of each symbol, returns the symbols that were removed
+REMOVE_ROWS_JS = """
+return arguments[0].filter(function (symbol) {
+    var row = document.getElementById('wl-' + symbol);
+    if (row === null) {
+        return false;
+    }
+    row.cells[0].click();
+    return true;
+});
+"""
+
+INSTALL_STREAM_JS = """
+var tbody = document.getElementById('trading-l1-tbody');
+if (tbody === null) {
+    return false;
+}
+var api = window.tzApi = window.tzApi || {};
+if (api.watchlistObserver && api.watchlistTbody === tbody) {
+    return true;
+}
+if (api.watchlistObserver) {
+    api.watchlistObserver.disconnect();
+}
+var maxSize = arguments[0];
+api.watchlistBuffer = [];
+api.watchlistTbody = tbody;
+
+function push(cell) {
+    var row = cell.parentNode;
+    if (!row || !row.id) {
+        return;
+    }
+    api.watchlistBuffer.push([row.id, cell.cellIndex, row.cells.length, cell.textContent.trim(), Date.now()]);
+    if (api.watchlistBuffer.length > maxSize) {
+        api.watchlistBuffer.splice(0, api.watchlistBuffer.length - maxSize);
+    }
+}
+function pushRow(row) {
+    for (var i = 0; i < row.cells.length; i++) {
+        push(row.cells[i]);
+    }
+}
+
+api.watchlistObserver = new MutationObserver(function (mutations) {
+    var changed = new Set();
+    mutations.forEach(function (mutation) {
+        var node = mutation.target.nodeType === Node.TEXT_NODE ? mutation.target.parentNode : mutation.target;
+        if (node === tbody) {
+            mutation.addedNodes.forEach(function (row) {
+                for (var i = 0; row.cells && i < row.cells.length; i++) {
+                    changed.add(row.cells[i]);
+                }
+            });
+            return;
+        }
+        var cell = node.closest ? node.closest('td') : null;
+        if (cell !== null && tbody.contains(cell)) {
+            changed.add(cell);
+        }
+    });
+    changed.forEach(push);
+});
+api.watchlistObserver.observe(tbody, {childList: true, subtree: true, characterData: true});
+
+for (var i = 0; i < tbody.rows.length; i++) {
+    pushRow(tbody.rows[i]);
+}
+return true;
+"""
+
+DRAIN_STREAM_JS = """
+var api = window.tzApi;
+if (!api || !api.watchlistObserver || api.watchlistTbody !== document.getElementById('trading-l1-tbody')) {
+    return null;
+}
+var buffer = api.watchlistBuffer;
+api.watchlistBuffer = [];
+return buffer;
+"""
+
+STOP_STREAM_JS = """
+var api = window.tzApi;
+if (api && api.watchlistObserver) {
+    api.watchlistObserver.disconnect();
+    api.watchlistObserver = null;
+    api.watchlistBuffer = [];
+}
+"""
+
 
 class Watchlist:
     """
@@ -14,27 +156,91 @@ class Watchlist:
     note that if the container is placed on the left side of the UI it will show
     only about half of the properties (Last, Bid, Ask, %Chg, Chg, Vol) instead of all 12.
     """
-    def __init__(self, driver):
+    def __init__(self, driver, tick_store: TickStore | None = None, elements: ElementCache | None = None,
+                 notification: Notification | None = None):
+        """
+        :param driver: WebDriver
+        :param tick_store: TickStore, default: None, if given the quotes read by data() and stream() are recorded in it
+        :param elements: ElementCache, default: None (a new cache is created)
+        :param notification: Notification, default: None, used by add_many() to find the symbols that were not found
+        """
         self.driver = driver
+        self.elements = elements or ElementCache(driver)
+        self.notification = notification
         self.symbols = set()
+        self.tick_store = tick_store
+        # optional function that runs the drains of astream() on the driver thread (AsyncTradeZero sets it),
+        # it receives a callable and returns a concurrent.futures.Future
+        self.submit: Callable[[Callable], Future] | None = None
 
-    def add(self, symbol: str):
+    def add(self, symbol: str, timeout: float = 2):
         """
         add symbol to watchlist
 
         :param symbol:
+        :param timeout: float, default: 2, max amount of seconds to wait for the symbol to appear in the watchlist
         :raises Exception: if given symbol is not valid
         """
         symbol = symbol.upper()
-        symbol_input = self.driver.find_element(By.ID, 'trading-l1-input-symbol')
+        start_seq = self.driver.execute_script(NOTIFICATION_SEQ)
+        symbol_input = self.elements.find(By.ID, 'trading-l1-input-symbol')
         symbol_input.send_keys(symbol, Keys.RETURN)
 
-        time.sleep(0.4)
-        if self._symbol_valid(symbol):
+        result = wait_until(self.driver, WATCHLIST_SYMBOL_ADDED, symbol, timeout=timeout)
+        if result == 'added' or (result is None and self._symbol_valid(symbol, start_seq)):
             self.symbols.add(symbol)
         else:
             raise Exception(f'Error: Given symbol is not valid ({symbol})')
 
+    def add_many(self, symbols: list[str], timeout: float = 10) -> list[str]:
+        """
+        add several symbols to the watchlist: the symbols that are not already in it are typed one after the other
+        without waiting, then they are all validated in a single pass against the rows of the watchlist and
+        the 'Symbol not found' notifications.
+
+        :param symbols: list of str
+        :param timeout: float, default: 10, max amount of seconds to wait for all the symbols to appear
+        :return: list of the symbols that were not found (the others were added)
+        """
+        if not symbols:
+            return []
+
+        current = set(self._get_current_symbols())
+        missing = list(dict.fromkeys(symbol.upper() for symbol in symbols if symbol.upper() not in current))
+        self.symbols.update(symbol.upper() for symbol in symbols if symbol.upper() in current)
+        if not missing:
+            return []
+
+        # only the notifications that arrive after this one are considered (they are not drained from the page,
+        # other readers such as the OrderTracker still get them)
+        start_seq = self.driver.execute_script(NOTIFICATION_SEQ)
+        symbol_input = self.elements.find(By.ID, 'trading-l1-input-symbol')
+        for symbol in missing:
+            symbol_input.send_keys(symbol, Keys.RETURN)
+
+        result = wait_until(self.driver, WATCHLIST_SYMBOLS_ADDED, missing, start_seq, timeout=timeout)
+        if result is not None:
+            self.symbols.update(result['added'])
+            self.symbols.difference_update(result['notFound'])
+            return result['notFound']
+
+        # timeout: the symbols without a row are kept only if they were not reported as not found
+        current = set(self._get_current_symbols())
+        if self.notification is not None:
+            self.notification.refresh()
+        not_found = []
+        for symbol in missing:
+            if symbol in current:
+                self.symbols.add(symbol)
+            elif self.notification is not None and self.notification.find(
+                    NotificationKind.symbol_not_found, symbol, after_seq=start_seq) is not None:
+                self.symbols.discard(symbol)
+                not_found.append(symbol)
+            else:
+                warnings.warn(f'Timed out while adding {symbol} to the watchlist')
+                self.symbols.add(symbol)
+        return not_found
+
     def remove(self, symbol: str):
         """
         remove symbol from watchlist
@@ -50,6 +256,19 @@ class Watchlist:
         self.driver.find_element(By.XPATH, delete_button).click()
         self.symbols.remove(symbol)
 
+    def remove_many(self, symbols: list[str]) -> list[str]:
+        """
+        remove several symbols from the watchlist with a single WebDriver call
+
+        :param symbols: list of str
+        :return: list of the symbols that were removed (the others were not in the watchlist)
+        """
+        if not symbols:
+            return []
+        removed = self.driver.execute_script(REMOVE_ROWS_JS, [symbol.upper() for symbol in symbols])
+        self.symbols.difference_update(symbol.upper() for symbol in symbols)
+        return removed
+
     def reset(self):
         """
         remove all symbols from watchlist
@@ -64,34 +283,28 @@ class Watchlist:
         make sure all symbols that have been added,
         are present in the watchlist (after refresh the watchlist resets)
         """
-        current_list = set(self._get_current_symbols())  # set because the order might be different
-        if self.symbols != current_list:
-            for symbol in self.symbols:
-                if symbol not in current_list:
-                    self.add(symbol)
+        not_found = self.add_many(sorted(self.symbols))
+        if not_found:
+            warnings.warn(f'Symbols not found while restoring the watchlist: {not_found}')
 
     def _get_current_symbols(self):
         """
-        return list with current symbols on watchlist
+        return list with current symbols on watchlist (from the ids of the rows, a single WebDriver call)
         """
-        rows = self.driver.find_elements(By.XPATH, '//*[@id="trading-l1-tbody"]/tr/td[2]')
-        if len(rows) == 0:
-            return []
-
-        data = self.data('dict')
-        return list(data.keys())
+        return self.driver.execute_script(CURRENT_SYMBOLS_JS)
 
-    def _symbol_valid(self, symbol: str):
+    def _symbol_valid(self, symbol: str, after_seq: int):
         """
-        check if a symbol is valid
+        check that no 'Symbol not found' notification for the symbol was captured after the given seq
 
-        :param symbol:
+        :param symbol: str
+        :param after_seq: int, see NOTIFICATION_SEQ
         :return: bool
         """
-        last_notif_message = self.driver.find_element(By.CSS_SELECTOR, 'span.message').text
-        if last_notif_message == f'Symbol not found: {symbol.upper()}':
-            return False
-        return True
+        if self.notification is None:
+            return True
+        self.notification.refresh()
+        return self.notification.find(NotificationKind.symbol_not_found, symbol, after_seq=after_seq) is None
 
     def data(self, return_type: str = 'df'):
         """
@@ -99,31 +312,160 @@ class Watchlist:
         if return_type is equal to: 'df' it will return a pandas.DataFrame
         or if return_type equal to: 'dict' it will return a Dictionary with the symbols as keys
         and the data as values.
-        note that if there are no symbols in the watchlist, Pandas will not be able
-        to locate the table and therefore will return False
+        note that if there are no symbols in the watchlist it will return None
 
         :param return_type: 'df' or 'dict'
         :return: None if empty, else: DF or dict
         """
-        symbols_lst = self.driver.find_elements(By.XPATH, '//*[@id="trading-l1-tbody"]//td[2]')
-        if len(symbols_lst) == 0:
+        rows = read_table(self.driver, 'trading-l1-table')
+        if not rows:
             warnings.warn('There are no symbols present in your watchlist')
             return None
 
-        # selenium can only read visible rows, while pandas can find also non-visible text
-        # if there are no rows pandas will not be able to locate the table, and throw an error
-        df = pd.read_html(self.driver.page_source, attrs={'id': 'trading-l1-table'})[0]
-
-        if len(df.columns) == 8:
-            df = df.drop(columns=[0])  # drop 'x'
-            df.columns = ['symbol', 'last', 'bid', 'ask', '%chg', 'chg', 'vol']
+        # the cells are read through javascript, so also the text of non-visible rows is included
+        df = rows_to_frame([cells for _, cells in rows])
 
-        elif len(df.columns) == 14:
-            df = df.drop(columns=[0, 2])  # drop 'x' and currency_get_current_symbols
-            df.columns = ['symbol', 'open', 'close', 'last', 'bid', 'ask',
-                          'high', 'low', '%chg', 'chg', 'vol', 'time']
+        if len(df.columns) in WATCHLIST_COLUMNS:
+            df.columns = WATCHLIST_COLUMNS[len(df.columns)]
+            df = df.drop(columns=[col for col in ['x', 'currency'] if col in df.columns])
 
         df = df.set_index('symbol')
+        if self.tick_store is not None:
+            ts = time.time()
+            for symbol, row in df.to_dict('index').items():
+                self.tick_store.record_row(symbol, row, ts)
+
         if return_type == 'dict':
             return df.to_dict('index')
         return df
+
+    def read_rows(self, symbols: list[str] | None = None) -> dict[str, dict]:
+        """
+        read the rows of the given symbols with a single WebDriver call, without building a DataFrame
+        (the cost doesn't depend on the amount of other rows in the watchlist)
+
+        :param symbols: list of str, default: None (all the rows)
+        :return: dict: symbol -> {field: value}, ex: {'AMD': {'last': 101.5, 'bid': 101.49, ..., 'vol': 4821334.0}},
+         the values that are not numbers are kept as text, the symbols without a row are missing
+        """
+        symbols = None if symbols is None else [symbol.upper() for symbol in symbols]
+        ts = time.time()
+        rows = {}
+        for row_id, cells in self.driver.execute_script(READ_ROWS_JS, symbols):
+            columns = WATCHLIST_COLUMNS.get(len(cells))
+            if columns is None or not row_id.startswith('wl-'):
+                continue
+
+            values = {}
+            for field, text in zip(columns, cells):
+                if field in ('x', 'symbol', 'currency'):
+                    continue
+                try:
+                    values[field] = parse_number(text)
+                except ValueError:
+                    values[field] = text
+            rows[row_id[3:]] = values
+            if self.tick_store is not None:
+                self.tick_store.record_row(row_id[3:], values, ts)
+        return rows
+
+    def _install_stream(self, buffer_size: int):
+        """
+        install the MutationObserver that buffers the changed cells of the watchlist in the page
+
+        :param buffer_size: max amount of updates kept in the page between two drains (the oldest are dropped)
+        :raises Exception: if the watchlist table is not present in the page
+        """
+        if not self.driver.execute_script(INSTALL_STREAM_JS, buffer_size):
+            raise Exception('Error: cannot stream the watchlist, table "trading-l1-tbody" not found')
+
+    def drain(self, buffer_size: int = 100_000) -> list[QuoteUpdate]:
+        """
+        return all the cells that changed since the last drain (a single WebDriver call),
+        the first call (or the first one after a page reload) returns the current value of every cell.
+
+        :param buffer_size: max amount of updates kept in the page between two drains (the oldest are dropped)
+        :return: list of QuoteUpdate namedtuples: (symbol, field, value, ts), ts is the epoch time in seconds
+        """
+        buffer = self.driver.execute_script(DRAIN_STREAM_JS)
+        if buffer is None:
+            self._install_stream(buffer_size)
+            buffer = self.driver.execute_script(DRAIN_STREAM_JS) or []
+
+        updates = []
+        for row_id, cell_index, row_length, text, ts in buffer:
+            columns = WATCHLIST_COLUMNS.get(row_length)
+            if columns is None or not row_id.startswith('wl-'):
+                continue
+
+            field = columns[cell_index]
+            if field in ('x', 'symbol', 'currency'):
+                continue
+
+            try:
+                value = parse_number(text)
+            except ValueError:
+                value = text
+            updates.append(QuoteUpdate(row_id[3:], field, value, ts / 1000))
+
+        if self.tick_store is not None:
+            for update in updates:
+                if isinstance(update.value, float):
+                    self.tick_store.record(update.symbol, update.ts, **{update.field: update.value})
+        return updates
+
+    def stream(self, interval: float = 0.05, timeout: float | None = None):
+        """
+        A generator that yields the updates of the watchlist as they happen in the page:
+        a MutationObserver buffers the changed cells, and every interval seconds they are
+        drained in a single WebDriver call, so only the cells that changed are transferred.
+
+        example:
+        for symbol, field, value, ts in tz.Watchlist.stream():
+            print(symbol, field, value)
+
+        :param interval: float, seconds between each drain of the buffer
+        :param timeout: float, default: None, stop after the given amount of seconds (None means never)
+        :return: generator of QuoteUpdate namedtuples: (symbol, field, value, ts)
+        """
+        end = None if timeout is None else time.perf_counter() + timeout
+        try:
+            while end is None or time.perf_counter() < end:
+                yield from self.drain()
+                time.sleep(interval)
+        finally:
+            self.stop_stream()
+
+    async def astream(self, interval: float = 0.05, timeout: float | None = None):
+        """
+        asyncio version of stream(), it sleeps with asyncio.sleep() between each drain.
+        the drains run on the driver thread if self.submit is set (AsyncTradeZero sets it, see
+        AsyncTradeZero.watchlist_stream()), else in the default executor, then the session must not be used
+        from another thread at the same time
+
+        example:
+        async for symbol, field, value, ts in tz.Watchlist.astream():
+            print(symbol, field, value)
+
+        :param interval: float, seconds between each drain of the buffer
+        :param timeout: float, default: None, stop after the given amount of seconds (None means never)
+        :return: async generator of QuoteUpdate namedtuples: (symbol, field, value, ts)
+        """
+        end = None if timeout is None else time.perf_counter() + timeout
+        try:
+            while end is None or time.perf_counter() < end:
+                for update in await self._run(self.drain):
+                    yield update
+                await asyncio.sleep(interval)
+        finally:
+            await self._run(self.stop_stream)
+
+    async def _run(self, func: Callable):
+        """run a function that uses the driver without blocking the event loop, see astream()"""
+        if self.submit is not None:
+            return await asyncio.shield(asyncio.wrap_future(self.submit(func)))
+        return await asyncio.get_running_loop().run_in_executor(None, func)
+
+    def stop_stream(self):
+        """disconnect the MutationObserver and discard the buffered updates"""
+        self.driver.execute_script(STOP_STREAM_JS)